@@ -0,0 +1,415 @@
+"""Motor de audio por bloques para ``@silencio``, ``@extraer_audio`` y ``@agregar_musica``.
+
+El audio se representa como un ``AudioStream``: una secuencia perezosa de
+bloques NumPy ``float32`` de forma ``(muestras, canales)`` con valores en
+``[-1, 1]``. Cada operación transforma bloques de tamaño fijo, así que una
+banda sonora larga se procesa con memoria acotada por ``CHUNK_FRAMES``.
+
+Los núcleos son vectorizados: ganancia, remuestreo lineal con estado entre
+bloques, conversión de canales y mezcla con recorte. La entrada y salida
+WAV (PCM de 8, 16, 24 o 32 bits) usa el módulo ``wave`` de la biblioteca
+estándar.
+
+Uso::
+
+    python audio_engine.py mezclar voz.wav musica.wav -o salida.wav --gain 0.4
+    python audio_engine.py silencio entrada.wav -o mudo.wav
+"""
+
+import argparse
+import sys
+import time
+import wave
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+# Muestras por canal en cada bloque (~1.4 s a 48 kHz).
+CHUNK_FRAMES = 65536
+SAMPLE_RATE = 48000
+
+
+@dataclass
+class AudioStream:
+    """Audio perezoso: cada iteración vuelve a producir los bloques desde el origen."""
+    rate: int
+    channels: int
+    blocks: Callable[[], Iterator[np.ndarray]]
+    frames: Optional[int] = None   # longitud total si se conoce
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return self.blocks()
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.frames / self.rate if self.frames is not None else None
+
+    def read(self) -> np.ndarray:
+        """Materializa todo el audio (útil en pruebas y clips cortos)."""
+        parts = list(self)
+        return np.concatenate(parts) if parts else np.zeros((0, self.channels), np.float32)
+
+
+# ─── Núcleos vectorizados ─────────────────────────────────────────────────
+def apply_gain(block: np.ndarray, gain: float) -> np.ndarray:
+    """Multiplica ``block`` por ``gain`` en sitio."""
+    if gain != 1.0:
+        np.multiply(block, np.float32(gain), out=block)
+    return block
+
+
+def clip(block: np.ndarray) -> np.ndarray:
+    """Recorta ``block`` a ``[-1, 1]`` en sitio."""
+    return np.clip(block, -1.0, 1.0, out=block)
+
+
+def to_channels(block: np.ndarray, channels: int) -> np.ndarray:
+    """Convierte ``block`` a ``channels`` canales (promedia o replica)."""
+    have = block.shape[1]
+    if have == channels:
+        return block
+    if channels == 1:
+        return block.mean(axis=1, keepdims=True, dtype=np.float32)
+    if have == 1:
+        return np.repeat(block, channels, axis=1)
+    mono = block.mean(axis=1, keepdims=True, dtype=np.float32)
+    return np.repeat(mono, channels, axis=1)
+
+
+def mix_into(dst: np.ndarray, src: np.ndarray, gain: float = 1.0) -> np.ndarray:
+    """Suma ``src * gain`` sobre el inicio de ``dst`` en sitio y recorta."""
+    n = min(len(dst), len(src))
+    if gain == 1.0:
+        dst[:n] += src[:n]
+    else:
+        dst[:n] += src[:n] * np.float32(gain)
+    return clip(dst)
+
+
+class Resampler:
+    """Remuestreo lineal por bloques que conserva la fase entre bloques."""
+
+    def __init__(self, src_rate: int, dst_rate: int, channels: int) -> None:
+        self.step = src_rate / dst_rate
+        self.pos = 0.0                                   # instante de la próxima salida
+        self.prev = np.zeros((0, channels), np.float32)  # última muestra del bloque anterior
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        buf = np.concatenate((self.prev, block)) if len(self.prev) else block
+        last = len(buf) - 1
+        if last < 0:
+            return buf
+        if self.pos > last:
+            self.pos -= last
+            self.prev = buf[-1:]
+            return buf[:0]
+        count = int((last - self.pos) // self.step) + 1
+        t = self.pos + np.arange(count) * self.step
+        i0 = t.astype(np.int64)
+        frac = (t - i0).astype(np.float32)[:, None]
+        i1 = np.minimum(i0 + 1, last)
+        out = buf[i0] * (1 - frac) + buf[i1] * frac
+        self.pos = self.pos + count * self.step - last
+        self.prev = buf[-1:]
+        return out.astype(np.float32, copy=False)
+
+
+# ─── Fuentes y destinos ────────────────────────────────────────────────────
+_DTYPES = {1: np.uint8, 2: np.dtype('<i2'), 4: np.dtype('<i4')}
+
+
+def _decode(raw: bytes, width: int, channels: int) -> np.ndarray:
+    if width == 3:
+        b = np.frombuffer(raw, np.uint8).reshape(-1, 3)
+        ints = (b[:, 0].astype(np.int32) | (b[:, 1].astype(np.int32) << 8)
+                | (b[:, 2].astype(np.int32) << 16))
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        data = ints.astype(np.float32) / np.float32(1 << 23)
+    elif width == 1:
+        data = (np.frombuffer(raw, np.uint8).astype(np.float32) - 128) / np.float32(128)
+    else:
+        data = np.frombuffer(raw, _DTYPES[width]).astype(np.float32)
+        data /= np.float32(1 << (8 * width - 1))
+    return data.reshape(-1, channels)
+
+
+def read_wav(path: str, chunk: int = CHUNK_FRAMES) -> AudioStream:
+    """Abre un WAV PCM como ``AudioStream``; cada iteración relee el archivo."""
+    with wave.open(path, 'rb') as wf:
+        rate, channels, width, frames = (wf.getframerate(), wf.getnchannels(),
+                                         wf.getsampwidth(), wf.getnframes())
+    if width not in (1, 2, 3, 4):
+        raise ValueError(f"'{path}' uses an unsupported sample width ({width} bytes)")
+
+    def blocks() -> Iterator[np.ndarray]:
+        with wave.open(path, 'rb') as wf:
+            while True:
+                raw = wf.readframes(chunk)
+                if not raw:
+                    break
+                yield _decode(raw, width, channels)
+
+    return AudioStream(rate, channels, blocks, frames)
+
+
+def write_wav(stream: Iterable[np.ndarray], path: str, rate: int, channels: int,
+              sampwidth: int = 2) -> int:
+    """Escribe bloques en ``path`` como PCM de 16 o 32 bits; devuelve las muestras."""
+    if sampwidth not in (2, 4):
+        raise ValueError(f"unsupported output sample width {sampwidth}")
+    # En float64: en float32 2**31 - 1 se redondea a 2**31 y +1.0 desborda int32.
+    scale = float((1 << (8 * sampwidth - 1)) - 1)
+    dtype = _DTYPES[sampwidth]
+    total = 0
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sampwidth)
+        wf.setframerate(rate)
+        for block in stream:
+            out = np.clip(np.asarray(block, np.float64), -1.0, 1.0) * scale
+            wf.writeframes(np.rint(out).astype(dtype).tobytes())
+            total += len(block)
+    return total
+
+
+def save(stream: AudioStream, path: str, sampwidth: int = 2) -> int:
+    """Atajo de ``write_wav`` con el formato del propio ``stream``."""
+    return write_wav(stream, path, stream.rate, stream.channels, sampwidth)
+
+
+def silence(seconds: float, rate: int = SAMPLE_RATE, channels: int = 2,
+            chunk: int = CHUNK_FRAMES) -> AudioStream:
+    """``seconds`` segundos de silencio."""
+    total = int(round(seconds * rate))
+
+    def blocks() -> Iterator[np.ndarray]:
+        left = total
+        while left > 0:
+            n = min(chunk, left)
+            yield np.zeros((n, channels), np.float32)
+            left -= n
+
+    return AudioStream(rate, channels, blocks, total)
+
+
+def from_array(samples: np.ndarray, rate: int, chunk: int = CHUNK_FRAMES) -> AudioStream:
+    """Envuelve un arreglo ``(muestras, canales)`` (o 1-D mono) como stream."""
+    data = np.asarray(samples, np.float32)
+    if data.ndim == 1:
+        data = data[:, None]
+
+    def blocks() -> Iterator[np.ndarray]:
+        for i in range(0, len(data), chunk):
+            yield data[i:i + chunk].copy()
+
+    return AudioStream(rate, data.shape[1], blocks, len(data))
+
+
+# ─── Transformaciones de stream ────────────────────────────────────────────
+def rechunk(blocks: Iterable[np.ndarray], size: int) -> Iterator[np.ndarray]:
+    """Reagrupa bloques de cualquier tamaño en bloques de ``size`` (el último puede ser menor)."""
+    pending = []
+    have = 0
+    for block in blocks:
+        pending.append(block)
+        have += len(block)
+        if have < size:
+            continue
+        buf = np.concatenate(pending) if len(pending) > 1 else pending[0]
+        cut = len(buf) - len(buf) % size
+        for i in range(0, cut, size):
+            yield buf[i:i + size]
+        rest = buf[cut:]
+        pending = [rest] if len(rest) else []
+        have = len(rest)
+    if have:
+        yield np.concatenate(pending) if len(pending) > 1 else pending[0]
+
+
+def gain(stream: AudioStream, factor: float) -> AudioStream:
+    """Aplica una ganancia lineal (con recorte)."""
+    def blocks() -> Iterator[np.ndarray]:
+        for block in stream:
+            yield clip(apply_gain(block.copy(), factor))
+
+    return AudioStream(stream.rate, stream.channels, blocks, stream.frames)
+
+
+def conform(stream: AudioStream, rate: int, channels: int) -> AudioStream:
+    """Lleva ``stream`` a ``rate`` Hz y ``channels`` canales."""
+    if stream.rate == rate and stream.channels == channels:
+        return stream
+
+    def blocks() -> Iterator[np.ndarray]:
+        resampler = Resampler(stream.rate, rate, channels) if stream.rate != rate else None
+        for block in stream:
+            block = to_channels(block, channels)
+            out = resampler.process(block) if resampler else block
+            if len(out):
+                yield out
+
+    frames = None
+    if stream.frames is not None:
+        frames = int(stream.frames * rate / stream.rate) if stream.rate != rate else stream.frames
+    return AudioStream(rate, channels, blocks, frames)
+
+
+def trim(stream: AudioStream, start: float, end: Optional[float] = None) -> AudioStream:
+    """Conserva ``[start, end)`` segundos de ``stream``."""
+    first = max(int(round(start * stream.rate)), 0)
+    last = None if end is None else max(int(round(end * stream.rate)), first)
+    if stream.frames is not None:
+        last = stream.frames if last is None else min(last, stream.frames)
+        first = min(first, last)
+
+    def blocks() -> Iterator[np.ndarray]:
+        pos = 0
+        for block in stream:
+            lo, hi = pos, pos + len(block)
+            pos = hi
+            if hi <= first:
+                continue
+            if last is not None and lo >= last:
+                break
+            a = max(first - lo, 0)
+            b = len(block) if last is None else min(last - lo, len(block))
+            yield block[a:b]
+
+    frames = None if last is None else last - first
+    return AudioStream(stream.rate, stream.channels, blocks, frames)
+
+
+def fit(stream: AudioStream, frames: int, loop: bool = False) -> AudioStream:
+    """Ajusta ``stream`` a ``frames`` muestras: corta, repite o rellena con silencio."""
+    def blocks() -> Iterator[np.ndarray]:
+        left = frames
+        while left > 0:
+            produced = 0
+            for block in stream:
+                if left <= 0:
+                    break
+                block = block[:left]
+                produced += len(block)
+                left -= len(block)
+                yield block
+            if not loop or produced == 0:
+                break
+        while left > 0:
+            n = min(CHUNK_FRAMES, left)
+            yield np.zeros((n, stream.channels), np.float32)
+            left -= n
+
+    return AudioStream(stream.rate, stream.channels, blocks, frames)
+
+
+def mix(base: AudioStream, extra: AudioStream, base_gain: float = 1.0,
+        extra_gain: float = 1.0, chunk: int = CHUNK_FRAMES) -> AudioStream:
+    """Mezcla ``extra`` sobre ``base``; el resultado dura lo que ``base``.
+
+    ``extra`` se convierte al formato de ``base`` y se recorta a su duración.
+    """
+    extra = conform(extra, base.rate, base.channels)
+
+    def blocks() -> Iterator[np.ndarray]:
+        others = rechunk(extra, chunk)
+        for block in rechunk(base, chunk):
+            out = apply_gain(block.astype(np.float32, copy=True), base_gain)
+            other = next(others, None)
+            if other is not None:
+                mix_into(out, other, extra_gain)
+            else:
+                clip(out)
+            yield out
+
+    return AudioStream(base.rate, base.channels, blocks, base.frames)
+
+
+def concat(streams: List[AudioStream]) -> AudioStream:
+    """Une ``streams`` uno tras otro en el formato del primero."""
+    first = streams[0]
+    parts = [conform(s, first.rate, first.channels) for s in streams]
+    frames = None if any(p.frames is None for p in parts) else sum(p.frames for p in parts)
+
+    def blocks() -> Iterator[np.ndarray]:
+        for part in parts:
+            yield from part
+
+    return AudioStream(first.rate, first.channels, blocks, frames)
+
+
+def change_speed(stream: AudioStream, factor: float) -> AudioStream:
+    """Reproduce ``stream`` ``factor`` veces más rápido (cambia también el tono)."""
+    fast = AudioStream(max(int(round(stream.rate * factor)), 1), stream.channels,
+                       stream.blocks, stream.frames)
+    return conform(fast, stream.rate, stream.channels)
+
+
+# ─── Funciones del lenguaje ────────────────────────────────────────────────
+def silencio(stream: AudioStream) -> AudioStream:
+    """``@silencio``: misma duración y formato, todas las muestras a cero."""
+    def blocks() -> Iterator[np.ndarray]:
+        for block in stream:
+            yield np.zeros_like(block)
+
+    return AudioStream(stream.rate, stream.channels, blocks, stream.frames)
+
+
+def extraer_audio(source) -> AudioStream:
+    """``@extraer_audio``: pista de audio de un clip o de un archivo WAV."""
+    if isinstance(source, AudioStream):
+        return source
+    if isinstance(source, str):
+        return read_wav(source)
+    audio = getattr(source, "audio", None)
+    if audio is None:
+        raise ValueError("@extraer_audio: the clip has no audio track")
+    return audio
+
+
+def agregar_musica(base: AudioStream, music: AudioStream, music_gain: float = 1.0,
+                   loop: bool = False) -> AudioStream:
+    """``@agregar_musica``: mezcla ``music`` bajo ``base`` durante toda su duración.
+
+    Con ``loop`` la música se repite si es más corta que ``base``.
+    """
+    music = conform(music, base.rate, base.channels)
+    if base.frames is not None:
+        music = fit(music, base.frames, loop)
+    return mix(base, music, 1.0, music_gain)
+
+
+# ─── CLI ───────────────────────────────────────────────────────────────────
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Motor de audio por bloques")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    m = sub.add_parser("mezclar", help="agrega música a un audio base")
+    m.add_argument("base")
+    m.add_argument("musica")
+    m.add_argument("-o", "--output", required=True)
+    m.add_argument("--gain", type=float, default=1.0, help="ganancia de la música")
+    m.add_argument("--loop", action="store_true", help="repite la música si es más corta")
+    s = sub.add_parser("silencio", help="silencia un audio conservando su duración")
+    s.add_argument("entrada")
+    s.add_argument("-o", "--output", required=True)
+    args = ap.parse_args()
+
+    try:
+        if args.cmd == "mezclar":
+            out = agregar_musica(read_wav(args.base), read_wav(args.musica), args.gain, args.loop)
+        else:
+            out = silencio(read_wav(args.entrada))
+    except (FileNotFoundError, wave.Error, ValueError) as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    frames = save(out, args.output)
+    elapsed = time.perf_counter() - t0
+    seconds = frames / out.rate
+    speed = f", {seconds / elapsed:.0f}x tiempo real" if elapsed > 0 else ""
+    print(f"{seconds:.1f} s de audio escritos en {args.output} ({elapsed:.2f} s{speed})")
+
+
+if __name__ == '__main__':
+    main()
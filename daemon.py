@@ -0,0 +1,260 @@
+"""Servidor persistente de análisis léxico y sintáctico.
+
+Mantiene cargadas en memoria las tablas del lexer y ``PARSING_TABLE``
+para que los plugins de editor y los hooks de CI no paguen el arranque
+del intérprete en cada archivo. Las peticiones llegan como líneas JSON
+por la entrada estándar o por un socket Unix, y cada respuesta es otra
+línea JSON con el mismo ``id``::
+
+    {"id": 1, "op": "validate", "doc": "a.txt", "text": "main { ... }"}
+    {"id": 1, "ok": true, "result": {"valid": true, ...}}
+
+Operaciones soportadas: ``tokenize``, ``parse``, ``validate``, ``at`` y
+``close``. ``at`` recibe ``line`` y ``column`` (o ``offset``) y devuelve el
+nodo bajo esa posición y la sentencia que lo contiene (ver ``span_index``).
+Si una petición omite ``text`` se reutiliza el último texto enviado para
+ese ``doc``; si el texto no cambió se responde desde el estado guardado.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from lexer import tokenize
+from enums import Token
+from parse_tree import ParseTreeNode, parse
+from span_index import SpanIndex
+
+# Longitud máxima de una línea de petición por socket. El límite por defecto
+# de asyncio (64 KiB) se queda corto para documentos grandes.
+STREAM_LIMIT = 256 * 1024 * 1024
+
+
+@dataclass
+class DocumentState:
+    """Resultado del último análisis de un documento."""
+    digest: str
+    text: str
+    tokens: List[Token]
+    lex_errors: List[str]
+    tree: Optional[ParseTreeNode] = None
+    syntax_errors: Optional[List[str]] = None
+    spans: Optional[SpanIndex] = None
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _lex(text: str) -> DocumentState:
+    """Tokeniza ``text`` y devuelve un estado nuevo sin árbol."""
+    tokens, errors = tokenize(text)
+    return DocumentState(_digest(text), text, tokens, errors)
+
+
+def _parse(state: DocumentState) -> None:
+    """Construye el árbol de ``state``; ``parse`` no comparte estado entre hilos."""
+    state.tree, state.syntax_errors = parse(state.tokens)
+
+
+def token_to_json(tok: Token) -> List[Any]:
+    return [tok.type.name, tok.value, tok.line, tok.column]
+
+
+def tree_to_json(node: ParseTreeNode) -> Dict[str, Any]:
+    """Serializa el árbol de forma iterativa (los árboles pueden ser profundos)."""
+    out: Dict[str, Any] = {}
+    stack = [(node, out)]
+    while stack:
+        cur, dst = stack.pop()
+        dst["label"] = cur.label
+        if cur.token is not None:
+            dst["token"] = token_to_json(cur.token)
+        dst["children"] = []
+        for ch in cur.children:
+            sub: Dict[str, Any] = {}
+            dst["children"].append(sub)
+            stack.append((ch, sub))
+    return out
+
+
+def node_to_json(node: Optional[ParseTreeNode]) -> Optional[Dict[str, Any]]:
+    """Etiqueta, token y span de un nodo, sin sus hijos."""
+    if node is None:
+        return None
+    out: Dict[str, Any] = {"label": node.label, "span": [list(p) for p in node.span]}
+    if node.token is not None:
+        out["token"] = token_to_json(node.token)
+    return out
+
+
+class ParseServer:
+    """Despacha peticiones JSON y conserva el estado por documento."""
+
+    def __init__(self) -> None:
+        self.documents: Dict[str, DocumentState] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def _state(self, doc: str, text: Optional[str]) -> DocumentState:
+        state = self.documents.get(doc)
+        if text is None:
+            if state is None:
+                raise ValueError(f"Unknown document '{doc}'")
+            return state
+        if state is None or state.digest != _digest(text):
+            state = await asyncio.to_thread(_lex, text)
+            self.documents[doc] = state
+        return state
+
+    async def _parsed(self, state: DocumentState) -> DocumentState:
+        if state.tree is None:
+            await asyncio.to_thread(_parse, state)
+        return state
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Resuelve una petición y devuelve el diccionario de respuesta."""
+        op = request.get("op")
+        doc = request.get("doc", "<stdin>")
+        text = request.get("text")
+
+        if op not in ("tokenize", "parse", "validate", "at", "close"):
+            raise ValueError(f"Unknown op '{op}'")
+
+        # Las peticiones sobre un mismo documento se serializan; las de
+        # documentos distintos avanzan en paralelo. El candado se conserva
+        # tras ``close`` para que quien ya espera en él no corra en paralelo
+        # con una petición nueva sobre el mismo ``doc``.
+        lock = self._locks.setdefault(doc, asyncio.Lock())
+        async with lock:
+            if op == "close":
+                self.documents.pop(doc, None)
+                return {"closed": doc}
+            state = await self._state(doc, text)
+            if op == "tokenize":
+                return {
+                    "tokens": [token_to_json(t) for t in state.tokens],
+                    "lexical_errors": state.lex_errors,
+                }
+            state = await self._parsed(state)
+            if op == "parse":
+                return {
+                    "tree": tree_to_json(state.tree),
+                    "lexical_errors": state.lex_errors,
+                    "syntax_errors": state.syntax_errors,
+                }
+            if op == "at":
+                if state.spans is None:
+                    state.spans = SpanIndex(state.tree, state.text)
+                if "offset" in request:
+                    line, column = state.spans.position(int(request["offset"]))
+                else:
+                    line, column = int(request["line"]), int(request["column"])
+                node = state.spans.node_at(line, column)
+                stmt = state.spans.node_at(line, column, label="Stmt")
+                return {"node": node_to_json(node), "statement": node_to_json(stmt)}
+            return {
+                "valid": not state.lex_errors and not state.syntax_errors,
+                "lexical_errors": state.lex_errors,
+                "syntax_errors": state.syntax_errors,
+            }
+
+    async def respond(self, line: str) -> str:
+        """Convierte una línea de petición en una línea de respuesta."""
+        req_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            req_id = request.get("id")
+            result = await self.handle(request)
+            reply = {"id": req_id, "ok": True, "result": result}
+        except Exception as exc:  # la conexión sigue viva ante peticiones inválidas
+            reply = {"id": req_id, "ok": False, "error": str(exc)}
+        return json.dumps(reply, ensure_ascii=False) + "\n"
+
+    async def serve_stream(self, readline, write) -> None:
+        """Atiende un flujo de líneas; cada petición corre como tarea propia."""
+        pending = set()
+        while True:
+            try:
+                raw = await readline()
+            except ValueError as exc:
+                # Línea mayor que el límite del lector: se descarta y se
+                # responde con error sin cerrar la conexión.
+                await write(json.dumps({"id": None, "ok": False, "error": str(exc)}) + "\n")
+                continue
+            if not raw:
+                break
+            line = raw.strip()
+            if not line:
+                continue
+            task = asyncio.create_task(self._answer(line, write))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def _answer(self, line: str, write) -> None:
+        await write(await self.respond(line))
+
+
+async def serve_stdio(server: ParseServer) -> None:
+    """Lee peticiones de stdin y escribe las respuestas en stdout."""
+    # stdin puede ser un archivo redirigido, así que se lee en un hilo
+    # en lugar de registrarlo como pipe en el bucle de eventos.
+    async def readline() -> str:
+        return await asyncio.to_thread(sys.stdin.readline)
+
+    async def write(data: str) -> None:
+        sys.stdout.write(data)
+        sys.stdout.flush()
+
+    await server.serve_stream(readline, write)
+
+
+async def serve_unix(server: ParseServer, path: str) -> None:
+    """Escucha en un socket Unix; cada conexión es un flujo independiente."""
+    async def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+
+        async def readline() -> str:
+            return (await reader.readline()).decode('utf-8')
+
+        async def write(data: str) -> None:
+            async with lock:
+                writer.write(data.encode('utf-8'))
+                await writer.drain()
+
+        try:
+            await server.serve_stream(readline, write)
+        finally:
+            writer.close()
+
+    srv = await asyncio.start_unix_server(on_client, path=path, limit=STREAM_LIMIT)
+    print(f"Escuchando en {path}", file=sys.stderr)
+    async with srv:
+        await srv.serve_forever()
+
+
+def main() -> None:
+    """Punto de entrada: ``python daemon.py [--socket RUTA]``."""
+    ap = argparse.ArgumentParser(description="Servidor persistente de tokenize/parse/validate")
+    ap.add_argument("--socket", help="ruta del socket Unix (por defecto stdin/stdout)")
+    args = ap.parse_args()
+
+    server = ParseServer()
+    try:
+        if args.socket:
+            asyncio.run(serve_unix(server, args.socket))
+        else:
+            asyncio.run(serve_stdio(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
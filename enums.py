@@ -7,6 +7,8 @@ tipos de token.
 
 import enum
 from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
 
 
 class TokenSpec:
@@ -86,7 +88,7 @@ class TokenSpec:
 # Mapeo único de lexemas a tipos de token. Cada entrada
 # relaciona el texto que aparece en el programa con el
 # tipo de token que debe generarse.
-LEXEME_TO_TOKEN: dict[str, TokenSpec.Type] = {
+_LEXEMES: dict[str, TokenSpec.Type] = {
     # keywords
     "main": TokenSpec.Type.MAIN,
     "if": TokenSpec.Type.IF,
@@ -160,22 +162,26 @@ class Token:
 # Alias para facilitar el acceso desde otros módulos
 TokenType = TokenSpec.Type
 
+# Todas las tablas son de sólo lectura: los lexers de distintos hilos las
+# comparten sin copiarlas.
+LEXEME_TO_TOKEN: Mapping[str, TokenSpec.Type] = MappingProxyType(_LEXEMES)
+
 # Tablas derivadas útiles para el lexer
 # Conjuntos de palabras clave y operadores, extraídos del diccionario
 # principal para una búsqueda rápida.
-KEYWORDS = {k: v for k, v in LEXEME_TO_TOKEN.items() if k.isalpha()}
-compound_ops = {
+KEYWORDS = MappingProxyType({k: v for k, v in LEXEME_TO_TOKEN.items() if k.isalpha()})
+compound_ops = MappingProxyType({
     k: v
     for k, v in LEXEME_TO_TOKEN.items()
     if len(k) == 2 and not k.isalpha() and not k.startswith('@')
-}
+})
 
 # Símbolos de un solo carácter que representan paréntesis, llaves, etc.
-symbols = {
+symbols = MappingProxyType({
     k: v
     for k, v in LEXEME_TO_TOKEN.items()
     if len(k) == 1 and not k.isalnum()
-}
+})
 
 # Funciones de video que comienzan con '@'
-VIDEO_FUNCS = {k: v for k, v in LEXEME_TO_TOKEN.items() if k.startswith('@')}
+VIDEO_FUNCS = MappingProxyType({k: v for k, v in LEXEME_TO_TOKEN.items() if k.startswith('@')})
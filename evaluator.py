@@ -0,0 +1,374 @@
+"""Evaluador de programas sobre el árbol de parseo.
+
+Recorre el árbol que produce ``build_tree`` y ejecuta las sentencias en
+orden: declaraciones, asignaciones, ``if``/``else``, ``while`` y
+``exportar ... como``. Las expresiones aritméticas, lógicas y de cadenas se
+evalúan directamente; las llamadas ``@`` se convierten en un plan, pasan
+por ``planner.Planner`` y se ejecutan con ``media.apply``. Como los clips
+son perezosos, evaluar un programa no decodifica video: eso ocurre al
+exportar (ver ``export.py``).
+
+Las exportaciones se acumulan en ``Evaluator.exports`` en el orden en que
+se ejecutan.
+
+Con ``Preview`` el programa corre sobre proxies de cada fuente: reducidos
+en tamaño y con uno de cada ``step`` fotogramas. Los tamaños de ``@resize``
+se escalan igual; los tiempos no cambian porque van en segundos y los
+proxies conservan la duración.
+
+Con ``eliminate`` se quitan antes de ejecutar las sentencias cuyo resultado
+no llega a ningún ``exportar`` (ver ``liveness.py``); el reporte queda en
+``Evaluator.removed``.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from audio_engine import AudioStream
+from enums import TokenType
+from frame_cache import FrameCache
+from grammar_def import EPSILON
+from lexer import Lexer
+from liveness import LivenessReport, eliminate_dead_code
+from media import Clip, load, apply, proxy
+from parse_tree import ParseTreeNode, parse
+from planner import (Arg, Call, ClipInfo, Const, Planner, Ref,
+                     call_args, single_factor)
+
+Value = Union[int, float, str, bool, Clip, AudioStream, None]
+
+# Vueltas máximas de un ``while`` antes de abortar.
+MAX_ITERATIONS = 100_000
+
+_DEFAULTS = {
+    TokenType.INT_TYPE: 0,
+    TokenType.FLOAT_TYPE: 0.0,
+    TokenType.STRING_TYPE: "",
+    TokenType.VIDEO_TYPE: None,
+    TokenType.AUDIO_TYPE: None,
+}
+
+
+class EvalError(Exception):
+    """Error de ejecución con la posición del código que lo provocó."""
+
+
+@dataclass(frozen=True)
+class Preview:
+    """Vista previa: fuentes a ``scale`` de su tamaño y uno de cada ``step`` fotogramas."""
+    scale: float = 0.25
+    step: int = 2
+
+    def __post_init__(self) -> None:
+        if not 0 < self.scale <= 1:
+            raise ValueError(f"preview scale must be in (0, 1], not {self.scale:g}")
+        if self.step < 1:
+            raise ValueError(f"preview step must be >= 1, not {self.step}")
+
+    def size(self, value: Value) -> Value:
+        """Escala un argumento de tamaño; lo que no es número se deja para ``apply``."""
+        if _numeric(value):
+            return max(int(round(value * self.scale)), 1)
+        return value
+
+
+@dataclass
+class Export:
+    """Resultado de ``exportar valor como "ruta"``."""
+    value: Union[Clip, AudioStream]
+    path: str
+    line: int
+
+
+def _token(node: ParseTreeNode):
+    """Token de un nodo terminal, o ``None`` si faltaba en la entrada."""
+    return node.children[0].token if node.children else None
+
+
+def _first_token(node: ParseTreeNode):
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        if cur.token is not None:
+            return cur.token
+        stack.extend(reversed(cur.children))
+    return None
+
+
+def _is_epsilon(node: ParseTreeNode) -> bool:
+    return len(node.children) == 1 and node.children[0].label == EPSILON
+
+
+def _where(node: ParseTreeNode) -> str:
+    tok = _first_token(node)
+    return f" at line {tok.line}, column {tok.column}" if tok else ""
+
+
+def _number(text: str) -> Union[int, float]:
+    return float(text) if '.' in text else int(text)
+
+
+def _numeric(value: Value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _binary(op: TokenType, a: Value, b: Value) -> Value:
+    if op == TokenType.PLUS:
+        if isinstance(a, str) and isinstance(b, str):
+            return a + b
+        if _numeric(a) and _numeric(b):
+            return a + b
+    elif op in (TokenType.MINUS, TokenType.MULT, TokenType.DIV):
+        if _numeric(a) and _numeric(b):
+            if op == TokenType.MINUS:
+                return a - b
+            if op == TokenType.MULT:
+                return a * b
+            if b == 0:
+                raise ValueError("division by zero")
+            return a // b if isinstance(a, int) and isinstance(b, int) else a / b
+    elif op == TokenType.EQ:
+        return a == b
+    elif op == TokenType.NEQ:
+        return a != b
+    elif (_numeric(a) and _numeric(b)) or (isinstance(a, str) and isinstance(b, str)):
+        if op == TokenType.LT:
+            return a < b
+        if op == TokenType.LE:
+            return a <= b
+        if op == TokenType.GT:
+            return a > b
+        if op == TokenType.GE:
+            return a >= b
+    raise ValueError(f"unsupported operands for {op.name}: "
+                     f"{type(a).__name__} and {type(b).__name__}")
+
+
+def clip_info(value: Value) -> Optional[ClipInfo]:
+    """Forma de un clip para el modelo de costo del planificador."""
+    if isinstance(value, Clip):
+        return ClipInfo(value.length, value.width, value.height, value.fps)
+    return None
+
+
+class Evaluator:
+    """Ejecuta un programa; las rutas relativas se resuelven desde ``base_dir``."""
+
+    def __init__(self, base_dir: str = ".", optimize: bool = True,
+                 cache: Optional[FrameCache] = None,
+                 preview: Optional[Preview] = None, eliminate: bool = False) -> None:
+        self.base_dir = base_dir
+        self.optimize = optimize
+        self.preview = preview
+        self.eliminate = eliminate
+        # Una caché por ejecución: las fuentes que se usan varias veces se
+        # decodifican una sola vez.
+        self.cache = FrameCache() if cache is None else cache
+        self.env: Dict[str, Value] = {}
+        self.exports: List[Export] = []
+        self.inputs: List[str] = []        # archivos abiertos, en orden
+        self.rewrites: List[str] = []      # reescrituras aplicadas por el planificador
+        self.removed = LivenessReport()    # sentencias muertas quitadas con ``eliminate``
+
+    # ── programa y sentencias ───────────────────────────────────────────
+    def run(self, root: ParseTreeNode) -> None:
+        """Ejecuta el árbol de un ``Program``."""
+        block = next((c for c in root.children if c.label == "Block"), None)
+        if block is None:
+            raise EvalError("program has no main block")
+        try:
+            if self.eliminate:
+                self.removed = eliminate_dead_code(root)
+            self._block(block)
+        except RecursionError:
+            raise EvalError("program is nested too deeply to evaluate")
+
+    def _block(self, block: ParseTreeNode) -> None:
+        node = next((c for c in block.children if c.label == "StmtList"), None)
+        while node is not None and not _is_epsilon(node) and node.children:
+            self._stmt(node.children[0])
+            node = node.children[1] if len(node.children) > 1 else None
+
+    def _stmt(self, stmt: ParseTreeNode) -> None:
+        inner = stmt.children[0]
+        try:
+            getattr(self, "_" + inner.label)(inner)
+        except EvalError:
+            raise
+        except (ValueError, OSError, IndexError) as exc:
+            raise EvalError(f"{exc}{_where(inner)}") from exc
+
+    def _VarDecl(self, node: ParseTreeNode) -> None:
+        type_tok = _token(node.children[0].children[0])
+        name = _token(node.children[2]).value
+        init = node.children[3]
+        if _is_epsilon(init):
+            value = _DEFAULTS[type_tok.type]
+        else:
+            value = self._coerce(type_tok.type, self.expr(init.children[1]))
+        self.env[name] = value
+
+    def _Assignment(self, node: ParseTreeNode) -> None:
+        self.env[_token(node.children[0]).value] = self.expr(node.children[2])
+
+    def _IfStmt(self, node: ParseTreeNode) -> None:
+        if self._truth(self.expr(node.children[2])):
+            self._block(node.children[4])
+        else:
+            else_opt = node.children[5]
+            if not _is_epsilon(else_opt):
+                self._block(else_opt.children[1])
+
+    def _WhileStmt(self, node: ParseTreeNode) -> None:
+        for _ in range(MAX_ITERATIONS):
+            if not self._truth(self.expr(node.children[2])):
+                return
+            self._block(node.children[4])
+        raise EvalError(f"while loop exceeded {MAX_ITERATIONS} iterations{_where(node)}")
+
+    def _ExportStmt(self, node: ParseTreeNode) -> None:
+        value = self.expr(node.children[1])
+        if isinstance(value, str):
+            value = self._open(value)
+        if not isinstance(value, (Clip, AudioStream)):
+            raise ValueError("only video or audio values can be exported")
+        path = _token(node.children[3]).value[1:-1]
+        self.exports.append(Export(value, os.path.join(self.base_dir, path),
+                                   _first_token(node).line))
+
+    # ── valores ─────────────────────────────────────────────────────────
+    def _open(self, path: str) -> Union[Clip, AudioStream]:
+        full = os.path.join(self.base_dir, path)
+        self.inputs.append(full)
+        value = load(full, self.cache)
+        if self.preview is not None and isinstance(value, Clip):
+            value = proxy(value, self.preview.scale, self.preview.step)
+        return value
+
+    def _coerce(self, tt: TokenType, value: Value) -> Value:
+        if tt in (TokenType.VIDEO_TYPE, TokenType.AUDIO_TYPE) and isinstance(value, str):
+            value = self._open(value)
+        want = {TokenType.INT_TYPE: int, TokenType.FLOAT_TYPE: float,
+                TokenType.STRING_TYPE: str, TokenType.VIDEO_TYPE: Clip,
+                TokenType.AUDIO_TYPE: AudioStream}[tt]
+        if want is int and _numeric(value):
+            return int(value)
+        if want is float and _numeric(value):
+            return float(value)
+        if not isinstance(value, want) or isinstance(value, bool):
+            raise ValueError(f"cannot assign {type(value).__name__} to {tt.name.lower()[:-5]}")
+        return value
+
+    @staticmethod
+    def _truth(value: Value) -> bool:
+        if isinstance(value, (Clip, AudioStream)):
+            raise ValueError("a video or audio value cannot be used as a condition")
+        return bool(value)
+
+    # ── expresiones ─────────────────────────────────────────────────────
+    def expr(self, node: ParseTreeNode) -> Value:
+        """Valor de un nodo de expresión (``Expr`` … ``Factor``)."""
+        label = node.label
+        if label == "Factor":
+            return self._factor(node)
+        if label in ("Expr",):
+            return self.expr(node.children[0])
+        value = self.expr(node.children[0])
+        rest = node.children[1]
+        short = {"OrExpr": True, "AndExpr": False}.get(label)
+        while not _is_epsilon(rest):
+            op = _token(rest.children[0]).type
+            if short is not None:
+                # ``or``/``and`` con cortocircuito: el resultado es booleano
+                if self._truth(value) == short:
+                    return short
+                value = self._truth(self.expr(rest.children[1]))
+            else:
+                value = _binary(op, value, self.expr(rest.children[1]))
+            rest = rest.children[2]
+        return value
+
+    def _factor(self, node: ParseTreeNode) -> Value:
+        head = node.children[0]
+        if head.label == "FunctionCall":
+            return self.call(head)
+        tok = _token(head)
+        if tok.type == TokenType.IDENTIFIER:
+            if tok.value not in self.env:
+                raise ValueError(f"undefined variable '{tok.value}'")
+            return self.env[tok.value]
+        if tok.type in (TokenType.INT_LITERAL, TokenType.FLOAT_LITERAL):
+            return _number(tok.value)
+        if tok.type == TokenType.STRING_LITERAL:
+            return tok.value[1:-1]
+        if tok.type == TokenType.LPAREN:
+            return self.expr(node.children[1])
+        value = self._factor(node.children[1])
+        if tok.type == TokenType.NOT:
+            return not self._truth(value)
+        if not _numeric(value):
+            raise ValueError(f"cannot negate {type(value).__name__}")
+        return -value
+
+    # ── llamadas @ ──────────────────────────────────────────────────────
+    def _plan(self, call: ParseTreeNode, bound: Dict[str, Value]) -> Arg:
+        """Plan de ``call`` con los argumentos que no son llamadas ya evaluados."""
+        name = _token(call.children[0]).value.lstrip('@')
+        args: List[Arg] = []
+        for k, expr in enumerate(call_args(call)):
+            factor = single_factor(expr)
+            if factor is not None and factor.children[0].label == "FunctionCall":
+                args.append(self._plan(factor.children[0], bound))
+                continue
+            value = self.expr(expr)
+            if isinstance(value, (Clip, AudioStream)):
+                key = f"${len(bound)}"
+                bound[key] = value
+                args.append(Ref(key))
+            else:
+                if self.preview is not None and name == "resize" and k in (1, 2):
+                    value = self.preview.size(value)
+                args.append(Const(value))
+        return Call(name, tuple(args))
+
+    def _execute(self, arg: Arg, bound: Dict[str, Value]) -> Value:
+        if isinstance(arg, Call):
+            return apply(arg.func, [self._execute(a, bound) for a in arg.args], self._open)
+        if isinstance(arg, Ref):
+            return bound[arg.name]
+        if isinstance(arg, Const):
+            return arg.value
+        raise ValueError(f"cannot evaluate '{arg.text}'")
+
+    def call(self, node: ParseTreeNode) -> Value:
+        """Evalúa un ``FunctionCall`` tras optimizar su plan."""
+        bound: Dict[str, Value] = {}
+        plan = self._plan(node, bound)
+        if self.optimize:
+            sources = {k: info for k, v in bound.items() if (info := clip_info(v))}
+            planner = Planner(sources)
+            result = planner.optimize(plan)
+            self.rewrites.extend(result.rewrites)
+            plan = result.optimized
+        return self._execute(plan, bound)
+
+
+def evaluate(src: str, base_dir: str = ".", optimize: bool = True,
+             cache: Optional[FrameCache] = None,
+             preview: Optional[Preview] = None, eliminate: bool = False) -> Evaluator:
+    """Tokeniza, parsea y ejecuta ``src``; lanza ``EvalError`` ante cualquier error."""
+    # Lexer y parser en una sola pasada; el parser puede detenerse antes del
+    # final, así que se agota el lexer para tener todos los errores léxicos.
+    lexer = Lexer(src)
+    tokens = lexer.iter_tokens()
+    root, errors = parse(tokens)
+    for _ in tokens:
+        pass
+    if lexer.errors:
+        raise EvalError(lexer.errors[0])
+    if errors:
+        raise EvalError(errors[0])
+    evaluator = Evaluator(base_dir, optimize, cache, preview, eliminate)
+    evaluator.run(root)
+    return evaluator
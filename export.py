@@ -0,0 +1,303 @@
+"""Etapa de exportación: ejecuta ``exportar ... como`` por segmentos en paralelo.
+
+Cada clip exportado se divide en segmentos de ``--segment`` segundos. Cada
+segmento se codifica en un proceso propio como Y4M 4:4:4 más WAV dentro de
+``<salida>.parts/`` y al final se unen en ``<salida>.y4m`` y
+``<salida>.wav``. Los clips no se pueden enviar entre procesos (son
+funciones compuestas), así que cada proceso vuelve a evaluar el programa
+una vez y toma de ahí la exportación que le toca.
+
+``manifest.json`` registra la huella del programa y de sus archivos de
+entrada junto con los segmentos terminados. Si una exportación se
+interrumpe, la siguiente ejecución con la misma huella sólo codifica los
+segmentos que faltan.
+
+``--preview`` exporta una vista previa sobre fuentes reducidas (ver
+``evaluator.Preview``): sirve para revisar tiempos y fundidos en una
+fracción del costo del render completo.
+
+Uso::
+
+    python export.py programa.txt --jobs 4 --segment 2
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import audio_engine
+from audio_engine import AudioStream
+from evaluator import EvalError, Evaluator, Export, Preview, evaluate
+from frame_cache import DEFAULT_BUDGET, FrameCache
+from lexer import jobs_arg
+from media import Clip, write_y4m, y4m_header
+
+SEGMENT_SECONDS = 2.0
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class Segment:
+    """Fotogramas ``[start, stop)`` y muestras ``[first, last)`` de un tramo."""
+    index: int
+    start: int
+    stop: int
+    first: int
+    last: int
+
+    @property
+    def name(self) -> str:
+        return f"seg_{self.index:05d}"
+
+
+def plan_segments(clip: Clip, rate: int, seconds: float = SEGMENT_SECONDS) -> List[Segment]:
+    """Divide ``clip`` en tramos de ``seconds``; los límites de audio se redondean igual en todos."""
+    step = max(int(round(seconds * clip.fps)), 1)
+    segments = []
+    for k, start in enumerate(range(0, clip.length, step)):
+        stop = min(start + step, clip.length)
+        segments.append(Segment(k, start, stop,
+                                int(round(start / clip.fps * rate)),
+                                int(round(stop / clip.fps * rate))))
+    return segments
+
+
+def fingerprint(src: str, index: int, clip: Clip, inputs: List[str], seconds: float,
+                preview: Optional[Preview] = None) -> str:
+    """Huella del programa, la exportación y los archivos que lee."""
+    h = hashlib.sha256()
+    h.update(src.encode('utf-8'))
+    h.update(f"{index}|{clip.width}x{clip.height}@{clip.fps}|{clip.length}|{seconds}"
+             f"|{preview}".encode())
+    for path in sorted(set(inputs)):
+        st = os.stat(path)
+        h.update(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def _atomic_json(path: str, data: Dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(data, fh)
+    os.replace(tmp, path)
+
+
+# ─── Codificación de un segmento ──────────────────────────────────────────
+# Programa evaluado por proceso: (fuente, directorio, vista previa) → Evaluator.
+_EVALUATED: Dict[Tuple[str, str, Optional[Preview]], Evaluator] = {}
+
+
+def _export_in_worker(src: str, base_dir: str, index: int, cache: Tuple[int, int],
+                      preview: Optional[Preview]) -> Export:
+    key = (src, base_dir, preview)
+    if key not in _EVALUATED:
+        _EVALUATED[key] = evaluate(src, base_dir, cache=FrameCache(*cache), preview=preview,
+                                   eliminate=True)
+    return _EVALUATED[key].exports[index]
+
+
+def encode_segment(clip: Clip, audio: AudioStream, seg: Segment, parts: str) -> int:
+    """Escribe ``seg`` como ``.y4m`` y ``.wav`` en ``parts``; devuelve los fotogramas."""
+    base = os.path.join(parts, seg.name)
+    frames = write_y4m(clip, base + ".y4m.tmp", seg.start, seg.stop)
+    piece = audio_engine.fit(audio_engine.trim(audio, seg.first / audio.rate,
+                                               seg.last / audio.rate),
+                             seg.last - seg.first)
+    audio_engine.save(piece, base + ".wav.tmp")
+    os.replace(base + ".y4m.tmp", base + ".y4m")
+    os.replace(base + ".wav.tmp", base + ".wav")
+    return frames
+
+
+def _encode_task(task: tuple) -> int:
+    src, base_dir, index, seg, parts, cache, preview = task
+    clip = _export_in_worker(src, base_dir, index, cache, preview).value
+    encode_segment(clip, clip.audio_or_silence(), seg, parts)
+    return seg.index
+
+
+def _segment_ok(parts: str, seg: Segment, frame_size: int, header: bytes) -> bool:
+    base = os.path.join(parts, seg.name)
+    try:
+        if os.path.getsize(base + ".y4m") != len(header) + (seg.stop - seg.start) * frame_size:
+            return False
+        with wave.open(base + ".wav", 'rb') as wf:
+            return wf.getnframes() == seg.last - seg.first
+    except (OSError, wave.Error, EOFError):
+        return False
+
+
+# ─── Unión ─────────────────────────────────────────────────────────────────
+def join_segments(parts: str, segments: List[Segment], clip: Clip, audio: AudioStream,
+                  out_base: str) -> None:
+    """Une los segmentos en ``out_base.y4m`` y ``out_base.wav``."""
+    with open(out_base + ".y4m.tmp", 'wb') as out:
+        out.write(y4m_header(clip.width, clip.height, clip.fps))
+        for seg in segments:
+            with open(os.path.join(parts, seg.name + ".y4m"), 'rb') as fh:
+                fh.readline()  # cabecera del segmento
+                shutil.copyfileobj(fh, out, 1 << 20)
+    with wave.open(out_base + ".wav.tmp", 'wb') as out:
+        out.setnchannels(audio.channels)
+        out.setsampwidth(2)
+        out.setframerate(audio.rate)
+        for seg in segments:
+            with wave.open(os.path.join(parts, seg.name + ".wav"), 'rb') as wf:
+                out.writeframes(wf.readframes(wf.getnframes()))
+    os.replace(out_base + ".y4m.tmp", out_base + ".y4m")
+    os.replace(out_base + ".wav.tmp", out_base + ".wav")
+
+
+# ─── Exportación completa ──────────────────────────────────────────────────
+def export_clip(src: str, base_dir: str, index: int, exp: Export, inputs: List[str],
+                workers: int = 1, seconds: float = SEGMENT_SECONDS, resume: bool = True,
+                keep_parts: bool = False, log: Callable[[str], None] = print,
+                cache: Tuple[int, int] = (DEFAULT_BUDGET, 0),
+                preview: Optional[Preview] = None) -> List[str]:
+    """Codifica la exportación ``index`` de ``src`` por segmentos y la une.
+
+    ``cache`` es ``(memoria, desborde)`` en bytes para la ``FrameCache`` de
+    cada proceso que codifica; ``preview`` debe ser el mismo con que se
+    evaluó ``exp``.
+    """
+    clip = exp.value
+    out_base = os.path.splitext(exp.path)[0] if exp.path.lower().endswith(".y4m") else exp.path
+    parts = out_base + ".parts"
+    os.makedirs(parts, exist_ok=True)
+    audio = clip.audio_or_silence()
+    segments = plan_segments(clip, audio.rate, seconds)
+    header = y4m_header(clip.width, clip.height, clip.fps)
+    frame_size = len(b"FRAME\n") + 3 * clip.width * clip.height
+
+    manifest_path = os.path.join(parts, MANIFEST)
+    fp = fingerprint(src, index, clip, inputs, seconds, preview)
+    done: Dict[str, Dict] = {}
+    if resume:
+        try:
+            with open(manifest_path, encoding='utf-8') as fh:
+                manifest = json.load(fh)
+            if manifest.get("fingerprint") == fp:
+                done = manifest.get("segments", {})
+        except (OSError, ValueError):
+            pass
+    done = {k: v for k, v in done.items()
+            if k.isdigit() and int(k) < len(segments)
+            and _segment_ok(parts, segments[int(k)], frame_size, header)}
+    todo = [s for s in segments if str(s.index) not in done]
+    if done:
+        log(f"{exp.path}: {len(done)} de {len(segments)} segmentos reutilizados")
+
+    def finished(seg: Segment) -> None:
+        done[str(seg.index)] = {"frames": seg.stop - seg.start, "samples": seg.last - seg.first}
+        _atomic_json(manifest_path, {"fingerprint": fp, "segments": done})
+
+    _atomic_json(manifest_path, {"fingerprint": fp, "segments": done})
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_encode_task,
+                                   (src, base_dir, index, seg, parts, cache, preview))
+                       for seg in todo]
+            for fut in as_completed(futures):
+                finished(segments[fut.result()])
+    else:
+        for seg in todo:
+            encode_segment(clip, audio, seg, parts)
+            finished(seg)
+
+    join_segments(parts, segments, clip, audio, out_base)
+    if not keep_parts:
+        shutil.rmtree(parts, ignore_errors=True)
+    log(f"{exp.path}: {clip.length} fotogramas {clip.width}x{clip.height} "
+        f"en {len(segments)} segmentos ({len(todo)} codificados)")
+    return [out_base + ".y4m", out_base + ".wav"]
+
+
+def export_program(src: str, base_dir: str = ".", workers: int = 1,
+                   seconds: float = SEGMENT_SECONDS, resume: bool = True,
+                   keep_parts: bool = False, log: Callable[[str], None] = print,
+                   cache: Tuple[int, int] = (DEFAULT_BUDGET, 0),
+                   preview: Optional[Preview] = None) -> List[str]:
+    """Evalúa ``src`` y escribe todas sus exportaciones; devuelve los archivos creados."""
+    # Las sentencias muertas no se ejecutan: no abren fuentes ni planifican
+    # llamadas que ninguna exportación usa.
+    ev = evaluate(src, base_dir, cache=FrameCache(*cache), preview=preview, eliminate=True)
+    if ev.removed.removed:
+        log(ev.removed.format())
+    written: List[str] = []
+    for index, exp in enumerate(ev.exports):
+        if isinstance(exp.value, AudioStream):
+            path = exp.path if exp.path.lower().endswith(".wav") else exp.path + ".wav"
+            audio_engine.save(exp.value, path)
+            log(f"{path}: audio")
+            written.append(path)
+            continue
+        written += export_clip(src, base_dir, index, exp, ev.inputs, workers, seconds,
+                               resume, keep_parts, log, cache, preview)
+    if ev.cache.stats.requests:
+        log(ev.cache.stats.format())
+    ev.cache.close()
+    return written
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        usage="python export.py <archivo.txt> [--jobs N] [--segment S] [--no-resume] "
+              "[--keep-parts] [--cache-mb M] [--spill-mb M] [--preview [ESCALA]] [--preview-step N]")
+    ap.add_argument("archivo")
+    ap.add_argument("--jobs", type=jobs_arg, default=1,
+                    help="procesos que codifican segmentos (0 = todos los núcleos)")
+    ap.add_argument("--segment", type=float, default=SEGMENT_SECONDS,
+                    help="duración de cada segmento en segundos")
+    ap.add_argument("--no-resume", action="store_true",
+                    help="vuelve a codificar todos los segmentos")
+    ap.add_argument("--keep-parts", action="store_true",
+                    help="conserva los segmentos tras unirlos")
+    ap.add_argument("--cache-mb", type=int, default=DEFAULT_BUDGET // 2**20,
+                    help="memoria para fotogramas decodificados por proceso")
+    ap.add_argument("--spill-mb", type=int, default=0,
+                    help="archivo temporal para lo que no cabe en --cache-mb")
+    ap.add_argument("--preview", type=float, nargs="?", const=Preview.scale, default=None,
+                    metavar="ESCALA", help="vista previa rápida sobre fuentes reducidas "
+                    f"(escala por defecto {Preview.scale})")
+    ap.add_argument("--preview-step", type=int, default=Preview.step,
+                    help="en vista previa, usa uno de cada N fotogramas")
+    args = ap.parse_args()
+    preview = None
+    if args.preview is not None:
+        try:
+            preview = Preview(args.preview, args.preview_step)
+        except ValueError as exc:
+            ap.error(f"--preview: {exc}")
+    if args.segment <= 0:
+        ap.error("--segment debe ser > 0")
+    if args.cache_mb < 0 or args.spill_mb < 0:
+        ap.error("--cache-mb y --spill-mb deben ser >= 0")
+
+    ruta = args.archivo
+    try:
+        src = open(ruta, encoding='utf-8').read()
+    except FileNotFoundError:
+        print(f"Error: no existe '{ruta}'")
+        sys.exit(1)
+    try:
+        written = export_program(src, os.path.dirname(os.path.abspath(ruta)),
+                                 args.jobs or os.cpu_count() or 1, args.segment,
+                                 not args.no_resume, args.keep_parts,
+                                 cache=(args.cache_mb * 2**20, args.spill_mb * 2**20),
+                                 preview=preview)
+    except (EvalError, OSError, ValueError) as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+    if not written:
+        print("El programa no tiene sentencias exportar")
+
+
+if __name__ == '__main__':
+    main()
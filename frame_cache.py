@@ -0,0 +1,187 @@
+"""Caché de fotogramas decodificados compartida entre sentencias.
+
+Un programa suele usar la misma fuente muchas veces (varios ``@cortar``
+sobre un mismo ``video``, una exportación que vuelve a leer otra), y
+decodificar la fuente es lo que más cuesta. ``FrameCache`` guarda los
+fotogramas ya decodificados con clave ``(fuente, inicio, fin)``, es decir,
+el rango de índices que ocupa cada entrada; hoy cada entrada es un único
+fotograma (``fin = inicio + 1``), que es la unidad que piden los clips.
+
+La memoria está acotada por ``budget`` bytes con expulsión LRU. Si se da
+``spill`` (bytes), lo expulsado pasa a un archivo temporal mapeado en
+memoria antes de descartarse, de modo que volver a pedirlo cuesta una
+copia y no una decodificación. ``stats`` cuenta aciertos, fallos,
+expulsiones y lecturas desde el archivo.
+
+Los fotogramas devueltos son de sólo lectura: las operaciones de
+``media`` siempre producen arreglos nuevos y nunca escriben en su entrada.
+"""
+
+import mmap
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+# Presupuesto por defecto de fotogramas en memoria.
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+Key = Tuple[Hashable, int, int]
+
+
+@dataclass
+class CacheStats:
+    """Contadores de una ``FrameCache``."""
+    hits: int = 0            # servidos desde memoria
+    spill_hits: int = 0      # servidos desde el archivo de desborde
+    misses: int = 0          # decodificados
+    evictions: int = 0       # expulsados de memoria
+    spilled: int = 0         # escritos en el archivo de desborde
+    bytes: int = 0           # en memoria ahora
+    peak_bytes: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.spill_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fracción de pedidos que no hubo que decodificar."""
+        return (self.hits + self.spill_hits) / self.requests if self.requests else 0.0
+
+    def format(self) -> str:
+        return (f"caché: {self.requests} pedidos, {self.hit_rate:.1%} aciertos "
+                f"({self.hits} memoria, {self.spill_hits} desborde), "
+                f"{self.misses} decodificados, {self.evictions} expulsados, "
+                f"pico {self.peak_bytes / 2**20:.1f} MiB")
+
+
+class _SpillFile:
+    """Archivo temporal mapeado con huecos reutilizables por tamaño."""
+
+    def __init__(self, capacity: int, directory: Optional[str] = None) -> None:
+        self.capacity = capacity
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._file.truncate(capacity)
+        self._map = mmap.mmap(self._file.fileno(), capacity)
+        self.entries: "OrderedDict[Key, Tuple[int, tuple]]" = OrderedDict()
+        self._free: Dict[int, List[int]] = {}
+        self._tail = 0
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._free.clear()
+        self._tail = 0
+
+    def _release(self, key: Key) -> None:
+        offset, shape = self.entries.pop(key)
+        self._free.setdefault(int(np.prod(shape)), []).append(offset)
+
+    def _allocate(self, size: int) -> Optional[int]:
+        while True:
+            if self._free.get(size):
+                return self._free[size].pop()
+            if self._tail + size <= self.capacity:
+                self._tail += size
+                return self._tail - size
+            if not self.entries:
+                # Sólo quedan huecos de otros tamaños: se recompacta desde cero.
+                self._free.clear()
+                self._tail = 0
+                if size > self.capacity:
+                    return None
+                continue
+            self._release(next(iter(self.entries)))
+
+    def put(self, key: Key, frame: np.ndarray) -> bool:
+        offset = self._allocate(frame.nbytes)
+        if offset is None:
+            return False
+        self._map[offset:offset + frame.nbytes] = np.ascontiguousarray(frame, np.uint8).tobytes()
+        self.entries[key] = (offset, frame.shape)
+        return True
+
+    def take(self, key: Key) -> Optional[np.ndarray]:
+        """Saca ``key`` del archivo y devuelve una copia en memoria."""
+        if key not in self.entries:
+            return None
+        offset, shape = self.entries[key]
+        size = int(np.prod(shape))
+        frame = np.frombuffer(self._map, np.uint8, size, offset).reshape(shape).copy()
+        self._release(key)
+        return frame
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+class FrameCache:
+    """Fotogramas decodificados por ``(fuente, inicio, fin)`` con LRU y desborde opcional."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, spill: int = 0,
+                 spill_dir: Optional[str] = None) -> None:
+        if budget < 0 or spill < 0:
+            raise ValueError("cache sizes must not be negative")
+        self.budget = budget
+        self.stats = CacheStats()
+        self._frames: "OrderedDict[Key, np.ndarray]" = OrderedDict()
+        self._spill = _SpillFile(spill, spill_dir) if spill else None
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._frames or (self._spill is not None and key in self._spill.entries)
+
+    def get(self, source: Hashable, index: int,
+            decode: Callable[[int], np.ndarray]) -> np.ndarray:
+        """Fotograma ``index`` de ``source``; llama a ``decode`` sólo si no está guardado."""
+        key = (source, index, index + 1)
+        frame = self._frames.get(key)
+        if frame is not None:
+            self._frames.move_to_end(key)
+            self.stats.hits += 1
+            return frame
+        frame = self._spill.take(key) if self._spill is not None else None
+        if frame is not None:
+            self.stats.spill_hits += 1
+        else:
+            self.stats.misses += 1
+            frame = np.asarray(decode(index))
+        frame.flags.writeable = False
+        self._store(key, frame)
+        return frame
+
+    def reader(self, source: Hashable,
+               decode: Callable[[int], np.ndarray]) -> Callable[[int], np.ndarray]:
+        """Función ``render`` que pasa por la caché (ver ``media.load``)."""
+        return lambda i: self.get(source, i, decode)
+
+    def _store(self, key: Key, frame: np.ndarray) -> None:
+        if frame.nbytes > self.budget:
+            return
+        self._frames[key] = frame
+        self.stats.bytes += frame.nbytes
+        while self.stats.bytes > self.budget:
+            old_key, old = self._frames.popitem(last=False)
+            self.stats.bytes -= old.nbytes
+            self.stats.evictions += 1
+            if self._spill is not None and self._spill.put(old_key, old):
+                self.stats.spilled += 1
+        self.stats.peak_bytes = max(self.stats.peak_bytes, self.stats.bytes)
+
+    def clear(self) -> None:
+        """Vacía la caché (los contadores se conservan)."""
+        self._frames.clear()
+        self.stats.bytes = 0
+        if self._spill is not None:
+            self._spill.clear()
+
+    def close(self) -> None:
+        self.clear()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
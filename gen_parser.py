@@ -0,0 +1,287 @@
+"""Generador de un parser descendente recursivo a partir de ``PARSING_TABLE``.
+
+``build_tree`` interpreta la tabla LL(1) con una pila y un diccionario por
+símbolo. Este módulo escribe ``generated_parser.py``, con una función por
+no terminal y el despacho por lookahead resuelto en ``if`` en línea. Las
+reglas con recursión de cola sobre sí mismas (``StmtList``, ``AddExpr'``,
+``Term'``…) se convierten en bucles: el árbol sigue anidado igual, pero sin
+una llamada Python por cada operador o sentencia.
+
+El módulo generado guarda el hash de ``grammar_def.py`` y de este archivo;
+``load_parser`` lo regenera cuando alguno cambia.
+"""
+
+import argparse
+import hashlib
+import importlib
+import os
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+from enums import TokenType
+from grammar_def import PARSING_TABLE, START_SYMBOL, EPSILON
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GENERATED_MODULE = "generated_parser"
+GENERATED_PATH = os.path.join(HERE, GENERATED_MODULE + ".py")
+_SOURCES = ("grammar_def.py", "gen_parser.py")
+
+# A partir de cuántos lookaheads se usa un frozenset en lugar de ``is``.
+_SET_THRESHOLD = 3
+
+
+def grammar_hash() -> str:
+    """Hash de la gramática y del generador que produjeron el parser."""
+    h = hashlib.sha256()
+    for name in _SOURCES:
+        with open(os.path.join(HERE, name), 'rb') as fh:
+            h.update(fh.read())
+    return h.hexdigest()
+
+
+def _fn(nonterminal: str) -> str:
+    return "p_" + nonterminal.replace("'", "_")
+
+
+def _label(sym) -> str:
+    return sym.name if isinstance(sym, TokenType) else str(sym)
+
+
+def _alternatives(rules: Dict) -> List[Tuple[List[TokenType], list]]:
+    """Agrupa los lookaheads que comparten producción, en orden de aparición."""
+    groups: Dict[tuple, Tuple[List[TokenType], list]] = {}
+    for tt, prod in rules.items():
+        key = tuple(prod)
+        if key not in groups:
+            groups[key] = ([], prod)
+        groups[key][0].append(tt)
+    return list(groups.values())
+
+
+def generate(table: Dict = PARSING_TABLE, digest: str = "") -> str:
+    """Devuelve el código fuente del parser especializado para ``table``."""
+    head: List[str] = []
+    body: List[str] = []
+    sets: List[str] = []
+
+    head.append('"""Parser LL(1) especializado. Generado por gen_parser.py: no editar."""')
+    head.append("")
+    head.append("from enums import Token, TokenType")
+    head.append("from parse_tree import ParseTreeNode, token_repr")
+    head.append("")
+    head.append(f"GRAMMAR_HASH = {digest!r}")
+    head.append(f"START_SYMBOL = {START_SYMBOL!r}")
+    head.append("")
+    used = sorted({tt.name for rules in table.values() for tt in rules}
+                  | {s.name for rules in table.values() for prod in rules.values()
+                     for s in prod if isinstance(s, TokenType)} | {"EOF"})
+    for name in used:
+        head.append(f"T_{name} = TokenType.{name}")
+    head.append("")
+
+    for nt, rules in table.items():
+        alts = _alternatives(rules)
+        loops = any(prod and prod[-1] == nt for _, prod in alts)
+        ind = "            " if loops else "        "
+        body.append(f"    def {_fn(nt)}(self, node):")
+        if loops:
+            body.append("        while True:")
+        body.append(f"{ind}t = self.cur.type")
+        for k, (lookaheads, prod) in enumerate(alts):
+            kw = "if" if k == 0 else "elif"
+            if len(lookaheads) >= _SET_THRESHOLD:
+                set_name = f"_FIRST_{_fn(nt)[2:]}_{k}"
+                sets.append(f"{set_name} = frozenset(("
+                            + ", ".join(f"T_{tt.name}" for tt in lookaheads) + "))")
+                cond = f"t in {set_name}"
+            else:
+                cond = " or ".join(f"t is T_{tt.name}" for tt in lookaheads)
+            body.append(f"{ind}{kw} {cond}:")
+            inner = ind + "    "
+            body.append(f"{inner}n = self.n")
+            names = [f"c{i}" for i in range(len(prod))]
+            for i, sym in enumerate(prod):
+                body.append(f"{inner}{names[i]} = Node(n + {i + 1}, {_label(sym)!r}, None, [])")
+            body.append(f"{inner}self.n = n + {len(prod)}")
+            body.append(f"{inner}node.children = [{', '.join(names)}]")
+            tail = None
+            for i, sym in enumerate(prod):
+                if sym == EPSILON:
+                    continue
+                if isinstance(sym, TokenType):
+                    body.append(f"{inner}self.match({names[i]}, T_{sym.name})")
+                elif loops and i == len(prod) - 1 and sym == nt:
+                    tail = names[i]
+                else:
+                    body.append(f"{inner}self.{_fn(sym)}({names[i]})")
+            if tail:
+                body.append(f"{inner}node = {tail}")
+                body.append(f"{inner}continue")
+            else:
+                body.append(f"{inner}return")
+        body.append(f"{ind}self.unexpected({nt!r})")
+        if loops:
+            body.append(f"{ind}return")
+        body.append("")
+
+    out = head + sets + ["", "", _RUNTIME] + body
+    out.append(_FOOTER)
+    return "\n".join(out)
+
+
+_RUNTIME = '''Node = ParseTreeNode
+
+
+class GeneratedParser:
+    """Parser descendente recursivo; produce el mismo árbol que ``build_tree``."""
+
+    def __init__(self, tokens):
+        if not tokens or tokens[-1].type != T_EOF:
+            last = tokens[-1] if tokens else None
+            tokens = list(tokens) + [Token(T_EOF, "",
+                                           last.line if last else 0,
+                                           last.column if last else 0)]
+        self.tokens = tokens
+        self.last = len(tokens) - 1
+        self.pos = 0
+        self.cur = tokens[0]
+        self.n = 0
+        self.errors = []
+
+    def advance(self):
+        self.pos += 1
+        self.cur = self.tokens[self.pos] if self.pos <= self.last else self.tokens[-1]
+
+    def match(self, node, tt):
+        tok = self.cur
+        if tok.type is tt:
+            self.n += 1
+            node.children.append(Node(self.n, token_repr(tok.type, tok.value), tok, []))
+            self.advance()
+        else:
+            self.errors.append(
+                f"Expected {tt.name} but found {tok.type.name} "
+                f"at line {tok.line}, column {tok.column}"
+            )
+
+    def unexpected(self, sym):
+        tok = self.cur
+        self.errors.append(
+            f"Unexpected {tok.type.name} '{tok.value}' in {sym} "
+            f"at line {tok.line}, column {tok.column}"
+        )
+        self.advance()
+
+    def parse(self, start_symbol=START_SYMBOL):
+        self.n = 1
+        root = Node(1, start_symbol, None, [])
+        getattr(self, "p_" + start_symbol.replace("'", "_"))(root)
+        return root
+'''
+
+_FOOTER = '''
+
+def parse(tokens, start_symbol=START_SYMBOL):
+    """Devuelve ``(raiz, errores)`` para ``tokens``.
+
+    Cada paréntesis, llamada ``@`` o bloque anidado cuesta varios marcos de
+    Python; si el anidamiento agota la pila se recurre a ``build_tree``, que
+    usa una pila explícita y produce el mismo árbol.
+    """
+    parser = GeneratedParser(tokens)
+    try:
+        root = parser.parse(start_symbol)
+    except RecursionError:
+        from parse_tree import parse as parse_table
+
+        return parse_table(tokens, start_symbol)
+    return root, parser.errors
+'''
+
+
+def write_parser(path: str = GENERATED_PATH) -> None:
+    """Regenera el módulo del parser especializado."""
+    src = generate(PARSING_TABLE, grammar_hash())
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(src)
+
+
+def load_parser():
+    """Importa ``generated_parser``, regenerándolo si la gramática cambió."""
+    digest = grammar_hash()
+    try:
+        module = importlib.import_module(GENERATED_MODULE)
+    except ImportError:
+        module = None
+    if module is None or getattr(module, "GRAMMAR_HASH", None) != digest:
+        write_parser()
+        importlib.invalidate_caches()
+        module = importlib.reload(module) if module else importlib.import_module(GENERATED_MODULE)
+    return module
+
+
+def trees_equal(a, b) -> bool:
+    """Compara dos árboles (ids, etiquetas, tokens y forma) sin recursión."""
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        if (x.id, x.label, x.token) != (y.id, y.label, y.token) \
+                or len(x.children) != len(y.children):
+            return False
+        stack.extend(zip(x.children, y.children))
+    return True
+
+
+def verify(tokens: Sequence) -> bool:
+    """Comprueba que el parser generado coincide con el de tabla en ``tokens``."""
+    from parse_tree import ParseTreeVisualizer
+
+    visualizer = ParseTreeVisualizer()
+    expected = visualizer.build_tree(list(tokens))
+    root, errors = load_parser().parse(tokens)
+    return trees_equal(expected, root) and errors == visualizer.errors
+
+
+def deep_nesting_samples(depth: int = 1000) -> Dict[str, str]:
+    """Programas cuyo anidamiento supera la pila de llamadas de Python."""
+    return {
+        f"<{depth} paréntesis>": "main {\nx = " + "(" * depth + "1" + ")" * depth + ";\n}\n",
+        f"<{depth} llamadas @>": "main {\nv = " + "@flip[" * depth + "clip" + "]" * depth + ";\n}\n",
+        f"<{depth} if anidados>": "main {\n" + "if (a) {\n" * depth + "x = 1;\n" + "}\n" * depth + "}\n",
+    }
+
+
+def main() -> None:
+    """Regenera el parser; con ``--check`` verifica que coincide con la tabla.
+
+    ``--check`` prueba siempre los casos de ``deep_nesting_samples`` además
+    de los archivos indicados.
+    """
+    ap = argparse.ArgumentParser(usage="python gen_parser.py [--check [archivo.txt ...]]")
+    ap.add_argument("--check", nargs="*", default=None, metavar="archivo")
+    args = ap.parse_args()
+
+    write_parser()
+    print(f"Parser generado en {GENERATED_PATH}")
+    if args.check is None:
+        return
+
+    from lexer import Lexer
+
+    ok = True
+    samples = deep_nesting_samples()
+    for ruta in args.check:
+        try:
+            samples[ruta] = open(ruta, encoding='utf-8').read()
+        except FileNotFoundError:
+            print(f"Error: no existe '{ruta}'")
+            ok = False
+    for name, src in samples.items():
+        same = verify(Lexer(src).tokenize())
+        print(f"{'✓' if same else '✗'} {name}")
+        ok = ok and same
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,972 @@
+"""Parser LL(1) especializado. Generado por gen_parser.py: no editar."""
+
+from enums import Token, TokenType
+from parse_tree import ParseTreeNode, token_repr
+
+GRAMMAR_HASH = 'df15f75ad94b82b2019a76d91355f8986b00fcaedaaf2492c8ceeb34f9f6588c'
+START_SYMBOL = 'Program'
+
+T_AND = TokenType.AND
+T_AS = TokenType.AS
+T_ASSIGN = TokenType.ASSIGN
+T_AUDIO_TYPE = TokenType.AUDIO_TYPE
+T_COLON = TokenType.COLON
+T_COMMA = TokenType.COMMA
+T_DIV = TokenType.DIV
+T_ELSE = TokenType.ELSE
+T_EOF = TokenType.EOF
+T_EQ = TokenType.EQ
+T_EXPORT = TokenType.EXPORT
+T_FLOAT_LITERAL = TokenType.FLOAT_LITERAL
+T_FLOAT_TYPE = TokenType.FLOAT_TYPE
+T_GE = TokenType.GE
+T_GT = TokenType.GT
+T_IDENTIFIER = TokenType.IDENTIFIER
+T_IF = TokenType.IF
+T_INT_LITERAL = TokenType.INT_LITERAL
+T_INT_TYPE = TokenType.INT_TYPE
+T_LBRACE = TokenType.LBRACE
+T_LBRACKET = TokenType.LBRACKET
+T_LE = TokenType.LE
+T_LPAREN = TokenType.LPAREN
+T_LT = TokenType.LT
+T_MAIN = TokenType.MAIN
+T_MINUS = TokenType.MINUS
+T_MULT = TokenType.MULT
+T_NEQ = TokenType.NEQ
+T_NOT = TokenType.NOT
+T_OR = TokenType.OR
+T_PLUS = TokenType.PLUS
+T_RBRACE = TokenType.RBRACE
+T_RBRACKET = TokenType.RBRACKET
+T_RPAREN = TokenType.RPAREN
+T_SEMICOLON = TokenType.SEMICOLON
+T_STRING_LITERAL = TokenType.STRING_LITERAL
+T_STRING_TYPE = TokenType.STRING_TYPE
+T_VIDEO_AGREGAR_MUSICA = TokenType.VIDEO_AGREGAR_MUSICA
+T_VIDEO_CONCATENAR = TokenType.VIDEO_CONCATENAR
+T_VIDEO_CORTAR = TokenType.VIDEO_CORTAR
+T_VIDEO_EXTRAER_AUDIO = TokenType.VIDEO_EXTRAER_AUDIO
+T_VIDEO_FADEIN = TokenType.VIDEO_FADEIN
+T_VIDEO_FADEOUT = TokenType.VIDEO_FADEOUT
+T_VIDEO_FLIP = TokenType.VIDEO_FLIP
+T_VIDEO_QUITAR_AUDIO = TokenType.VIDEO_QUITAR_AUDIO
+T_VIDEO_RESIZE = TokenType.VIDEO_RESIZE
+T_VIDEO_SILENCIO = TokenType.VIDEO_SILENCIO
+T_VIDEO_TYPE = TokenType.VIDEO_TYPE
+T_VIDEO_VELOCIDAD = TokenType.VIDEO_VELOCIDAD
+T_WHILE = TokenType.WHILE
+
+_FIRST_StmtList_0 = frozenset((T_INT_TYPE, T_FLOAT_TYPE, T_STRING_TYPE, T_VIDEO_TYPE, T_AUDIO_TYPE, T_IDENTIFIER, T_IF, T_WHILE, T_EXPORT))
+_FIRST_Stmt_0 = frozenset((T_INT_TYPE, T_FLOAT_TYPE, T_STRING_TYPE, T_VIDEO_TYPE, T_AUDIO_TYPE))
+_FIRST_VarDecl_0 = frozenset((T_INT_TYPE, T_FLOAT_TYPE, T_STRING_TYPE, T_VIDEO_TYPE, T_AUDIO_TYPE))
+_FIRST_ElseOpt_1 = frozenset((T_INT_TYPE, T_FLOAT_TYPE, T_STRING_TYPE, T_VIDEO_TYPE, T_AUDIO_TYPE, T_IDENTIFIER, T_IF, T_WHILE, T_EXPORT, T_RBRACE))
+_FIRST_Expr_0 = frozenset((T_IDENTIFIER, T_INT_LITERAL, T_FLOAT_LITERAL, T_STRING_LITERAL, T_LPAREN, T_NOT, T_MINUS, T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+_FIRST_OrExpr_0 = frozenset((T_IDENTIFIER, T_INT_LITERAL, T_FLOAT_LITERAL, T_STRING_LITERAL, T_LPAREN, T_NOT, T_MINUS, T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+_FIRST_OrExpr__1 = frozenset((T_RPAREN, T_SEMICOLON, T_AS, T_COMMA, T_RBRACKET))
+_FIRST_AndExpr_0 = frozenset((T_IDENTIFIER, T_INT_LITERAL, T_FLOAT_LITERAL, T_STRING_LITERAL, T_LPAREN, T_NOT, T_MINUS, T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+_FIRST_AndExpr__1 = frozenset((T_OR, T_RPAREN, T_SEMICOLON, T_AS, T_COMMA, T_RBRACKET))
+_FIRST_EqualityExpr_0 = frozenset((T_IDENTIFIER, T_INT_LITERAL, T_FLOAT_LITERAL, T_STRING_LITERAL, T_LPAREN, T_NOT, T_MINUS, T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+_FIRST_EqualityExpr__2 = frozenset((T_LT, T_LE, T_GT, T_GE, T_AND, T_OR, T_RPAREN, T_SEMICOLON, T_AS, T_COMMA, T_RBRACKET))
+_FIRST_RelExpr_0 = frozenset((T_IDENTIFIER, T_INT_LITERAL, T_FLOAT_LITERAL, T_STRING_LITERAL, T_LPAREN, T_NOT, T_MINUS, T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+_FIRST_RelExpr__4 = frozenset((T_EQ, T_NEQ, T_AND, T_OR, T_RPAREN, T_SEMICOLON, T_AS, T_COMMA, T_RBRACKET))
+_FIRST_AddExpr_0 = frozenset((T_IDENTIFIER, T_INT_LITERAL, T_FLOAT_LITERAL, T_STRING_LITERAL, T_LPAREN, T_NOT, T_MINUS, T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+_FIRST_AddExpr__2 = frozenset((T_LT, T_LE, T_GT, T_GE, T_EQ, T_NEQ, T_AND, T_OR, T_RPAREN, T_SEMICOLON, T_AS, T_COMMA, T_RBRACKET))
+_FIRST_Term_0 = frozenset((T_IDENTIFIER, T_INT_LITERAL, T_FLOAT_LITERAL, T_STRING_LITERAL, T_LPAREN, T_NOT, T_MINUS, T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+_FIRST_Term__2 = frozenset((T_PLUS, T_MINUS, T_LT, T_LE, T_GT, T_GE, T_EQ, T_NEQ, T_AND, T_OR, T_RPAREN, T_SEMICOLON, T_AS, T_COMMA, T_RBRACKET))
+_FIRST_Factor_7 = frozenset((T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+_FIRST_ArgListOpt_0 = frozenset((T_IDENTIFIER, T_INT_LITERAL, T_FLOAT_LITERAL, T_STRING_LITERAL, T_LPAREN, T_NOT, T_MINUS, T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+_FIRST_ArgList_0 = frozenset((T_IDENTIFIER, T_INT_LITERAL, T_FLOAT_LITERAL, T_STRING_LITERAL, T_LPAREN, T_NOT, T_MINUS, T_VIDEO_RESIZE, T_VIDEO_FLIP, T_VIDEO_VELOCIDAD, T_VIDEO_FADEIN, T_VIDEO_FADEOUT, T_VIDEO_SILENCIO, T_VIDEO_EXTRAER_AUDIO, T_VIDEO_QUITAR_AUDIO, T_VIDEO_AGREGAR_MUSICA, T_VIDEO_CONCATENAR, T_VIDEO_CORTAR))
+
+
+Node = ParseTreeNode
+
+
+class GeneratedParser:
+    """Parser descendente recursivo; produce el mismo árbol que ``build_tree``."""
+
+    def __init__(self, tokens):
+        if not tokens or tokens[-1].type != T_EOF:
+            last = tokens[-1] if tokens else None
+            tokens = list(tokens) + [Token(T_EOF, "",
+                                           last.line if last else 0,
+                                           last.column if last else 0)]
+        self.tokens = tokens
+        self.last = len(tokens) - 1
+        self.pos = 0
+        self.cur = tokens[0]
+        self.n = 0
+        self.errors = []
+
+    def advance(self):
+        self.pos += 1
+        self.cur = self.tokens[self.pos] if self.pos <= self.last else self.tokens[-1]
+
+    def match(self, node, tt):
+        tok = self.cur
+        if tok.type is tt:
+            self.n += 1
+            node.children.append(Node(self.n, token_repr(tok.type, tok.value), tok, []))
+            self.advance()
+        else:
+            self.errors.append(
+                f"Expected {tt.name} but found {tok.type.name} "
+                f"at line {tok.line}, column {tok.column}"
+            )
+
+    def unexpected(self, sym):
+        tok = self.cur
+        self.errors.append(
+            f"Unexpected {tok.type.name} '{tok.value}' in {sym} "
+            f"at line {tok.line}, column {tok.column}"
+        )
+        self.advance()
+
+    def parse(self, start_symbol=START_SYMBOL):
+        self.n = 1
+        root = Node(1, start_symbol, None, [])
+        getattr(self, "p_" + start_symbol.replace("'", "_"))(root)
+        return root
+
+    def p_Program(self, node):
+        t = self.cur.type
+        if t is T_MAIN:
+            n = self.n
+            c0 = Node(n + 1, 'MAIN', None, [])
+            c1 = Node(n + 2, 'Block', None, [])
+            c2 = Node(n + 3, 'EOF', None, [])
+            self.n = n + 3
+            node.children = [c0, c1, c2]
+            self.match(c0, T_MAIN)
+            self.p_Block(c1)
+            self.match(c2, T_EOF)
+            return
+        self.unexpected('Program')
+
+    def p_Block(self, node):
+        t = self.cur.type
+        if t is T_LBRACE:
+            n = self.n
+            c0 = Node(n + 1, 'LBRACE', None, [])
+            c1 = Node(n + 2, 'StmtList', None, [])
+            c2 = Node(n + 3, 'RBRACE', None, [])
+            self.n = n + 3
+            node.children = [c0, c1, c2]
+            self.match(c0, T_LBRACE)
+            self.p_StmtList(c1)
+            self.match(c2, T_RBRACE)
+            return
+        self.unexpected('Block')
+
+    def p_StmtList(self, node):
+        while True:
+            t = self.cur.type
+            if t in _FIRST_StmtList_0:
+                n = self.n
+                c0 = Node(n + 1, 'Stmt', None, [])
+                c1 = Node(n + 2, 'StmtList', None, [])
+                self.n = n + 2
+                node.children = [c0, c1]
+                self.p_Stmt(c0)
+                node = c1
+                continue
+            elif t is T_RBRACE:
+                n = self.n
+                c0 = Node(n + 1, 'ε', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                return
+            self.unexpected('StmtList')
+            return
+
+    def p_Stmt(self, node):
+        t = self.cur.type
+        if t in _FIRST_Stmt_0:
+            n = self.n
+            c0 = Node(n + 1, 'VarDecl', None, [])
+            c1 = Node(n + 2, 'SEMICOLON', None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_VarDecl(c0)
+            self.match(c1, T_SEMICOLON)
+            return
+        elif t is T_IDENTIFIER:
+            n = self.n
+            c0 = Node(n + 1, 'Assignment', None, [])
+            c1 = Node(n + 2, 'SEMICOLON', None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_Assignment(c0)
+            self.match(c1, T_SEMICOLON)
+            return
+        elif t is T_IF:
+            n = self.n
+            c0 = Node(n + 1, 'IfStmt', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            self.p_IfStmt(c0)
+            return
+        elif t is T_WHILE:
+            n = self.n
+            c0 = Node(n + 1, 'WhileStmt', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            self.p_WhileStmt(c0)
+            return
+        elif t is T_EXPORT:
+            n = self.n
+            c0 = Node(n + 1, 'ExportStmt', None, [])
+            c1 = Node(n + 2, 'SEMICOLON', None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_ExportStmt(c0)
+            self.match(c1, T_SEMICOLON)
+            return
+        self.unexpected('Stmt')
+
+    def p_VarDecl(self, node):
+        t = self.cur.type
+        if t in _FIRST_VarDecl_0:
+            n = self.n
+            c0 = Node(n + 1, 'Type', None, [])
+            c1 = Node(n + 2, 'COLON', None, [])
+            c2 = Node(n + 3, 'IDENTIFIER', None, [])
+            c3 = Node(n + 4, 'VarInitOpt', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.p_Type(c0)
+            self.match(c1, T_COLON)
+            self.match(c2, T_IDENTIFIER)
+            self.p_VarInitOpt(c3)
+            return
+        self.unexpected('VarDecl')
+
+    def p_VarInitOpt(self, node):
+        t = self.cur.type
+        if t is T_ASSIGN:
+            n = self.n
+            c0 = Node(n + 1, 'ASSIGN', None, [])
+            c1 = Node(n + 2, 'Expr', None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.match(c0, T_ASSIGN)
+            self.p_Expr(c1)
+            return
+        elif t is T_SEMICOLON:
+            n = self.n
+            c0 = Node(n + 1, 'ε', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            return
+        self.unexpected('VarInitOpt')
+
+    def p_Type(self, node):
+        t = self.cur.type
+        if t is T_INT_TYPE:
+            n = self.n
+            c0 = Node(n + 1, 'INT_TYPE', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            self.match(c0, T_INT_TYPE)
+            return
+        elif t is T_FLOAT_TYPE:
+            n = self.n
+            c0 = Node(n + 1, 'FLOAT_TYPE', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            self.match(c0, T_FLOAT_TYPE)
+            return
+        elif t is T_STRING_TYPE:
+            n = self.n
+            c0 = Node(n + 1, 'STRING_TYPE', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            self.match(c0, T_STRING_TYPE)
+            return
+        elif t is T_VIDEO_TYPE:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_TYPE', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            self.match(c0, T_VIDEO_TYPE)
+            return
+        elif t is T_AUDIO_TYPE:
+            n = self.n
+            c0 = Node(n + 1, 'AUDIO_TYPE', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            self.match(c0, T_AUDIO_TYPE)
+            return
+        self.unexpected('Type')
+
+    def p_Assignment(self, node):
+        t = self.cur.type
+        if t is T_IDENTIFIER:
+            n = self.n
+            c0 = Node(n + 1, 'IDENTIFIER', None, [])
+            c1 = Node(n + 2, 'ASSIGN', None, [])
+            c2 = Node(n + 3, 'Expr', None, [])
+            self.n = n + 3
+            node.children = [c0, c1, c2]
+            self.match(c0, T_IDENTIFIER)
+            self.match(c1, T_ASSIGN)
+            self.p_Expr(c2)
+            return
+        self.unexpected('Assignment')
+
+    def p_IfStmt(self, node):
+        t = self.cur.type
+        if t is T_IF:
+            n = self.n
+            c0 = Node(n + 1, 'IF', None, [])
+            c1 = Node(n + 2, 'LPAREN', None, [])
+            c2 = Node(n + 3, 'Expr', None, [])
+            c3 = Node(n + 4, 'RPAREN', None, [])
+            c4 = Node(n + 5, 'Block', None, [])
+            c5 = Node(n + 6, 'ElseOpt', None, [])
+            self.n = n + 6
+            node.children = [c0, c1, c2, c3, c4, c5]
+            self.match(c0, T_IF)
+            self.match(c1, T_LPAREN)
+            self.p_Expr(c2)
+            self.match(c3, T_RPAREN)
+            self.p_Block(c4)
+            self.p_ElseOpt(c5)
+            return
+        self.unexpected('IfStmt')
+
+    def p_ElseOpt(self, node):
+        t = self.cur.type
+        if t is T_ELSE:
+            n = self.n
+            c0 = Node(n + 1, 'ELSE', None, [])
+            c1 = Node(n + 2, 'Block', None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.match(c0, T_ELSE)
+            self.p_Block(c1)
+            return
+        elif t in _FIRST_ElseOpt_1:
+            n = self.n
+            c0 = Node(n + 1, 'ε', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            return
+        self.unexpected('ElseOpt')
+
+    def p_WhileStmt(self, node):
+        t = self.cur.type
+        if t is T_WHILE:
+            n = self.n
+            c0 = Node(n + 1, 'WHILE', None, [])
+            c1 = Node(n + 2, 'LPAREN', None, [])
+            c2 = Node(n + 3, 'Expr', None, [])
+            c3 = Node(n + 4, 'RPAREN', None, [])
+            c4 = Node(n + 5, 'Block', None, [])
+            self.n = n + 5
+            node.children = [c0, c1, c2, c3, c4]
+            self.match(c0, T_WHILE)
+            self.match(c1, T_LPAREN)
+            self.p_Expr(c2)
+            self.match(c3, T_RPAREN)
+            self.p_Block(c4)
+            return
+        self.unexpected('WhileStmt')
+
+    def p_ExportStmt(self, node):
+        t = self.cur.type
+        if t is T_EXPORT:
+            n = self.n
+            c0 = Node(n + 1, 'EXPORT', None, [])
+            c1 = Node(n + 2, 'Expr', None, [])
+            c2 = Node(n + 3, 'AS', None, [])
+            c3 = Node(n + 4, 'STRING_LITERAL', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_EXPORT)
+            self.p_Expr(c1)
+            self.match(c2, T_AS)
+            self.match(c3, T_STRING_LITERAL)
+            return
+        self.unexpected('ExportStmt')
+
+    def p_Expr(self, node):
+        t = self.cur.type
+        if t in _FIRST_Expr_0:
+            n = self.n
+            c0 = Node(n + 1, 'OrExpr', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            self.p_OrExpr(c0)
+            return
+        self.unexpected('Expr')
+
+    def p_OrExpr(self, node):
+        t = self.cur.type
+        if t in _FIRST_OrExpr_0:
+            n = self.n
+            c0 = Node(n + 1, 'AndExpr', None, [])
+            c1 = Node(n + 2, "OrExpr'", None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_AndExpr(c0)
+            self.p_OrExpr_(c1)
+            return
+        self.unexpected('OrExpr')
+
+    def p_OrExpr_(self, node):
+        while True:
+            t = self.cur.type
+            if t is T_OR:
+                n = self.n
+                c0 = Node(n + 1, 'OR', None, [])
+                c1 = Node(n + 2, 'AndExpr', None, [])
+                c2 = Node(n + 3, "OrExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_OR)
+                self.p_AndExpr(c1)
+                node = c2
+                continue
+            elif t in _FIRST_OrExpr__1:
+                n = self.n
+                c0 = Node(n + 1, 'ε', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                return
+            self.unexpected("OrExpr'")
+            return
+
+    def p_AndExpr(self, node):
+        t = self.cur.type
+        if t in _FIRST_AndExpr_0:
+            n = self.n
+            c0 = Node(n + 1, 'EqualityExpr', None, [])
+            c1 = Node(n + 2, "AndExpr'", None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_EqualityExpr(c0)
+            self.p_AndExpr_(c1)
+            return
+        self.unexpected('AndExpr')
+
+    def p_AndExpr_(self, node):
+        while True:
+            t = self.cur.type
+            if t is T_AND:
+                n = self.n
+                c0 = Node(n + 1, 'AND', None, [])
+                c1 = Node(n + 2, 'EqualityExpr', None, [])
+                c2 = Node(n + 3, "AndExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_AND)
+                self.p_EqualityExpr(c1)
+                node = c2
+                continue
+            elif t in _FIRST_AndExpr__1:
+                n = self.n
+                c0 = Node(n + 1, 'ε', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                return
+            self.unexpected("AndExpr'")
+            return
+
+    def p_EqualityExpr(self, node):
+        t = self.cur.type
+        if t in _FIRST_EqualityExpr_0:
+            n = self.n
+            c0 = Node(n + 1, 'RelExpr', None, [])
+            c1 = Node(n + 2, "EqualityExpr'", None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_RelExpr(c0)
+            self.p_EqualityExpr_(c1)
+            return
+        self.unexpected('EqualityExpr')
+
+    def p_EqualityExpr_(self, node):
+        while True:
+            t = self.cur.type
+            if t is T_EQ:
+                n = self.n
+                c0 = Node(n + 1, 'EQ', None, [])
+                c1 = Node(n + 2, 'RelExpr', None, [])
+                c2 = Node(n + 3, "EqualityExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_EQ)
+                self.p_RelExpr(c1)
+                node = c2
+                continue
+            elif t is T_NEQ:
+                n = self.n
+                c0 = Node(n + 1, 'NEQ', None, [])
+                c1 = Node(n + 2, 'RelExpr', None, [])
+                c2 = Node(n + 3, "EqualityExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_NEQ)
+                self.p_RelExpr(c1)
+                node = c2
+                continue
+            elif t in _FIRST_EqualityExpr__2:
+                n = self.n
+                c0 = Node(n + 1, 'ε', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                return
+            self.unexpected("EqualityExpr'")
+            return
+
+    def p_RelExpr(self, node):
+        t = self.cur.type
+        if t in _FIRST_RelExpr_0:
+            n = self.n
+            c0 = Node(n + 1, 'AddExpr', None, [])
+            c1 = Node(n + 2, "RelExpr'", None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_AddExpr(c0)
+            self.p_RelExpr_(c1)
+            return
+        self.unexpected('RelExpr')
+
+    def p_RelExpr_(self, node):
+        while True:
+            t = self.cur.type
+            if t is T_LT:
+                n = self.n
+                c0 = Node(n + 1, 'LT', None, [])
+                c1 = Node(n + 2, 'AddExpr', None, [])
+                c2 = Node(n + 3, "RelExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_LT)
+                self.p_AddExpr(c1)
+                node = c2
+                continue
+            elif t is T_LE:
+                n = self.n
+                c0 = Node(n + 1, 'LE', None, [])
+                c1 = Node(n + 2, 'AddExpr', None, [])
+                c2 = Node(n + 3, "RelExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_LE)
+                self.p_AddExpr(c1)
+                node = c2
+                continue
+            elif t is T_GT:
+                n = self.n
+                c0 = Node(n + 1, 'GT', None, [])
+                c1 = Node(n + 2, 'AddExpr', None, [])
+                c2 = Node(n + 3, "RelExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_GT)
+                self.p_AddExpr(c1)
+                node = c2
+                continue
+            elif t is T_GE:
+                n = self.n
+                c0 = Node(n + 1, 'GE', None, [])
+                c1 = Node(n + 2, 'AddExpr', None, [])
+                c2 = Node(n + 3, "RelExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_GE)
+                self.p_AddExpr(c1)
+                node = c2
+                continue
+            elif t in _FIRST_RelExpr__4:
+                n = self.n
+                c0 = Node(n + 1, 'ε', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                return
+            self.unexpected("RelExpr'")
+            return
+
+    def p_AddExpr(self, node):
+        t = self.cur.type
+        if t in _FIRST_AddExpr_0:
+            n = self.n
+            c0 = Node(n + 1, 'Term', None, [])
+            c1 = Node(n + 2, "AddExpr'", None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_Term(c0)
+            self.p_AddExpr_(c1)
+            return
+        self.unexpected('AddExpr')
+
+    def p_AddExpr_(self, node):
+        while True:
+            t = self.cur.type
+            if t is T_PLUS:
+                n = self.n
+                c0 = Node(n + 1, 'PLUS', None, [])
+                c1 = Node(n + 2, 'Term', None, [])
+                c2 = Node(n + 3, "AddExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_PLUS)
+                self.p_Term(c1)
+                node = c2
+                continue
+            elif t is T_MINUS:
+                n = self.n
+                c0 = Node(n + 1, 'MINUS', None, [])
+                c1 = Node(n + 2, 'Term', None, [])
+                c2 = Node(n + 3, "AddExpr'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_MINUS)
+                self.p_Term(c1)
+                node = c2
+                continue
+            elif t in _FIRST_AddExpr__2:
+                n = self.n
+                c0 = Node(n + 1, 'ε', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                return
+            self.unexpected("AddExpr'")
+            return
+
+    def p_Term(self, node):
+        t = self.cur.type
+        if t in _FIRST_Term_0:
+            n = self.n
+            c0 = Node(n + 1, 'Factor', None, [])
+            c1 = Node(n + 2, "Term'", None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_Factor(c0)
+            self.p_Term_(c1)
+            return
+        self.unexpected('Term')
+
+    def p_Term_(self, node):
+        while True:
+            t = self.cur.type
+            if t is T_MULT:
+                n = self.n
+                c0 = Node(n + 1, 'MULT', None, [])
+                c1 = Node(n + 2, 'Factor', None, [])
+                c2 = Node(n + 3, "Term'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_MULT)
+                self.p_Factor(c1)
+                node = c2
+                continue
+            elif t is T_DIV:
+                n = self.n
+                c0 = Node(n + 1, 'DIV', None, [])
+                c1 = Node(n + 2, 'Factor', None, [])
+                c2 = Node(n + 3, "Term'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_DIV)
+                self.p_Factor(c1)
+                node = c2
+                continue
+            elif t in _FIRST_Term__2:
+                n = self.n
+                c0 = Node(n + 1, 'ε', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                return
+            self.unexpected("Term'")
+            return
+
+    def p_Factor(self, node):
+        while True:
+            t = self.cur.type
+            if t is T_IDENTIFIER:
+                n = self.n
+                c0 = Node(n + 1, 'IDENTIFIER', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                self.match(c0, T_IDENTIFIER)
+                return
+            elif t is T_INT_LITERAL:
+                n = self.n
+                c0 = Node(n + 1, 'INT_LITERAL', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                self.match(c0, T_INT_LITERAL)
+                return
+            elif t is T_FLOAT_LITERAL:
+                n = self.n
+                c0 = Node(n + 1, 'FLOAT_LITERAL', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                self.match(c0, T_FLOAT_LITERAL)
+                return
+            elif t is T_STRING_LITERAL:
+                n = self.n
+                c0 = Node(n + 1, 'STRING_LITERAL', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                self.match(c0, T_STRING_LITERAL)
+                return
+            elif t is T_LPAREN:
+                n = self.n
+                c0 = Node(n + 1, 'LPAREN', None, [])
+                c1 = Node(n + 2, 'Expr', None, [])
+                c2 = Node(n + 3, 'RPAREN', None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_LPAREN)
+                self.p_Expr(c1)
+                self.match(c2, T_RPAREN)
+                return
+            elif t is T_NOT:
+                n = self.n
+                c0 = Node(n + 1, 'NOT', None, [])
+                c1 = Node(n + 2, 'Factor', None, [])
+                self.n = n + 2
+                node.children = [c0, c1]
+                self.match(c0, T_NOT)
+                node = c1
+                continue
+            elif t is T_MINUS:
+                n = self.n
+                c0 = Node(n + 1, 'MINUS', None, [])
+                c1 = Node(n + 2, 'Factor', None, [])
+                self.n = n + 2
+                node.children = [c0, c1]
+                self.match(c0, T_MINUS)
+                node = c1
+                continue
+            elif t in _FIRST_Factor_7:
+                n = self.n
+                c0 = Node(n + 1, 'FunctionCall', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                self.p_FunctionCall(c0)
+                return
+            self.unexpected('Factor')
+            return
+
+    def p_FunctionCall(self, node):
+        t = self.cur.type
+        if t is T_VIDEO_RESIZE:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_RESIZE', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_RESIZE)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_FLIP:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_FLIP', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_FLIP)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_VELOCIDAD:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_VELOCIDAD', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_VELOCIDAD)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_FADEIN:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_FADEIN', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_FADEIN)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_FADEOUT:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_FADEOUT', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_FADEOUT)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_SILENCIO:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_SILENCIO', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_SILENCIO)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_EXTRAER_AUDIO:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_EXTRAER_AUDIO', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_EXTRAER_AUDIO)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_QUITAR_AUDIO:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_QUITAR_AUDIO', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_QUITAR_AUDIO)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_AGREGAR_MUSICA:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_AGREGAR_MUSICA', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_AGREGAR_MUSICA)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_CONCATENAR:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_CONCATENAR', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_CONCATENAR)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        elif t is T_VIDEO_CORTAR:
+            n = self.n
+            c0 = Node(n + 1, 'VIDEO_CORTAR', None, [])
+            c1 = Node(n + 2, 'LBRACKET', None, [])
+            c2 = Node(n + 3, 'ArgListOpt', None, [])
+            c3 = Node(n + 4, 'RBRACKET', None, [])
+            self.n = n + 4
+            node.children = [c0, c1, c2, c3]
+            self.match(c0, T_VIDEO_CORTAR)
+            self.match(c1, T_LBRACKET)
+            self.p_ArgListOpt(c2)
+            self.match(c3, T_RBRACKET)
+            return
+        self.unexpected('FunctionCall')
+
+    def p_ArgListOpt(self, node):
+        t = self.cur.type
+        if t in _FIRST_ArgListOpt_0:
+            n = self.n
+            c0 = Node(n + 1, 'ArgList', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            self.p_ArgList(c0)
+            return
+        elif t is T_RBRACKET:
+            n = self.n
+            c0 = Node(n + 1, 'ε', None, [])
+            self.n = n + 1
+            node.children = [c0]
+            return
+        self.unexpected('ArgListOpt')
+
+    def p_ArgList(self, node):
+        t = self.cur.type
+        if t in _FIRST_ArgList_0:
+            n = self.n
+            c0 = Node(n + 1, 'Expr', None, [])
+            c1 = Node(n + 2, "ArgList'", None, [])
+            self.n = n + 2
+            node.children = [c0, c1]
+            self.p_Expr(c0)
+            self.p_ArgList_(c1)
+            return
+        self.unexpected('ArgList')
+
+    def p_ArgList_(self, node):
+        while True:
+            t = self.cur.type
+            if t is T_COMMA:
+                n = self.n
+                c0 = Node(n + 1, 'COMMA', None, [])
+                c1 = Node(n + 2, 'Expr', None, [])
+                c2 = Node(n + 3, "ArgList'", None, [])
+                self.n = n + 3
+                node.children = [c0, c1, c2]
+                self.match(c0, T_COMMA)
+                self.p_Expr(c1)
+                node = c2
+                continue
+            elif t is T_RBRACKET:
+                n = self.n
+                c0 = Node(n + 1, 'ε', None, [])
+                self.n = n + 1
+                node.children = [c0]
+                return
+            self.unexpected("ArgList'")
+            return
+
+
+
+def parse(tokens, start_symbol=START_SYMBOL):
+    """Devuelve ``(raiz, errores)`` para ``tokens``.
+
+    Cada paréntesis, llamada ``@`` o bloque anidado cuesta varios marcos de
+    Python; si el anidamiento agota la pila se recurre a ``build_tree``, que
+    usa una pila explícita y produce el mismo árbol.
+    """
+    parser = GeneratedParser(tokens)
+    try:
+        root = parser.parse(start_symbol)
+    except RecursionError:
+        from parse_tree import parse as parse_table
+
+        return parse_table(tokens, start_symbol)
+    return root, parser.errors
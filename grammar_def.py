@@ -13,6 +13,9 @@ VIDEO_CORTAR
 operadores, literales, IDENTIFIER, EOF, etc.).
 """
 
+from types import MappingProxyType
+from typing import Mapping
+
 from enums import TokenType
 
 EPSILON = "ε"
@@ -21,7 +24,7 @@ START_SYMBOL = "Program"
 # ------------------------------------------------------------
 #                 TABLA LL(1)
 # ------------------------------------------------------------
-PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
+_RULES: dict[str, dict[TokenType | str, list]] = {
 
     # ────────── Programa ──────────
     "Program": {
@@ -42,6 +45,7 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
         TokenType.IDENTIFIER: ["Stmt", "StmtList"],
         TokenType.IF:         ["Stmt", "StmtList"],
         TokenType.WHILE:      ["Stmt", "StmtList"],
+        TokenType.EXPORT:     ["Stmt", "StmtList"],
         TokenType.RBRACE:     [EPSILON],
     },
 
@@ -54,6 +58,7 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
         TokenType.IDENTIFIER: ["Assignment", TokenType.SEMICOLON],
         TokenType.IF:         ["IfStmt"],
         TokenType.WHILE:      ["WhileStmt"],
+        TokenType.EXPORT:     ["ExportStmt", TokenType.SEMICOLON],
     },
 
     # ───────── Declaración de variables ─────────
@@ -96,6 +101,7 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
         TokenType.IDENTIFIER: [EPSILON],
         TokenType.IF:         [EPSILON], 
         TokenType.WHILE:      [EPSILON],
+        TokenType.EXPORT:     [EPSILON],
         TokenType.RBRACE:     [EPSILON],
     },
 
@@ -105,6 +111,11 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
                           TokenType.RPAREN, "Block"],
     },
 
+    # ───────── Exportación ─────────
+    "ExportStmt": {
+        TokenType.EXPORT: [TokenType.EXPORT, "Expr", TokenType.AS, TokenType.STRING_LITERAL],
+    },
+
     # =========================================================
     #                     EXPRESIONES
     # =========================================================
@@ -155,7 +166,7 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
     },
     "OrExpr'": {
         TokenType.OR: [TokenType.OR, "AndExpr", "OrExpr'"],
-        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON],
+        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON], TokenType.AS: [EPSILON],
         TokenType.COMMA: [EPSILON], TokenType.RBRACKET: [EPSILON],
     },
 
@@ -184,7 +195,7 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
     "AndExpr'": {
         TokenType.AND: [TokenType.AND, "EqualityExpr", "AndExpr'"],
         TokenType.OR: [EPSILON], TokenType.RPAREN: [EPSILON],
-        TokenType.SEMICOLON: [EPSILON], TokenType.COMMA: [EPSILON],
+        TokenType.SEMICOLON: [EPSILON], TokenType.AS: [EPSILON], TokenType.COMMA: [EPSILON],
         TokenType.RBRACKET: [EPSILON],
     },
 
@@ -216,7 +227,7 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
         TokenType.LT: [EPSILON], TokenType.LE: [EPSILON],
         TokenType.GT: [EPSILON], TokenType.GE: [EPSILON],
         TokenType.AND: [EPSILON], TokenType.OR: [EPSILON],
-        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON],
+        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON], TokenType.AS: [EPSILON],
         TokenType.COMMA: [EPSILON], TokenType.RBRACKET: [EPSILON],
     },
 
@@ -249,7 +260,7 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
         TokenType.GE: [TokenType.GE, "AddExpr", "RelExpr'"],
         TokenType.EQ: [EPSILON], TokenType.NEQ: [EPSILON],
         TokenType.AND: [EPSILON], TokenType.OR: [EPSILON],
-        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON],
+        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON], TokenType.AS: [EPSILON],
         TokenType.COMMA: [EPSILON], TokenType.RBRACKET: [EPSILON],
     },
 
@@ -282,7 +293,7 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
         TokenType.GT: [EPSILON], TokenType.GE: [EPSILON],
         TokenType.EQ: [EPSILON], TokenType.NEQ: [EPSILON],
         TokenType.AND: [EPSILON], TokenType.OR: [EPSILON],
-        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON],
+        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON], TokenType.AS: [EPSILON],
         TokenType.COMMA: [EPSILON], TokenType.RBRACKET: [EPSILON],
     },
 
@@ -316,7 +327,7 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
         TokenType.GT: [EPSILON], TokenType.GE: [EPSILON],
         TokenType.EQ: [EPSILON], TokenType.NEQ: [EPSILON],
         TokenType.AND: [EPSILON], TokenType.OR: [EPSILON],
-        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON],
+        TokenType.RPAREN: [EPSILON], TokenType.SEMICOLON: [EPSILON], TokenType.AS: [EPSILON],
         TokenType.COMMA: [EPSILON], TokenType.RBRACKET: [EPSILON],
     },
 
@@ -406,3 +417,11 @@ PARSING_TABLE: dict[str, dict[TokenType | str, list]] = {
         TokenType.RBRACKET: [EPSILON],
     },
 }
+
+# Versión de sólo lectura que usan los parsers. Varios hilos la consultan a
+# la vez (ver ``parse_tree.parse``): ni las filas ni las producciones se
+# pueden modificar.
+PARSING_TABLE: Mapping[str, Mapping[TokenType | str, tuple]] = MappingProxyType({
+    nt: MappingProxyType({tt: tuple(prod) for tt, prod in rules.items()})
+    for nt, rules in _RULES.items()
+})
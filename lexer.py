@@ -5,8 +5,12 @@ tablas definidas en ``enums.py``. Se reportan errores léxicos
 manteniendo información de línea y columna.
 """
 
+import argparse
+import os
 import sys
-from typing import List
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 from enums import (
     TokenSpec,
     Token,
@@ -17,13 +21,23 @@ from enums import (
     VIDEO_FUNCS,
 )
 
+# Versión de las reglas léxicas. Se guarda en los archivos ``.tok``
+# (ver ``token_stream.py``): súbela al cambiar ``TokenType`` o la forma en
+# que ``tokenize`` reconoce lexemas, para invalidar los tokens persistidos.
+LEXER_VERSION = 1
+
+
 class Lexer:
     """Clase encargada de recorrer el texto fuente y producir tokens."""
-    def __init__(self, text: str) -> None:
-        """Inicializa el lexer con el texto a procesar."""
+    def __init__(self, text: str, line: int = 1) -> None:
+        """Inicializa el lexer con el texto a procesar.
+
+        ``line`` permite numerar desde otra línea cuando ``text`` es un
+        fragmento de un archivo mayor (ver ``tokenize_parallel``).
+        """
         self.text = text
         self.pos = 0            # índice actual en la cadena
-        self.line = 1           # línea actual
+        self.line = line        # línea actual
         self.column = 1         # columna actual
         self.errors: List[str] = []  # lista de mensajes de error
 
@@ -156,163 +170,278 @@ class Lexer:
             return None
         return Token(token_type, lex, start_line, start_col)
 
+    def _comment(self) -> None:
+        """Salta un comentario ``//`` o reporta e ignora un intento de ``/* */``."""
+        if self.text.startswith('//', self.pos):
+            # Avanzamos hasta el final de la línea
+            while self._peek() and self._peek() != '\n':
+                self._advance()
+            return
+        # Detección de intento de comentario multilínea (no permitido)
+        self.errors.append(f"Malformed comment at line {self.line}, column {self.column}")
+        self._advance()
+        self._advance()
+        while self._peek():
+            if self.text.startswith('*/', self.pos):
+                self._advance()
+                self._advance()
+                break
+            if self._peek() == '\n':
+                break
+            self._advance()
+
+    def _symbol(self) -> List[Token]:
+        """Símbolos y operadores de un solo carácter; reporta los inválidos."""
+        ch = self._peek()
+        start_line = self.line
+        start_col = self.column
+        if ch in symbols:
+            self._advance()
+            return [Token(symbols[ch], ch, start_line, start_col)]
+        if ch == '+':
+            self._advance()
+            # En el lenguaje "++" significa dos operadores '+' consecutivos
+            out = [Token(TokenType.PLUS, '+', start_line, start_col)]
+            if self._peek() == '+':
+                out.append(Token(TokenType.PLUS, '+', start_line, self.column))
+                self._advance()
+            return out
+        if ch == '-':
+            # Operador de resta
+            self._advance()
+            return [Token(TokenType.MINUS, '-', start_line, start_col)]
+        if ch == '*':
+            # Operador de multiplicación
+            self._advance()
+            return [Token(TokenType.MULT, '*', start_line, start_col)]
+        if ch == '/':
+            # Operador de división
+            self._advance()
+            return [Token(TokenType.DIV, '/', start_line, start_col)]
+        if ch == '=':
+            # Operador de asignación
+            self._advance()
+            return [Token(TokenType.ASSIGN, '=', start_line, start_col)]
+        if ch == '<':
+            # Operador menor que
+            self._advance()
+            return [Token(TokenType.LT, '<', start_line, start_col)]
+        if ch == '>':
+            # Operador mayor que
+            self._advance()
+            return [Token(TokenType.GT, '>', start_line, start_col)]
+        if ch == '!':
+            # Carácter '!' no válido en este lenguaje
+            self._advance()
+            self.errors.append(
+                f"Invalid character '!' at line {start_line}, column {start_col}"
+            )
+            return [Token(TokenType.ERROR, '!', start_line, start_col)]
+
+        # Cualquier otro carácter no pertenece al lenguaje
+        self.errors.append(
+            f"Invalid character '{ch}' at line {start_line}, column {start_col}"
+        )
+        self._advance()
+        return []
+
+    def _compound_op(self) -> Token:
+        """Consume el operador compuesto de dos caracteres (==, !=, ...) actual."""
+        two = self.text[self.pos:self.pos+2]
+        token_type = compound_ops[two]
+        start_line = self.line
+        start_col = self.column
+        self._advance()
+        self._advance()
+        return Token(token_type, two, start_line, start_col)
+
     def tokenize(self) -> List[Token]:
         """Recorre todo el texto y genera la lista completa de tokens."""
-        tokens: List[Token] = []
+        return list(self.iter_tokens())
+
+    def iter_tokens(self) -> Iterator[Token]:
+        """Produce los tokens a medida que los reconoce, terminando en EOF.
+
+        Los errores se acumulan en ``self.errors`` durante el recorrido, así
+        que sólo están completos cuando el generador se agota. Permite que
+        el parser consuma tokens sin que exista la lista completa.
+        """
         while self.pos < len(self.text):
             self._skip_whitespace()
             if self.pos >= len(self.text):
                 break
 
             ch = self._peek()
-            start_line = self.line
-            start_col = self.column
-
-            # Comentario de una sola línea
-            if ch == '/' and self.text.startswith('//', self.pos):
-                # Avanzamos hasta el final de la línea
-                while self._peek() and self._peek() != '\n':
-                    self._advance()
-                continue
-            # Detección de intento de comentario multilínea (no permitido)
-            if ch == '/' and self.text.startswith('/*', self.pos):
-                self.errors.append(f"Malformed comment at line {start_line}, column {start_col}")
-                self._advance()
-                self._advance()
-                while self._peek():
-                    if self.text.startswith('*/', self.pos):
-                        self._advance()
-                        self._advance()
-                        break
-                    if self._peek() == '\n':
-                        break
-                    self._advance()
+
+            # Comentarios ``//`` (y los ``/*`` no permitidos)
+            if ch == '/' and self.text[self.pos+1:self.pos+2] in ('/', '*'):
+                self._comment()
                 continue
 
             if ch.isdigit():
                 # Comienzo de un número
                 tok = self._number()
                 if tok:
-                    tokens.append(tok)
+                    yield tok
                 continue
 
             if ch == '"':
                 # Inicio de literal de cadena
                 tok = self._string()
                 if tok:
-                    tokens.append(tok)
+                    yield tok
                 continue
 
             if ch.isalpha() or ch == '_':
                 # Identificador o palabra clave
                 tok = self._identifier()
                 if tok:
-                    tokens.append(tok)
+                    yield tok
                 continue
 
             if ch == '@':
                 # Funciones especiales de video
                 tok = self._video_function()
                 if tok:
-                    tokens.append(tok)
+                    yield tok
                 continue
 
             # Operadores compuestos de dos caracteres (==, !=, ...)
-            two = self.text[self.pos:self.pos+2]
-            if two in compound_ops:
-                self._advance()
-                self._advance()
-                tokens.append(Token(compound_ops[two], two, start_line, start_col))
+            if self.text[self.pos:self.pos+2] in compound_ops:
+                yield self._compound_op()
                 continue
 
             # Símbolos y operadores de un solo carácter
-            if ch in symbols:
-                self._advance()
-                tokens.append(Token(symbols[ch], ch, start_line, start_col))
-                continue
-            if ch == '+':
-                self._advance()
-                # En el lenguaje "++" significa dos operadores '+' consecutivos
-                if self._peek() == '+':
-                    tokens.append(Token(TokenType.PLUS, '+', start_line, start_col))
-                    start_col = self.column
-                    self._advance()
-                    tokens.append(Token(TokenType.PLUS, '+', start_line, start_col))
-                else:
-                    tokens.append(Token(TokenType.PLUS, '+', start_line, start_col))
-                continue
-            if ch == '-':
-                # Operador de resta
-                self._advance()
-                tokens.append(Token(TokenType.MINUS, '-', start_line, start_col))
-                continue
-            if ch == '*':
-                # Operador de multiplicación
-                self._advance()
-                tokens.append(Token(TokenType.MULT, '*', start_line, start_col))
-                continue
-            if ch == '/':
-                # Operador de división
-                self._advance()
-                tokens.append(Token(TokenType.DIV, '/', start_line, start_col))
-                continue
-            if ch == '=':
-                # Operador de asignación
-                self._advance()
-                tokens.append(Token(TokenType.ASSIGN, '=', start_line, start_col))
-                continue
-            if ch == '<':
-                # Operador menor que
-                self._advance()
-                tokens.append(Token(TokenType.LT, '<', start_line, start_col))
-                continue
-            if ch == '>':
-                # Operador mayor que
-                self._advance()
-                tokens.append(Token(TokenType.GT, '>', start_line, start_col))
-                continue
-            if ch == '!':
-                # Carácter '!' no válido en este lenguaje
-                self._advance()
-                tokens.append(Token(TokenType.ERROR, '!', start_line, start_col))
-                self.errors.append(
-                    f"Invalid character '!' at line {start_line}, column {start_col}"
-                )
-                continue
+            yield from self._symbol()
 
-            # Cualquier otro carácter no pertenece al lenguaje
-            self.errors.append(
-                f"Invalid character '{ch}' at line {start_line}, column {start_col}"
-            )
-            self._advance()
+        yield Token(TokenType.EOF, '', self.line, self.column)
+
+
+def tokenize(text: str, line: int = 1) -> Tuple[List[Token], List[str]]:
+    """Devuelve ``(tokens, errores)`` de ``text`` con un ``Lexer`` propio.
+
+    Un ``Lexer`` guarda su posición y sus errores, así que sirve para una
+    sola pasada; esta función no comparte estado entre llamadas y se puede
+    usar desde varios hilos a la vez.
+    """
+    lexer = Lexer(text, line)
+    return lexer.tokenize(), lexer.errors
+
+
+# Tamaño mínimo (en caracteres) de cada fragmento en modo paralelo; por
+# debajo de esto el costo de enviar el texto a otro proceso no compensa.
+MIN_SHARD_CHARS = 64 * 1024
+
+
+def _tokenize_shard(args: Tuple[str, int]) -> tuple:
+    """Tokeniza un fragmento que empieza en la línea indicada.
+
+    Los tokens viajan de vuelta en columnas (códigos, lexemas, líneas,
+    columnas): serializar millones de ``Token`` uno a uno cuesta más que
+    tokenizar el fragmento.
+    """
+    text, line = args
+    lexer = Lexer(text, line)
+    tokens = lexer.tokenize()
+    codes = array('H', [t.type.value for t in tokens])
+    values = [t.value for t in tokens]
+    lines = array('I', [t.line for t in tokens])
+    columns = array('I', [t.column for t in tokens])
+    return codes, values, lines, columns, lexer.errors
 
-        tokens.append(Token(TokenType.EOF, '', self.line, self.column))
-        return tokens
+
+def _split_shards(text: str, count: int) -> List[Tuple[str, int]]:
+    """Corta ``text`` en ~``count`` fragmentos terminados en salto de línea.
+
+    La gramática léxica no cruza saltos de línea (los comentarios ``//``
+    terminan ahí, las cadenas abiertas y los ``/*`` se reportan al final de
+    la línea), así que cada fragmento se puede tokenizar por separado.
+    """
+    size = max(MIN_SHARD_CHARS, len(text) // count + 1)
+    shards = []
+    start = 0
+    line = 1
+    while start < len(text):
+        cut = text.find('\n', start + size)
+        end = len(text) if cut == -1 else cut + 1
+        chunk = text[start:end]
+        shards.append((chunk, line))
+        line += chunk.count('\n')
+        start = end
+    return shards
+
+
+def tokenize_parallel(text: str, workers: Optional[int] = None) -> Tuple[List[Token], List[str]]:
+    """Tokeniza ``text`` repartiendo fragmentos entre varios procesos.
+
+    Devuelve ``(tokens, errores)`` idénticos a los de ``Lexer(text).tokenize()``:
+    cada fragmento se numera desde su línea real y sólo se conserva el EOF
+    del último.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = _split_shards(text, workers * 4)
+    if workers == 1 or len(shards) <= 1:
+        lexer = Lexer(text)
+        return lexer.tokenize(), lexer.errors
+
+    types = {t.value: t for t in TokenType}
+    tokens: List[Token] = []
+    errors: List[str] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for codes, values, lines, columns, shard_errors in pool.map(_tokenize_shard, shards):
+            tokens.extend(map(Token, map(types.__getitem__, codes), values, lines, columns))
+            tokens.pop()  # EOF del fragmento
+            errors.extend(shard_errors)
+    tokens.append(Token(TokenType.EOF, '', lines[-1], columns[-1]))  # EOF real
+    return tokens, errors
+
+
+def jobs_arg(value: str) -> int:
+    """Tipo de argparse para ``--jobs``: entero no negativo (0 = todos los núcleos)."""
+    jobs = int(value)
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"--jobs debe ser >= 0, no {jobs}")
+    return jobs
 
 
 def main() -> None:
     """Función de entrada para ejecutar el lexer desde la terminal."""
-    if len(sys.argv) != 2:
-        print("Uso: python lexer.py <archivo.txt>")
-        return
-    ruta = sys.argv[1]
+    ap = argparse.ArgumentParser(usage="python lexer.py <archivo.txt> [--jobs N] [--memory]")
+    ap.add_argument("archivo")
+    ap.add_argument("--jobs", type=jobs_arg, default=1,
+                    help="procesos para tokenizar en paralelo (0 = todos los núcleos)")
+    ap.add_argument("--memory", action="store_true",
+                    help="informa pico y memoria retenida de la tokenización")
+    args = ap.parse_args()
+    ruta = args.archivo
     try:
         src = open(ruta, encoding='utf-8').read()
     except FileNotFoundError:
         print(f"Error: no existe '{ruta}'")
         return
-    lexer = Lexer(src)
-    tokens = lexer.tokenize()
+    report = None
+    if args.memory:
+        from memory_report import measure_lexer
+        tokens, errors, report = measure_lexer(src)
+    elif args.jobs != 1:
+        tokens, errors = tokenize_parallel(src, args.jobs or None)
+    else:
+        lexer = Lexer(src)
+        tokens = lexer.tokenize()
+        errors = lexer.errors
     print("--- TOKENS ---")
     for t in tokens:
         if t.type == TokenType.EOF:
             print("EOF")
         else:
             print(f"{t.type.name:15} [ {t.value} ] -> {t.line}:{t.column}")
-    if lexer.errors:
+    if errors:
         print("\n--- LEXICAL ERRORS ---")
-        for err in lexer.errors:
+        for err in errors:
             print(err)
+    if report is not None:
+        print()
+        print(report.format())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,273 @@
+"""Eliminación de código muerto y de asignaciones muertas antes de evaluar.
+
+Un programa sólo produce resultados a través de ``exportar ... como``. Un
+análisis de vida hacia atrás sobre el árbol de parseo calcula qué variables
+se leen después de cada sentencia, recorriendo las dos ramas de un ``if`` y
+los ``while`` hasta un punto fijo (lo que el cuerpo lee en una vuelta está
+vivo al final de la anterior). Con eso se quitan:
+
+* declaraciones y asignaciones cuya variable nadie lee después;
+* ``if`` y ``while`` cuyo cuerpo queda vacío (su condición tampoco se evalúa).
+
+Las sentencias ``exportar`` siempre se conservan. Quitar una sentencia
+también quita los errores que habría producido al ejecutarse (una variable
+sin definir, un ``while`` que no termina): esos errores no llegaban a
+ninguna salida.
+
+Uso::
+
+    python liveness.py programa.txt
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Set, Tuple
+
+from enums import TokenType
+from grammar_def import EPSILON
+from lexer import Lexer
+from parse_tree import ParseTreeNode, parse
+from planner import DEFAULT_SOURCE, estimate, plan_expr, source_text
+
+
+@dataclass
+class RemovedStmt:
+    """Sentencia quitada y el trabajo ``@`` que se evita al no ejecutarla."""
+    kind: str
+    line: int
+    text: str
+    calls: int = 0
+    cost: float = 0.0
+
+
+@dataclass
+class LivenessReport:
+    removed: List[RemovedStmt] = field(default_factory=list)
+
+    @property
+    def calls(self) -> int:
+        return sum(r.calls for r in self.removed)
+
+    @property
+    def cost(self) -> float:
+        return sum(r.cost for r in self.removed)
+
+    def format(self) -> str:
+        if not self.removed:
+            return "Sin código muerto"
+        lines = [f"{len(self.removed)} sentencias muertas, {self.calls} llamadas @ evitadas "
+                 f"(~{self.cost:.3g} px·fotogramas con fuentes de "
+                 f"{DEFAULT_SOURCE.width}x{DEFAULT_SOURCE.height})"]
+        for r in sorted(self.removed, key=lambda r: r.line):
+            text = r.text if len(r.text) <= 60 else r.text[:57] + "..."
+            lines.append(f"  línea {r.line:>4}  {r.kind:<11} {text}")
+        return "\n".join(lines)
+
+
+# ─── Recorrido del árbol ───────────────────────────────────────────────────
+def _leaf(node: ParseTreeNode):
+    """Token de un nodo terminal, o ``None`` si faltaba en la entrada."""
+    return node.children[0].token if node.children else None
+
+
+def _is_epsilon(node: ParseTreeNode) -> bool:
+    return len(node.children) == 1 and node.children[0].label == EPSILON
+
+
+def _identifiers(node: ParseTreeNode) -> Set[str]:
+    """Variables que lee un subárbol de expresión."""
+    names = set()
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        if cur.token is not None and cur.token.type == TokenType.IDENTIFIER:
+            names.add(cur.token.value)
+        stack.extend(cur.children)
+    return names
+
+
+def _statements(block: ParseTreeNode) -> List[ParseTreeNode]:
+    """Nodos ``Stmt`` de un ``Block`` en orden."""
+    out = []
+    node = next((c for c in block.children if c.label == "StmtList"), None)
+    while node is not None and node.children and not _is_epsilon(node):
+        out.append(node.children[0])
+        node = node.children[1] if len(node.children) > 1 else None
+    return out
+
+
+def _first_line(node: ParseTreeNode) -> int:
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        if cur.token is not None:
+            return cur.token.line
+        stack.extend(reversed(cur.children))
+    return 0
+
+
+def _target(inner: ParseTreeNode) -> str:
+    """Variable que define un ``VarDecl`` o un ``Assignment``."""
+    ident = next(c for c in inner.children if c.label == "IDENTIFIER")
+    tok = _leaf(ident)
+    return tok.value if tok is not None else ""
+
+
+def _value(inner: ParseTreeNode) -> ParseTreeNode:
+    """Subárbol que se evalúa al ejecutar la definición."""
+    return inner.children[-1]
+
+
+# ─── Análisis ──────────────────────────────────────────────────────────────
+Live = FrozenSet[str]
+
+
+def _block(block: ParseTreeNode, live: Live) -> Tuple[Live, List[ParseTreeNode]]:
+    """Vivas a la entrada de ``block`` y sus sentencias muertas (anidadas incluidas)."""
+    dead: List[ParseTreeNode] = []
+    for stmt in reversed(_statements(block)):
+        live = _stmt(stmt, live, dead)
+    return live, dead
+
+
+def _stmt(stmt: ParseTreeNode, live: Live, dead: List[ParseTreeNode]) -> Live:
+    inner = stmt.children[0]
+    label = inner.label
+    if label in ("VarDecl", "Assignment"):
+        name = _target(inner)
+        if name not in live:
+            dead.append(stmt)
+            return live
+        return (live - {name}) | _identifiers(_value(inner))
+    if label == "IfStmt":
+        cond = _identifiers(inner.children[2])
+        live_then, dead_then = _block(inner.children[4], live)
+        else_opt = inner.children[5]
+        if _is_epsilon(else_opt):
+            live_else, dead_else = live, []
+            empty_else = True
+        else:
+            live_else, dead_else = _block(else_opt.children[1], live)
+            empty_else = _all_dead(else_opt.children[1], dead_else)
+        dead.extend(dead_then + dead_else)
+        if empty_else and _all_dead(inner.children[4], dead_then):
+            dead.append(stmt)
+            return live
+        return live_then | live_else | cond
+    if label == "WhileStmt":
+        cond = _identifiers(inner.children[2])
+        body = inner.children[4]
+        head = live | cond
+        while True:
+            body_in, dead_body = _block(body, head)
+            new = live | cond | body_in
+            if new == head:
+                break
+            head = new
+        dead.extend(dead_body)
+        if _all_dead(body, dead_body):
+            dead.append(stmt)
+            return live
+        return head
+    # ExportStmt y cualquier forma desconocida: se conserva y lee todo.
+    return live | _identifiers(inner)
+
+
+def _all_dead(block: ParseTreeNode, dead: List[ParseTreeNode]) -> bool:
+    ids = {id(s) for s in dead}
+    return all(id(s) in ids for s in _statements(block))
+
+
+def analyze(root: ParseTreeNode) -> List[ParseTreeNode]:
+    """Sentencias ``Stmt`` muertas de un ``Program`` (incluye las anidadas)."""
+    block = next((c for c in root.children if c.label == "Block"), None)
+    if block is None:
+        return []
+    return _block(block, frozenset())[1]
+
+
+# ─── Poda ──────────────────────────────────────────────────────────────────
+def _prune(block: ParseTreeNode, dead: Set[int]) -> None:
+    """Quita de la cadena ``StmtList`` de ``block`` las sentencias muertas."""
+    stack = [block]
+    while stack:
+        blk = stack.pop()
+        idx = next((k for k, c in enumerate(blk.children) if c.label == "StmtList"), None)
+        if idx is None:
+            continue
+        lists = []
+        node = blk.children[idx]
+        while node.children and not _is_epsilon(node):
+            lists.append(node)
+            node = node.children[1]
+        tail = node
+        for lst in reversed([l for l in lists if id(l.children[0]) not in dead]):
+            lst.children[1] = tail
+            tail = lst
+            inner = lst.children[0].children[0]
+            if inner.label in ("IfStmt", "WhileStmt"):
+                stack.append(inner.children[4])
+                if inner.label == "IfStmt" and not _is_epsilon(inner.children[5]):
+                    stack.append(inner.children[5].children[1])
+        blk.children[idx] = tail
+
+
+def _removed(stmt: ParseTreeNode) -> RemovedStmt:
+    inner = stmt.children[0]
+    # De un if/while sólo cuenta la condición: su cuerpo ya se reporta aparte.
+    work = inner.children[2] if inner.label in ("IfStmt", "WhileStmt") else inner
+    calls, cost = 0, 0.0
+    stack = [(work, False)]
+    while stack:
+        cur, nested = stack.pop()
+        if cur.label == "FunctionCall":
+            calls += 1
+            if not nested:
+                # el costo de la llamada más externa ya incluye el de sus argumentos
+                cost += estimate(plan_expr(cur), {})[1]
+            nested = True
+        stack.extend((c, nested) for c in cur.children)
+    text = source_text(inner) if work is inner else source_text(work)
+    return RemovedStmt(inner.label, _first_line(stmt), text, calls, cost)
+
+
+def eliminate_dead_code(root: ParseTreeNode) -> LivenessReport:
+    """Quita del árbol (en el lugar) las sentencias muertas y las reporta."""
+    dead = analyze(root)
+    report = LivenessReport([_removed(s) for s in dead])
+    block = next((c for c in root.children if c.label == "Block"), None)
+    if block is not None and dead:
+        _prune(block, {id(s) for s in dead})
+    return report
+
+
+# ─── CLI ───────────────────────────────────────────────────────────────────
+def main() -> None:
+    ap = argparse.ArgumentParser(usage="python liveness.py <archivo.txt>")
+    ap.add_argument("archivo")
+    args = ap.parse_args()
+
+    ruta = args.archivo
+    try:
+        src = open(ruta, encoding='utf-8').read()
+    except FileNotFoundError:
+        print(f"Error: no existe '{ruta}'")
+        sys.exit(1)
+
+    lexer = Lexer(src)
+    tokens = lexer.iter_tokens()
+    root, errors = parse(tokens)
+    for _ in tokens:
+        pass
+    errors = lexer.errors + errors
+    if errors:
+        print("✗ Errores:")
+        for e in errors:
+            print("  " + e)
+        sys.exit(1)
+    print(eliminate_dead_code(root).format())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,388 @@
+"""Clips de video perezosos y las funciones ``@`` del lenguaje.
+
+Un ``Clip`` describe un video sin decodificarlo: resolución, fotogramas por
+segundo, número de fotogramas, una función que produce el fotograma ``i``
+y, opcionalmente, su pista de audio (``audio_engine.AudioStream``). Las
+operaciones devuelven clips nuevos que componen esas funciones, así que un
+programa sólo decodifica los fotogramas que termina exportando.
+
+Los fotogramas son arreglos ``uint8`` planares de forma ``(3, alto, ancho)``
+en YUV 4:4:4, el mismo orden en que se guardan en un archivo Y4M ``C444``.
+Los tiempos de las funciones van en segundos.
+"""
+
+import mmap
+import os
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from fractions import Fraction
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+import audio_engine
+from audio_engine import AudioStream
+from frame_cache import FrameCache
+
+# Negro en YUV de rango limitado.
+BLACK = np.array([16, 128, 128], np.uint8).reshape(3, 1, 1)
+
+_Y4M_MAGIC = b"YUV4MPEG2"
+_FRAME = b"FRAME"
+
+
+@dataclass
+class Clip:
+    """Video perezoso: ``render(i)`` produce el fotograma ``i`` (``0 <= i < length``)."""
+    width: int
+    height: int
+    fps: float
+    length: int
+    render: Callable[[int], np.ndarray]
+    audio: Optional[AudioStream] = None
+
+    @property
+    def duration(self) -> float:
+        return self.length / self.fps
+
+    def frame(self, i: int) -> np.ndarray:
+        if not 0 <= i < self.length:
+            raise IndexError(f"frame {i} out of range (clip has {self.length})")
+        return self.render(i)
+
+    def frames(self, start: int = 0, stop: Optional[int] = None):
+        """Itera los fotogramas ``[start, stop)``."""
+        stop = self.length if stop is None else min(stop, self.length)
+        for i in range(max(start, 0), stop):
+            yield self.render(i)
+
+    def audio_or_silence(self) -> AudioStream:
+        """Pista de audio, o silencio de la misma duración si no tiene."""
+        if self.audio is not None:
+            return self.audio
+        return audio_engine.silence(self.duration)
+
+
+# ─── Y4M ───────────────────────────────────────────────────────────────────
+def _parse_header(line: bytes, path: str) -> Dict[str, str]:
+    fields = line.split()
+    if not fields or fields[0] != _Y4M_MAGIC:
+        raise ValueError(f"'{path}' is not a YUV4MPEG2 file")
+    return {f[:1].decode(): f[1:].decode() for f in fields[1:]}
+
+
+class Y4MSource:
+    """Lector Y4M con acceso aleatorio sobre el archivo mapeado en memoria."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        end = self._map.find(b"\n")
+        if end < 0:
+            raise ValueError(f"'{path}' is not a YUV4MPEG2 file")
+        params = _parse_header(self._map[:end], path)
+        try:
+            self.width, self.height = int(params["W"]), int(params["H"])
+            num, den = params.get("F", "30:1").split(":")
+            self.fps = Fraction(int(num), int(den))
+        except (KeyError, ValueError, ZeroDivisionError):
+            raise ValueError(f"'{path}' has an invalid YUV4MPEG2 header")
+        self.chroma = params.get("C", "420jpeg")
+        plane = self.width * self.height
+        if self.chroma.startswith("444"):
+            self.frame_bytes = 3 * plane
+        elif self.chroma.startswith("420"):
+            self.frame_bytes = plane + 2 * ((self.width + 1) // 2) * ((self.height + 1) // 2)
+        elif self.chroma.startswith("mono"):
+            self.frame_bytes = plane
+        else:
+            raise ValueError(f"'{path}' uses unsupported chroma '{self.chroma}'")
+        self.offsets = self._scan(end + 1)
+
+    def _scan(self, pos: int) -> List[int]:
+        """Posición de los datos de cada fotograma (las cabeceras pueden llevar parámetros)."""
+        offsets = []
+        size = len(self._map)
+        while pos < size:
+            if self._map[pos:pos + len(_FRAME)] != _FRAME:
+                raise ValueError(f"'{self.path}' is corrupt at byte {pos}")
+            nl = self._map.find(b"\n", pos)
+            if nl < 0 or nl + 1 + self.frame_bytes > size:
+                break  # último fotograma truncado
+            offsets.append(nl + 1)
+            pos = nl + 1 + self.frame_bytes
+        return offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def identity(self) -> tuple:
+        """Identifica el archivo y su versión: clave de ``FrameCache``."""
+        st = os.stat(self.path)
+        return (os.path.realpath(self.path), st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def read(self, i: int) -> np.ndarray:
+        """Decodifica el fotograma ``i`` a ``(3, alto, ancho)`` 4:4:4."""
+        w, h = self.width, self.height
+        raw = np.frombuffer(self._map, np.uint8, self.frame_bytes, self.offsets[i])
+        if self.chroma.startswith("444"):
+            return raw.reshape(3, h, w).copy()
+        out = np.empty((3, h, w), np.uint8)
+        out[0] = raw[:w * h].reshape(h, w)
+        if self.chroma.startswith("mono"):
+            out[1:] = 128
+            return out
+        cw, ch = (w + 1) // 2, (h + 1) // 2
+        for k in (1, 2):
+            start = w * h + (k - 1) * cw * ch
+            plane = raw[start:start + cw * ch].reshape(ch, cw)
+            out[k] = plane.repeat(2, 0).repeat(2, 1)[:h, :w]
+        return out
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def y4m_header(width: int, height: int, fps: float) -> bytes:
+    rate = Fraction(fps).limit_denominator(1001)
+    return (f"YUV4MPEG2 W{width} H{height} F{rate.numerator}:{rate.denominator} "
+            f"Ip A1:1 C444\n").encode('ascii')
+
+
+def write_y4m(clip: Clip, path: str, start: int = 0, stop: Optional[int] = None) -> int:
+    """Escribe los fotogramas ``[start, stop)`` de ``clip``; devuelve cuántos."""
+    count = 0
+    with open(path, 'wb') as fh:
+        fh.write(y4m_header(clip.width, clip.height, clip.fps))
+        for frame in clip.frames(start, stop):
+            fh.write(_FRAME + b"\n")
+            fh.write(np.ascontiguousarray(frame, np.uint8).tobytes())
+            count += 1
+    return count
+
+
+def load(path: str, cache: Optional[FrameCache] = None) -> Union[Clip, AudioStream]:
+    """Abre ``path``: ``.wav`` como audio y Y4M como clip.
+
+    Un WAV junto al Y4M con el mismo nombre se usa como su pista de audio.
+    Con ``cache`` los fotogramas decodificados se comparten con cualquier
+    otro clip abierto sobre el mismo archivo.
+    """
+    if path.lower().endswith(".wav"):
+        return audio_engine.read_wav(path)
+    source = Y4MSource(path)
+    audio = None
+    sidecar = os.path.splitext(path)[0] + ".wav"
+    if os.path.exists(sidecar):
+        audio = audio_engine.read_wav(sidecar)
+    render = source.read if cache is None else cache.reader(source.identity, source.read)
+    return Clip(source.width, source.height, float(source.fps), len(source), render, audio)
+
+
+def from_frames(frames: np.ndarray, fps: float = 30.0,
+                audio: Optional[AudioStream] = None) -> Clip:
+    """Clip en memoria a partir de un arreglo ``(n, 3, alto, ancho)``."""
+    data = np.asarray(frames, np.uint8)
+    return Clip(data.shape[3], data.shape[2], fps, len(data), lambda i: data[i], audio)
+
+
+# ─── Operaciones ───────────────────────────────────────────────────────────
+def _nearest(n_out: int, n_in: int) -> np.ndarray:
+    """Índices de origen del vecino más cercano, simétricos respecto al centro.
+
+    La simetría hace que escalar y reflejar conmuten, como supone el
+    planificador al bajar ``@resize`` por debajo de ``@flip``. Sólo la
+    muestra central de una salida impar sobre una entrada par queda en un
+    empate y se desplaza un píxel.
+    """
+    center = (np.arange(n_out) + 0.5) * n_in / n_out - 0.5
+    left = np.floor(center + 0.5)
+    right = n_in - 1 - np.floor(n_in - 1 - center + 0.5)
+    idx = np.where(center <= (n_in - 1) / 2, left, right)
+    return np.clip(idx, 0, n_in - 1).astype(np.intp)
+
+
+def resize(clip: Clip, width: int, height: int) -> Clip:
+    """Escala al tamaño dado (vecino más cercano)."""
+    width, height = int(width), int(height)
+    if width <= 0 or height <= 0:
+        raise ValueError(f"@resize: invalid size {width}x{height}")
+    ys = _nearest(height, clip.height)
+    xs = _nearest(width, clip.width)
+    src = clip.render
+    return replace(clip, width=width, height=height,
+                   render=lambda i: src(i)[:, ys][:, :, xs])
+
+
+def proxy(clip: Clip, scale: float, step: int) -> Clip:
+    """Versión reducida para vista previa: tamaño × ``scale``, uno de cada ``step`` fotogramas.
+
+    Los fps se dividen por ``step``, así que los tiempos en segundos siguen
+    cayendo en el mismo punto del clip; el audio se conserva tal cual.
+    """
+    width = max(int(round(clip.width * scale)), 1)
+    height = max(int(round(clip.height * scale)), 1)
+    ys = _nearest(height, clip.height)
+    xs = _nearest(width, clip.width)
+    src = clip.render
+    return Clip(width, height, clip.fps / step, -(-clip.length // step),
+                lambda i: src(i * step)[:, ys][:, :, xs], clip.audio)
+
+
+def flip(clip: Clip) -> Clip:
+    """Espejo horizontal."""
+    src = clip.render
+    return replace(clip, render=lambda i: src(i)[:, :, ::-1])
+
+
+def velocidad(clip: Clip, factor: float) -> Clip:
+    """Reproduce ``factor`` veces más rápido (descarta o repite fotogramas)."""
+    factor = float(factor)
+    if factor <= 0:
+        raise ValueError(f"@velocidad: factor must be positive, not {factor:g}")
+    src, last = clip.render, clip.length - 1
+    audio = audio_engine.change_speed(clip.audio, factor) if clip.audio else None
+    return replace(clip, length=int(clip.length / factor), audio=audio,
+                   render=lambda i: src(min(int(i * factor), last)))
+
+
+def _fade(clip: Clip, seconds: float, at_start: bool) -> Clip:
+    n = max(int(round(float(seconds) * clip.fps)), 1)
+    src, length = clip.render, clip.length
+
+    def render(i: int) -> np.ndarray:
+        frame = src(i)
+        k = i if at_start else length - 1 - i
+        if k >= n:
+            return frame
+        alpha = (k + 1) / (n + 1)
+        out = BLACK + (frame.astype(np.float32) - BLACK) * alpha
+        return np.rint(out).astype(np.uint8)
+
+    return replace(clip, render=render)
+
+
+def fadein(clip: Clip, seconds: float) -> Clip:
+    """Aparece desde negro durante ``seconds`` segundos."""
+    return _fade(clip, seconds, True)
+
+
+def fadeout(clip: Clip, seconds: float) -> Clip:
+    """Se funde a negro en los últimos ``seconds`` segundos."""
+    return _fade(clip, seconds, False)
+
+
+def cortar(clip: Clip, start: float, end: float) -> Clip:
+    """Conserva ``[start, end)`` segundos."""
+    first = min(max(int(round(float(start) * clip.fps)), 0), clip.length)
+    last = min(max(int(round(float(end) * clip.fps)), first), clip.length)
+    src = clip.render
+    audio = None
+    if clip.audio is not None:
+        audio = audio_engine.trim(clip.audio, first / clip.fps, last / clip.fps)
+    return replace(clip, length=last - first, audio=audio, render=lambda i: src(first + i))
+
+
+def concatenar(*clips: Clip) -> Clip:
+    """Une los clips; los siguientes se escalan al tamaño del primero."""
+    if not clips:
+        raise ValueError("@concatenar needs at least one clip")
+    first = clips[0]
+    parts = [c if (c.width, c.height) == (first.width, first.height)
+             else resize(c, first.width, first.height) for c in clips]
+    starts = [0] + list(accumulate(c.length for c in parts))
+
+    def render(i: int) -> np.ndarray:
+        k = bisect_right(starts, i) - 1
+        return parts[k].render(i - starts[k])
+
+    audio = None
+    if any(c.audio is not None for c in parts):
+        audio = audio_engine.concat([c.audio_or_silence() for c in parts])
+    return replace(first, length=starts[-1], render=render, audio=audio)
+
+
+def silencio(value: Union[Clip, AudioStream]) -> Union[Clip, AudioStream]:
+    """Silencia la pista de audio conservando su duración."""
+    if isinstance(value, AudioStream):
+        return audio_engine.silencio(value)
+    return replace(value, audio=audio_engine.silencio(value.audio_or_silence()))
+
+
+def quitar_audio(clip: Clip) -> Clip:
+    """Descarta la pista de audio."""
+    return replace(clip, audio=None)
+
+
+def extraer_audio(clip: Clip) -> AudioStream:
+    """Pista de audio del clip (silencio si no tiene)."""
+    return clip.audio_or_silence()
+
+
+def agregar_musica(clip: Clip, music: AudioStream, gain: float = 1.0) -> Clip:
+    """Mezcla ``music`` bajo el audio del clip durante toda su duración."""
+    base = clip.audio_or_silence()
+    return replace(clip, audio=audio_engine.agregar_musica(base, music, float(gain)))
+
+
+# Firma de cada función ``@``: tipos de los argumentos (``...`` = repetible).
+SIGNATURES: Dict[str, tuple] = {
+    "resize": (Clip, float, float),
+    "flip": (Clip,),
+    "velocidad": (Clip, float),
+    "fadein": (Clip, float),
+    "fadeout": (Clip, float),
+    "silencio": ((Clip, AudioStream),),
+    "extraer_audio": (Clip,),
+    "quitar_audio": (Clip,),
+    "agregar_musica": (Clip, AudioStream, float),
+    "concatenar": (Clip, ...),
+    "cortar": (Clip, float, float),
+}
+
+FUNCTIONS: Dict[str, Callable] = {
+    "resize": resize, "flip": flip, "velocidad": velocidad,
+    "fadein": fadein, "fadeout": fadeout, "silencio": silencio,
+    "extraer_audio": extraer_audio, "quitar_audio": quitar_audio,
+    "agregar_musica": agregar_musica, "concatenar": concatenar, "cortar": cortar,
+}
+
+# Argumentos opcionales al final de la firma.
+_OPTIONAL = {"agregar_musica": 1}
+
+
+def _type_name(t) -> str:
+    if isinstance(t, tuple):
+        return " or ".join(_type_name(x) for x in t)
+    return {Clip: "video", AudioStream: "audio", float: "number"}[t]
+
+
+def apply(name: str, args: List[object],
+          opener: Callable[[str], Union[Clip, AudioStream]] = load) -> Union[Clip, AudioStream]:
+    """Aplica ``@name`` a ``args`` ya evaluados, validando la firma.
+
+    Las cadenas en posición de clip o de audio se abren con ``opener``.
+    """
+    sig = SIGNATURES[name]
+    if sig[-1] is ...:
+        expected = [sig[0]] * max(len(args), 1)
+    else:
+        expected = list(sig)
+        if len(sig) - _OPTIONAL.get(name, 0) <= len(args) <= len(sig):
+            expected = expected[:len(args)]
+    if len(args) != len(expected):
+        raise ValueError(f"@{name} expects {len(expected)} arguments, got {len(args)}")
+    values = []
+    for k, (arg, want) in enumerate(zip(args, expected), 1):
+        kinds = want if isinstance(want, tuple) else (want,)
+        if isinstance(arg, str) and (Clip in kinds or AudioStream in kinds):
+            arg = opener(arg)
+        if float in kinds and isinstance(arg, (int, float)) and not isinstance(arg, bool):
+            arg = float(arg)
+        if not isinstance(arg, kinds):
+            raise ValueError(f"@{name}: argument {k} must be {_type_name(want)}")
+        values.append(arg)
+    return FUNCTIONS[name](*values)
@@ -0,0 +1,193 @@
+"""Contabilidad de memoria por fase del lexer, el parser y Graphviz.
+
+Usa ``tracemalloc`` para medir, en cada fase, el pico de memoria y los
+bytes que quedan retenidos al terminar, junto con los puntos del código que
+más asignan. A partir de ahí calcula bytes por token y bytes por nodo, que
+sirven para fijar límites de capacidad según el tamaño de la entrada.
+
+Se usa desde ``python lexer.py archivo.txt --memory`` y
+``python parse_tree.py archivo.txt --memory [--stream]`` o directamente::
+
+    report = measure_pipeline(src)
+    print(report.format())
+"""
+
+import fnmatch
+import linecache
+import os
+import re
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from lexer import Lexer
+
+T = TypeVar('T')
+
+# Número de puntos de asignación que se listan por fase.
+TOP_SITES = 5
+
+
+@dataclass
+class PhaseMemory:
+    """Memoria de una fase: pico y retenido en bytes sobre el inicio de la fase."""
+    name: str
+    peak: int
+    retained: int
+    top: List[Tuple[str, int]] = field(default_factory=list)
+
+
+@dataclass
+class MemoryReport:
+    phases: List[PhaseMemory] = field(default_factory=list)
+    tokens: int = 0
+    nodes: int = 0
+    source_bytes: int = 0
+
+    def phase(self, name: str) -> Optional[PhaseMemory]:
+        for ph in self.phases:
+            if ph.name == name:
+                return ph
+        return None
+
+    @property
+    def bytes_per_token(self) -> float:
+        ph = self.phase("lex")
+        return ph.retained / self.tokens if ph and self.tokens else 0.0
+
+    @property
+    def bytes_per_node(self) -> float:
+        ph = self.phase("parse") or self.phase("stream")
+        return ph.retained / self.nodes if ph and self.nodes else 0.0
+
+    @property
+    def peak(self) -> int:
+        """Pico más alto entre todas las fases."""
+        return max((ph.peak for ph in self.phases), default=0)
+
+    def format(self) -> str:
+        lines = [f"--- MEMORY ({self.source_bytes} bytes de fuente) ---"]
+        for ph in self.phases:
+            lines.append(f"{ph.name:8} pico {_kib(ph.peak):>12}  retenido {_kib(ph.retained):>12}")
+            for site, size in ph.top:
+                lines.append(f"           {_kib(size):>12}  {site}")
+        if self.tokens:
+            lines.append(f"{self.tokens} tokens, {self.bytes_per_token:.1f} bytes/token")
+        if self.nodes:
+            lines.append(f"{self.nodes} nodos, {self.bytes_per_node:.1f} bytes/nodo")
+        return "\n".join(lines)
+
+
+def _kib(n: int) -> str:
+    return f"{n / 1024:.1f} KiB"
+
+
+def _site(stat: tracemalloc.StatisticDiff) -> str:
+    frame = stat.traceback[0]
+    where = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+    code = linecache.getline(frame.filename, frame.lineno).strip()
+    return f"{where}  {code}" if code else where
+
+
+# Asignaciones propias de la medición (instantáneas, filtros con fnmatch/re).
+_IGNORE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, fnmatch.__file__),
+    tracemalloc.Filter(False, os.path.join(os.path.dirname(re.__file__), "*")),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def measure_phase(report: MemoryReport, name: str, fn: Callable[[], T]) -> T:
+    """Ejecuta ``fn`` midiendo su memoria y añade la fase a ``report``."""
+    before = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    result = fn()
+    end, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+    diff = after.compare_to(before, 'lineno')
+    top = [(_site(st), st.size_diff) for st in diff[:TOP_SITES] if st.size_diff > 0]
+    report.phases.append(PhaseMemory(name, peak - start, end - start, top))
+    return result
+
+
+class _Tracing:
+    """Arranca ``tracemalloc`` si no estaba activo y lo detiene al salir."""
+
+    def __enter__(self) -> None:
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start()
+
+    def __exit__(self, *exc) -> None:
+        if self.started:
+            tracemalloc.stop()
+
+
+def measure_lexer(src: str) -> Tuple[list, List[str], MemoryReport]:
+    """Tokeniza ``src`` midiendo la fase léxica."""
+    report = MemoryReport(source_bytes=len(src.encode('utf-8')))
+    with _Tracing():
+        lexer = Lexer(src)
+        tokens = measure_phase(report, "lex", lexer.tokenize)
+    report.tokens = len(tokens)
+    return tokens, lexer.errors, report
+
+
+def _count_nodes(root) -> int:
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+def measure_pipeline(src: str, graph: bool = True) -> MemoryReport:
+    """Mide lexer, árbol de parseo y (opcional) ``Digraph`` sobre ``src``.
+
+    Cada fase conserva vivo el resultado de la anterior, como en
+    ``parse_tree.main``, de modo que el retenido refleja lo que ocupa cada
+    estructura mientras el programa la mantiene.
+    """
+    from parse_tree import ParseTreeVisualizer
+
+    report = MemoryReport(source_bytes=len(src.encode('utf-8')))
+    with _Tracing():
+        lexer = Lexer(src)
+        tokens = measure_phase(report, "lex", lexer.tokenize)
+        visualizer = ParseTreeVisualizer()
+        root = measure_phase(report, "parse", lambda: visualizer.build_tree(tokens))
+        if graph:
+            measure_phase(report, "graph", lambda: visualizer.build_graph(root))
+    report.tokens = len(tokens)
+    report.nodes = _count_nodes(root)
+    return report
+
+
+def measure_streaming(src: str) -> MemoryReport:
+    """Mide lexer y parser en una sola pasada (``parse(lexer.iter_tokens())``).
+
+    La fase ``stream`` equivale a ``lex`` + ``parse`` de ``measure_pipeline``
+    sin la lista de tokens: lo retenido es sólo el árbol.
+    """
+    from parse_tree import parse
+
+    report = MemoryReport(source_bytes=len(src.encode('utf-8')))
+    count = 0
+
+    def counted(tokens):
+        nonlocal count
+        for tok in tokens:
+            count += 1
+            yield tok
+
+    with _Tracing():
+        lexer = Lexer(src)
+        root, _ = measure_phase(report, "stream", lambda: parse(counted(lexer.iter_tokens())))
+    report.tokens = count
+    report.nodes = _count_nodes(root)
+    return report
@@ -1,146 +1,433 @@
 #!/usr/bin/env python3
 
 
+import argparse
+import os
 import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Union, Optional
+from typing import Iterable, Iterator, List, Union, Optional, Tuple
 from graphviz import Digraph
 
-from lexer import Lexer
+from lexer import Lexer, jobs_arg
 from enums import Token, TokenType
 from grammar_def import PARSING_TABLE, START_SYMBOL, EPSILON
 
 # ─── Nodo del arbol de parseo 
+@dataclass
 class ParseTreeNode:
     id:      int
     label:   str
     token:   Optional[Token] = None
     children: List['ParseTreeNode'] = field(default_factory=list)
+    # ((línea, columna) inicial, (línea, columna) final exclusiva) de sus
+    # tokens; la asigna ``span_index.SpanIndex``
+    span: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = field(
+        default=None, compare=False, repr=False)
+
+# ─── Parseo sin estado compartido ─────────────────────────────────────────
+def parse(tokens: Iterable[Token],
+          start_symbol: str = START_SYMBOL,
+          profile=None) -> Tuple[ParseTreeNode, List[str]]:
+    """Construye el árbol de ``tokens`` y devuelve ``(raiz, errores)``.
+
+    ``tokens`` puede ser cualquier iterable: la gramática es LL(1) y sólo se
+    mira un token por delante, de modo que ``parse(lexer.iter_tokens())``
+    tokeniza y parsea en una sola pasada sin guardar la lista de tokens.
+
+    Todo el estado (pilas, contador de nodos, errores) es local a la
+    llamada y ``tokens`` no se modifica: si no termina en EOF se usa uno
+    propio. Las tablas que consulta son inmutables, así que varios hilos
+    pueden parsear a la vez sin compartir nada.
+
+    ``profile`` (opcional, ver ``profiler.GrammarProfile``) recibe cada
+    expansión de la tabla y cada token descartado por recuperación.
+    """
+    root, errors, _ = _parse(tokens, start_symbol, profile)
+    return root, errors
+
+
+def _lookahead(tokens: Iterable[Token]) -> Iterator[Token]:
+    """Recorre ``tokens`` y después repite el EOF final indefinidamente.
+
+    Si el flujo no termina en EOF se agrega uno en la posición del último
+    token (o en 0:0 si estaba vacío).
+    """
+    last = None
+    for last in tokens:
+        yield last
+    if last is None or last.type != TokenType.EOF:
+        last = Token(TokenType.EOF, "",
+                     last.line if last else 0,
+                     last.column if last else 0)
+    while True:
+        yield last
+
+
+def _parse(tokens: Iterable[Token], start_symbol: str,
+           profile=None) -> Tuple[ParseTreeNode, List[str], int]:
+    stream = _lookahead(tokens)
+    errors: List[str] = []
+    counter = 1
+    actual   = next(stream)
+    # Raíz del árbol
+    root      = ParseTreeNode(id=counter, label=start_symbol)
+    # Pilas paralelas
+    symbol_stack = [start_symbol]
+    node_stack   = [root]
+
+    # Bucle principal
+    while symbol_stack:
+        sym  = symbol_stack.pop()
+        node = node_stack.pop()
+
+        # ── Caso A: TERMINAL ────────────────────
+        if isinstance(sym, TokenType):
+            if actual.type == sym:
+                counter += 1
+                node.children.append(ParseTreeNode(
+                    id=counter, label=token_repr(actual.type, actual.value), token=actual))
+                actual = next(stream)
+            else:
+                # si no coincide, simplemente descartamos el terminal esperado
+                errors.append(
+                    f"Expected {sym.name} but found {actual.type.name} "
+                    f"at line {actual.line}, column {actual.column}"
+                )
+                if profile is not None:
+                    profile.missing(sym, actual.type)
+            continue
+
+        # ── Caso B: EPSILON ─────────────────────
+        if sym == EPSILON:
+            # omitimos nódulo ε
+            continue
+
+        # ── Caso C: NO-TERMINAL ─────────────────
+        prod = PARSING_TABLE.get(sym, {}).get(actual.type)
+        if prod is None:
+            # no hay producción → recuperamos descartando token
+            errors.append(
+                f"Unexpected {actual.type.name} '{actual.value}' in {sym} "
+                f"at line {actual.line}, column {actual.column}"
+            )
+            if profile is not None:
+                profile.skip(sym, actual.type)
+            actual = next(stream)
+            continue
+
+        # Creamos un hijo por cada símbolo de la producción
+        children = []
+        for s in prod:
+            if isinstance(s, TokenType):
+                lab = s.name
+            else:
+                lab = str(s)
+            counter += 1
+            child = ParseTreeNode(id=counter, label=lab)
+            children.append(child)
+            node.children.append(child)
+        if profile is not None:
+            profile.expand(node, actual.type, prod, children)
+
+        # Apilamos en orden inverso
+        for s, child in zip(reversed(prod), reversed(children)):
+            if s != EPSILON:
+                symbol_stack.append(s)
+                node_stack.append(child)
+
+    return root, errors, counter
 
 # ─── Clase visualizadora 
 class ParseTreeVisualizer:
     def __init__(self):
         self.node_counter = 0
+        self.errors: List[str] = []  # errores sintácticos de la última pasada
+        self.index = None            # ``TreeIndex`` del último árbol, si se pidió
 
-    def _new_node(self, label: str, token: Token = None) -> ParseTreeNode:
-        self.node_counter += 1
-        return ParseTreeNode(id=self.node_counter, label=label, token=token)
-
-    def build_tree(self, tokens: List[Token]) -> ParseTreeNode:
-        # EOF
-        if not tokens or tokens[-1].type != TokenType.EOF:
-            last = tokens[-1] if tokens else None
-            tokens.append(Token(TokenType.EOF, "", 
-                                last.line if last else 0, 
-                                last.column if last else 0))
-
-        pos      = 0
-        actual   = tokens[pos]
-        # Raíz del árbol
-        self.node_counter = 0
-        root      = self._new_node(START_SYMBOL)
-        # Pilas paralelas
-        symbol_stack = [START_SYMBOL]
-        node_stack   = [root]
-
-        # Bucle principal
-        while symbol_stack:
-            sym  = symbol_stack.pop()
-            node = node_stack.pop()
-
-            # ── Caso A: TERMINAL ────────────────────
-            if isinstance(sym, TokenType):
-                if actual.type == sym:
-                    leaf = self._new_node(token_repr(actual.type, actual.value), actual)
-                    node.children.append(leaf)
-                    pos += 1
-                    actual = tokens[pos] if pos < len(tokens) else tokens[-1]
-                # si no coincide, simplemente descartamos actual
-                continue
-
-            # ── Caso B: EPSILON ─────────────────────
-            if sym == EPSILON:
-                # omitimos nódulo ε
-                continue
-
-            # ── Caso C: NO-TERMINAL ─────────────────
-            prod = PARSING_TABLE.get(sym, {}).get(actual.type)
-            if prod is None:
-                # no hay producción → recuperamos descartando token
-                pos += 1
-                actual = tokens[pos] if pos < len(tokens) else tokens[-1]
-                continue
-
-            # Creamos un hijo por cada símbolo de la producción
-            children = []
-            for s in prod:
-                if isinstance(s, TokenType):
-                    lab = s.name
-                else:
-                    lab = str(s)
-                child = self._new_node(lab)
-                children.append(child)
-                node.children.append(child)
-
-            # Apilamos en orden inverso
-            for s, child in zip(reversed(prod), reversed(children)):
-                if s != EPSILON:
-                    symbol_stack.append(s)
-                    node_stack.append(child)
+    def build_tree(self, tokens: Iterable[Token],
+                   start_symbol: str = START_SYMBOL,
+                   index: bool = False) -> ParseTreeNode:
+        """Como ``parse``, pero guarda los errores en ``self.errors``.
 
+        Con ``index`` deja además en ``self.index`` un ``tree_index.TreeIndex``
+        del árbol para consultarlo por etiqueta o tipo de token.
+        Una instancia no debe compartirse entre hilos; para eso está ``parse``.
+        """
+        root, self.errors, self.node_counter = _parse(tokens, start_symbol)
+        self.index = None
+        if index:
+            from tree_index import TreeIndex
+            self.index = TreeIndex(root)
         return root
 
     def print_tree(self, node: ParseTreeNode, indent: int = 0) -> None:
         """Imprime el árbol en consola con indentación."""
-        pref = "  " * indent
-        print(f"{pref}{node.label}")
-        for c in node.children:
-            self.print_tree(c, indent + 1)
+        stack = [(node, indent)]
+        while stack:
+            cur, depth = stack.pop()
+            print(f"{'  ' * depth}{cur.label}")
+            stack.extend((c, depth + 1) for c in reversed(cur.children))
 
-    def visualize(self, root: ParseTreeNode, filename: str = 'parse_tree'):
-        """Genera PNG con Graphviz."""
+    def build_graph(self, root: ParseTreeNode) -> Digraph:
+        """Construye el ``Digraph`` del árbol sin renderizarlo."""
         dot = Digraph(comment='Parse Tree', format='png')
         self._add_nodes(dot, root)
+        return dot
+
+    def visualize(self, root: ParseTreeNode, filename: str = 'parse_tree'):
+        """Genera PNG con Graphviz."""
+        dot = self.build_graph(root)
         dot.render(filename, cleanup=True)
         print(f"Árbol de parseo guardado en {filename}.png")
 
     def _add_nodes(self, dot: Digraph, node: ParseTreeNode):
-        # estilo distinto para hojas (tokens) y nodos internos
-        if node.token:
-            dot.node(str(node.id), node.label,
-                     shape='ellipse', style='filled', color='lightblue2')
-        else:
-            dot.node(str(node.id), node.label,
-                     shape='box', style='filled', color='lightcoral')
-        for ch in node.children:
-            self._add_nodes(dot, ch)
-            dot.edge(str(node.id), str(ch.id))
+        # Recorrido con pila explícita: los árboles de programas largos son
+        # más profundos que el límite de recursión de Python.
+        stack = [node]
+        while stack:
+            cur = stack.pop()
+            # estilo distinto para hojas (tokens) y nodos internos
+            if cur.token:
+                dot.node(str(cur.id), cur.label,
+                         shape='ellipse', style='filled', color='lightblue2')
+            else:
+                dot.node(str(cur.id), cur.label,
+                         shape='box', style='filled', color='lightcoral')
+            for ch in cur.children:
+                dot.edge(str(cur.id), str(ch.id))
+            stack.extend(reversed(cur.children))
 
 # ─── Representación de un token en etiqueta de nodo ────────────────────────
 def token_repr(tt: TokenType, lex: str) -> str:
     if tt == TokenType.IDENTIFIER:
         return f"ID:{lex}"
     if tt in {TokenType.INT_LITERAL, TokenType.FLOAT_LITERAL,
-              TokenType.STRING_LITERAL, TokenType.BOOL_LITERAL}:
+              TokenType.STRING_LITERAL}:
         return f"{tt.name}:{lex}"
     return tt.name
 
+# ─── Parseo paralelo de sentencias de primer nivel ────────────────────────
+# Mínimo de sentencias de primer nivel para que valga la pena repartir.
+MIN_PARALLEL_STMTS = 256
+
+# Etiquetas de nodos internos: no terminales, terminales y ε.
+_LABELS = list(PARSING_TABLE) + [t.name for t in TokenType] + [EPSILON]
+_LABEL_CODES = {label: code for code, label in enumerate(_LABELS)}
+
+
+def split_top_level(tokens: List[Token]) -> Optional[List[Tuple[int, int]]]:
+    """Devuelve los rangos ``[ini, fin)`` de cada sentencia del bloque ``main``.
+
+    Una sentencia termina en un ``;`` a profundidad de llaves 1 o en la
+    ``}`` que cierra un ``if``/``while`` (salvo que la siga un ``else``).
+    Devuelve ``None`` si el flujo no tiene la forma ``main { ... } EOF``.
+    """
+    n = len(tokens)
+    if n < 4 or tokens[0].type != TokenType.MAIN or tokens[1].type != TokenType.LBRACE:
+        return None
+    spans = []
+    depth = 1
+    start = 2
+    for i in range(2, n):
+        tt = tokens[i].type
+        if tt == TokenType.LBRACE:
+            depth += 1
+        elif tt == TokenType.RBRACE:
+            depth -= 1
+            if depth == 0:
+                if start != i or i + 2 != n or tokens[i + 1].type != TokenType.EOF:
+                    return None
+                return spans
+            if depth == 1 and tokens[i + 1].type != TokenType.ELSE:
+                spans.append((start, i + 1))
+                start = i + 1
+        elif tt == TokenType.SEMICOLON and depth == 1:
+            spans.append((start, i + 1))
+            start = i + 1
+    return None
+
+
+def _encode(node: ParseTreeNode, stmt: List[Token]) -> Optional[array]:
+    """Aplana el subárbol en preorden como ternas (etiqueta, token, hijos).
+
+    Las hojas llevan el índice de su token dentro de ``stmt`` y etiqueta -1
+    (se recalcula con ``token_repr``). Devuelve ``None`` si el subárbol no
+    consumió exactamente los tokens de la sentencia. Enviar los nodos con
+    pickle cuesta varias veces más que parsearlos.
+    """
+    index = {id(tok): k for k, tok in enumerate(stmt)}
+    out = array('i')
+    consumed = 0
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        if cur.token is not None:
+            out.extend((-1, index[id(cur.token)], 0))
+            consumed += 1
+        else:
+            code = _LABEL_CODES.get(cur.label)
+            if code is None:
+                return None
+            out.extend((code, -1, len(cur.children)))
+        stack.extend(reversed(cur.children))
+    return out if consumed == len(stmt) - 1 else None
+
+
+def _decode(data: array, stmt: List[Token]) -> ParseTreeNode:
+    """Reconstruye el subárbol aplanado por ``_encode``."""
+    root = None
+    stack: List[list] = []  # [nodo, hijos pendientes]
+    for i in range(0, len(data), 3):
+        code, tok_index, nchildren = data[i], data[i + 1], data[i + 2]
+        if code < 0:
+            tok = stmt[tok_index]
+            node = ParseTreeNode(id=0, label=token_repr(tok.type, tok.value), token=tok)
+        else:
+            node = ParseTreeNode(id=0, label=_LABELS[code])
+        if stack:
+            top = stack[-1]
+            top[0].children.append(node)
+            top[1] -= 1
+            if top[1] == 0:
+                stack.pop()
+        else:
+            root = node
+        if nchildren:
+            stack.append([node, nchildren])
+    return root
+
+
+def _parse_stmts(batch: List[List[Token]]) -> List[Optional[array]]:
+    """Parsea cada sentencia desde ``Stmt``; ``None`` si no es limpia.
+
+    Cada lista trae como último elemento el token que sigue a la sentencia,
+    que sirve de lookahead (p. ej. para decidir ``ElseOpt``) sin consumirse.
+    """
+    out = []
+    for stmt in batch:
+        sub, errors = parse(stmt, start_symbol="Stmt")
+        out.append(None if errors else _encode(sub, stmt))
+    return out
+
+
+def renumber(root: ParseTreeNode) -> None:
+    """Reasigna ``id`` en el mismo orden en que los crea ``build_tree``.
+
+    El parser numera a los hijos de un nodo todos juntos al expandirlo, y
+    expande en preorden; se replica ese recorrido con una pila.
+    """
+    counter = 1
+    root.id = counter
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for ch in node.children:
+            counter += 1
+            ch.id = counter
+        stack.extend(reversed(node.children))
+
+
+def build_tree_parallel(tokens: List[Token],
+                        workers: Optional[int] = None) -> Tuple[ParseTreeNode, List[str]]:
+    """Parsea las sentencias de primer nivel de ``main`` en varios procesos.
+
+    Devuelve ``(raiz, errores)`` con el mismo árbol (ids incluidos) que
+    ``ParseTreeVisualizer().build_tree``. Si el flujo no se puede cortar o
+    alguna sentencia no parsea limpia, se recurre al parser secuencial para
+    reproducir exactamente su recuperación de errores.
+    """
+    workers = workers or os.cpu_count() or 1
+    visualizer = ParseTreeVisualizer()
+    tokens = list(tokens)
+    if not tokens or tokens[-1].type != TokenType.EOF:
+        last = tokens[-1] if tokens else None
+        tokens.append(Token(TokenType.EOF, "",
+                            last.line if last else 0,
+                            last.column if last else 0))
+    spans = split_top_level(tokens)
+    if workers == 1 or spans is None or len(spans) < MIN_PARALLEL_STMTS:
+        root = visualizer.build_tree(tokens)
+        return root, visualizer.errors
+
+    stmts = [tokens[a:b + 1] for a, b in spans]
+    size = -(-len(stmts) // (workers * 4))
+    batches = [stmts[i:i + size] for i in range(0, len(stmts), size)]
+    encoded: List[Optional[array]] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_parse_stmts, batches):
+            encoded.extend(part)
+    if any(data is None for data in encoded):
+        root = visualizer.build_tree(tokens)
+        return root, visualizer.errors
+    subtrees = [_decode(data, stmt) for data, stmt in zip(encoded, stmts)]
+
+    # Esqueleto main { } y luego la cadena StmtList → Stmt StmtList … ε
+    close = len(tokens) - 2
+    root = visualizer.build_tree([tokens[0], tokens[1], tokens[close], tokens[-1]])
+    block = root.children[1]
+    tail = block.children[1]  # StmtList → ε
+    for sub in reversed(subtrees):
+        tail = ParseTreeNode(id=0, label="StmtList", children=[sub, tail])
+    block.children[1] = tail
+    renumber(root)
+    return root, visualizer.errors
+
+
 # ─── Driver ────────────────────────────────────────────────────────────────
 def main():
-    if len(sys.argv) != 2:
-        print("Uso: python parse_tree.py <archivo.txt>")
-        sys.exit(1)
+    ap = argparse.ArgumentParser(
+        usage="python parse_tree.py <archivo.txt> [--jobs N] [--stream] [--tokens [ARCHIVO.tok]] [--generated] [--memory]")
+    ap.add_argument("archivo")
+    ap.add_argument("--jobs", type=jobs_arg, default=1,
+                    help="procesos para parsear en paralelo (0 = todos los núcleos)")
+    ap.add_argument("--stream", action="store_true",
+                    help="tokeniza y parsea en una sola pasada sin lista de tokens")
+    ap.add_argument("--tokens", nargs="?", const="", metavar="ARCHIVO.tok",
+                    help="carga los tokens de un .tok (por defecto junto al fuente) "
+                         "si corresponde al fuente; si no, tokeniza y lo guarda")
+    ap.add_argument("--generated", action="store_true",
+                    help="usa el parser generado (se regenera si cambió la gramática)")
+    ap.add_argument("--memory", action="store_true",
+                    help="sólo informa la memoria de lexer, árbol y Digraph")
+    args = ap.parse_args()
+    if args.stream and args.jobs != 1:
+        ap.error("--stream no se combina con --jobs")
+    if args.generated and (args.stream or args.jobs != 1):
+        ap.error("--generated no se combina con --stream ni con --jobs")
+    if args.tokens is not None and args.stream:
+        ap.error("--tokens no se combina con --stream")
 
-    ruta = sys.argv[1]
+    ruta = args.archivo
     try:
         src = open(ruta, encoding='utf-8').read()
     except FileNotFoundError:
         print(f"Error: no existe '{ruta}'")
         sys.exit(1)
 
+    if args.memory:
+        from memory_report import measure_pipeline, measure_streaming
+        print((measure_streaming(src) if args.stream else measure_pipeline(src)).format())
+        return
+
     #lexer
     lexer = Lexer(src)
-    tokens = lexer.tokenize()
+    if args.tokens is not None:
+        from token_stream import cached_tokenize
+        tok_path = args.tokens or ruta.rsplit('.', 1)[0] + '.tok'
+        tokens, lexer.errors = cached_tokenize(src, tok_path)
+        if args.jobs != 1:
+            tokens = list(tokens)
+    elif args.stream:
+        # el árbol se construye mientras se tokeniza; los errores léxicos
+        # sólo se conocen al agotar el lexer
+        stream = lexer.iter_tokens()
+        root, errors = parse(stream)
+        for _ in stream:
+            pass
+    else:
+        tokens = lexer.tokenize()
     if lexer.errors:
         print("✗ Errores léxicos:")
         for e in lexer.errors:
@@ -149,7 +436,18 @@ def main():
 
     #built tree
     visualizer = ParseTreeVisualizer()
-    root = visualizer.build_tree(tokens)
+    if args.jobs != 1:
+        root, errors = build_tree_parallel(tokens, args.jobs or None)
+    elif args.generated:
+        from gen_parser import load_parser
+        root, errors = load_parser().parse(tokens)
+    elif not args.stream:
+        root = visualizer.build_tree(tokens)
+        errors = visualizer.errors
+    if errors:
+        print("✗ Errores sintácticos:")
+        for e in errors:
+            print("  " + e)
 
     #consola
     print("\n=== Árbol de parseo (indentado) ===")
@@ -0,0 +1,548 @@
+"""Planificador de costos para las cadenas de funciones de video.
+
+Convierte cada ``FunctionCall`` del árbol de parseo en un plan (``Call``,
+``Ref``, ``Const``, ``Opaque``), estima su costo como fotogramas × píxeles
+que toca cada operación y aplica reescrituras equivalentes mientras el
+costo baje:
+
+* ``@cortar`` baja hacia la fuente a través de ``@resize``, ``@flip``,
+  ``@silencio``, ``@quitar_audio`` y ``@velocidad`` (reescalando los tiempos).
+* Un ``@resize`` que reduce la resolución baja hacia la fuente a través de
+  las operaciones que no dependen del tamaño del cuadro.
+* ``@velocidad`` sobre ``@velocidad`` y ``@cortar`` sobre ``@cortar`` se
+  fusionan en una sola llamada; ``@velocidad[v, 1]`` desaparece.
+
+Semántica supuesta (la misma que usa el evaluador): los tiempos van en
+segundos, ``@cortar[v, ini, fin]`` conserva ``[ini, fin)``,
+``@velocidad[v, k]`` dura ``1/k`` del original y ``@resize[v, ancho, alto]``.
+
+Uso::
+
+    python planner.py programa.txt --source v=1920x1080@30:120
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from enums import TokenType
+from grammar_def import EPSILON
+from lexer import Lexer
+from parse_tree import ParseTreeNode, ParseTreeVisualizer
+
+
+# ─── Representación del plan ──────────────────────────────────────────────
+@dataclass(frozen=True)
+class Ref:
+    """Variable del programa (normalmente un clip fuente)."""
+    name: str
+
+
+@dataclass(frozen=True)
+class Const:
+    """Literal numérico o de cadena."""
+    value: Union[int, float, str]
+
+
+@dataclass(frozen=True)
+class Opaque:
+    """Expresión que el planificador no interpreta; se conserva tal cual."""
+    text: str
+
+
+@dataclass(frozen=True)
+class Call:
+    """Llamada ``@func[args]``; el primer argumento es el clip de entrada."""
+    func: str
+    args: Tuple['Arg', ...]
+
+
+Arg = Union[Call, Ref, Const, Opaque]
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class ClipInfo:
+    """Forma de un clip: fotogramas, resolución y cuadros por segundo."""
+    frames: float
+    width: int
+    height: int
+    fps: float = 30.0
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+
+# Clip supuesto para fuentes sin información: un minuto en 1080p a 30 fps.
+DEFAULT_SOURCE = ClipInfo(frames=1800, width=1920, height=1080, fps=30.0)
+# Las funciones que sólo tocan el audio no cuestan píxeles.
+_AUDIO_ONLY = {"silencio", "quitar_audio", "agregar_musica", "extraer_audio"}
+
+
+# ─── Del árbol de parseo al plan ───────────────────────────────────────────
+def _leaf(node: ParseTreeNode):
+    """Token de un nodo terminal, o ``None`` si faltaba en la entrada."""
+    return node.children[0].token if node.children else None
+
+
+def _is_epsilon(node: ParseTreeNode) -> bool:
+    return len(node.children) == 1 and node.children[0].label == EPSILON
+
+
+def source_text(node: ParseTreeNode) -> str:
+    """Reconstruye el texto de un subárbol a partir de sus hojas."""
+    parts = []
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        if cur.token is not None:
+            parts.append(cur.token.value)
+        stack.extend(reversed(cur.children))
+    return " ".join(parts)
+
+
+def single_factor(expr: ParseTreeNode) -> Optional[ParseTreeNode]:
+    """``Factor`` al que se reduce ``expr`` si no tiene operadores binarios."""
+    node = expr
+    while node.label != "Factor":
+        if len(node.children) == 1:
+            node = node.children[0]
+        elif len(node.children) == 2 and _is_epsilon(node.children[1]):
+            node = node.children[0]
+        else:
+            return None
+    return node
+
+
+def call_args(call: ParseTreeNode) -> List[ParseTreeNode]:
+    """Nodos ``Expr`` de los argumentos de un ``FunctionCall``."""
+    args = []
+    node = call.children[2] if len(call.children) > 2 else None
+    if node is None or node.label != "ArgListOpt" or _is_epsilon(node):
+        return args
+    node = node.children[0]                       # ArgList
+    while node is not None and not _is_epsilon(node):
+        expr = next((c for c in node.children if c.label == "Expr"), None)
+        if expr is not None:
+            args.append(expr)
+        node = next((c for c in node.children if c.label == "ArgList'"), None)
+    return args
+
+
+def _number(text: str) -> Union[int, float]:
+    return float(text) if '.' in text else int(text)
+
+
+def _pop(out: list, count: int) -> list:
+    """Saca los últimos ``count`` resultados de ``out``, en orden."""
+    items = out[len(out) - count:]
+    del out[len(out) - count:]
+    return items
+
+
+def plan_expr(expr: ParseTreeNode) -> Arg:
+    """Plan de una ``Expr`` (o de un ``Factor``/``FunctionCall``).
+
+    Usa una pila explícita: ``@flip[@flip[...]]`` o los paréntesis muy
+    anidados no agotan la pila de Python.
+    """
+    out: List[Arg] = []
+    todo: List[tuple] = [("expr", expr)]
+    while todo:
+        task = todo.pop()
+        if task[0] == "call":                       # ("call", función, nº de args)
+            out.append(Call(task[1], tuple(_pop(out, task[2]))))
+            continue
+        if task[0] == "neg":                        # ("neg", factor)
+            inner = out.pop()
+            out.append(Const(-inner.value)
+                       if isinstance(inner, Const) and not isinstance(inner.value, str)
+                       else Opaque(source_text(task[1])))
+            continue
+        node = task[1]
+        factor = node if node.label in ("Factor", "FunctionCall") else single_factor(node)
+        if factor is None:
+            out.append(Opaque(source_text(node)))
+            continue
+        if factor.label == "Factor" and factor.children[0].label == "FunctionCall":
+            factor = factor.children[0]
+        if factor.label == "FunctionCall":
+            tok = _leaf(factor.children[0])
+            if tok is None:
+                out.append(Opaque(source_text(factor)))
+                continue
+            args = call_args(factor)
+            todo.append(("call", tok.value.lstrip('@'), len(args)))
+            todo.extend(("expr", a) for a in reversed(args))
+            continue
+        tok = _leaf(factor.children[0])
+        if tok is None:
+            out.append(Opaque(source_text(factor)))
+        elif tok.type == TokenType.IDENTIFIER:
+            out.append(Ref(tok.value))
+        elif tok.type in (TokenType.INT_LITERAL, TokenType.FLOAT_LITERAL):
+            out.append(Const(_number(tok.value)))
+        elif tok.type == TokenType.STRING_LITERAL:
+            out.append(Const(tok.value[1:-1]))
+        elif tok.type == TokenType.LPAREN and len(factor.children) == 3:
+            todo.append(("expr", factor.children[1]))
+        elif tok.type == TokenType.MINUS and len(factor.children) == 2:
+            todo.append(("neg", factor))
+            todo.append(("expr", factor.children[1]))
+        else:
+            out.append(Opaque(source_text(factor)))
+    return out[0]
+
+
+def _plan_call(call: ParseTreeNode) -> Arg:
+    return plan_expr(call)
+
+
+def _postorder(arg: Arg, leaf: Callable[[Arg], T], combine: Callable[[Call, list], T]) -> T:
+    """Recorre el plan de abajo hacia arriba sin recursión.
+
+    ``leaf`` da el valor de lo que no es ``Call``; ``combine`` el de una
+    ``Call`` a partir de los valores de sus argumentos.
+    """
+    out: list = []
+    stack: List[Tuple[Arg, bool]] = [(arg, False)]
+    while stack:
+        cur, expanded = stack.pop()
+        if not isinstance(cur, Call):
+            out.append(leaf(cur))
+        elif expanded:
+            out.append(combine(cur, _pop(out, len(cur.args))))
+        else:
+            stack.append((cur, True))
+            stack.extend((a, False) for a in reversed(cur.args))
+    return out[0]
+
+
+def _fmt_const(value) -> str:
+    if isinstance(value, str):
+        return f'"{value}"'
+    value = round(value, 6)
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _leaf_source(arg: Arg) -> str:
+    if isinstance(arg, Ref):
+        return arg.name
+    if isinstance(arg, Const):
+        return _fmt_const(arg.value)
+    return arg.text
+
+
+def to_source(arg: Arg) -> str:
+    """Texto del plan en la sintaxis del lenguaje."""
+    return _postorder(arg, _leaf_source,
+                      lambda call, args: f"@{call.func}[{', '.join(args)}]")
+
+
+# ─── Modelo de costo ───────────────────────────────────────────────────────
+def _num(arg: Arg) -> Optional[float]:
+    if isinstance(arg, Const) and not isinstance(arg.value, str):
+        return float(arg.value)
+    return None
+
+
+def estimate(arg: Arg, sources: Dict[str, ClipInfo]) -> Tuple[ClipInfo, float]:
+    """Devuelve la forma del clip resultante y el costo acumulado del plan.
+
+    Cada operación cuesta los fotogramas que produce por los píxeles que
+    lee o escribe (el mayor de ambos en ``@resize``). Los argumentos que no
+    son constantes se tratan como si no cambiaran la forma del clip.
+    """
+    def leaf(a: Arg) -> Tuple[ClipInfo, float]:
+        if isinstance(a, Ref):
+            return sources.get(a.name, DEFAULT_SOURCE), 0.0
+        return DEFAULT_SOURCE, 0.0
+
+    return _postorder(arg, leaf, _estimate_call)
+
+
+def _estimate_call(arg: Call, shapes: List[Tuple[ClipInfo, float]]) -> Tuple[ClipInfo, float]:
+    """Forma y costo de ``arg`` dados los de sus argumentos."""
+    cost = sum(c for _, c in shapes)
+    info = shapes[0][0] if shapes else DEFAULT_SOURCE
+    params = [_num(a) for a in arg.args[1:]]
+    f = arg.func
+
+    if f == "cortar" and len(params) >= 2 and None not in params[:2]:
+        start = min(max(params[0], 0.0) * info.fps, info.frames)
+        end = min(max(params[1], 0.0) * info.fps, info.frames)
+        info = replace(info, frames=max(end - start, 0.0))
+    elif f == "velocidad" and params and params[0]:
+        info = replace(info, frames=info.frames / abs(params[0]))
+    elif f == "resize" and len(params) >= 2 and None not in params[:2]:
+        before = info.pixels
+        info = replace(info, width=int(params[0]), height=int(params[1]))
+        return info, cost + info.frames * max(before, info.pixels)
+    elif f == "concatenar":
+        info = replace(info, frames=sum(i.frames for (i, _), a in zip(shapes, arg.args)
+                                        if isinstance(a, (Call, Ref))))
+    elif f == "extraer_audio":
+        return replace(info, width=0, height=0), cost
+
+    if f in _AUDIO_ONLY:
+        return info, cost
+    return info, cost + info.frames * info.pixels
+
+
+def plan_size(arg: Arg) -> int:
+    """Número de llamadas del plan."""
+    return _postorder(arg, lambda a: 0, lambda call, sizes: 1 + sum(sizes))
+
+
+# ─── Reescrituras ──────────────────────────────────────────────────────────
+Rule = Callable[[Call], Optional[Arg]]
+
+# Operaciones que conmutan con un recorte en el tiempo.
+_CUT_THROUGH = {"resize", "flip", "silencio", "quitar_audio"}
+# Operaciones que no dependen de la resolución del cuadro.
+_RESIZE_THROUGH = {"flip", "velocidad", "cortar", "fadein", "fadeout", "silencio", "quitar_audio"}
+
+
+def _inner(call: Call, func: Optional[str] = None) -> Optional[Call]:
+    """Llamada que recibe ``call`` como clip, si es de la función ``func``."""
+    if not call.args or not isinstance(call.args[0], Call):
+        return None
+    inner = call.args[0]
+    return inner if func is None or inner.func == func else None
+
+
+def _consts(call: Call, count: int) -> Optional[List[float]]:
+    """Los ``count`` parámetros tras el clip, si todos son constantes."""
+    if len(call.args) != count + 1:
+        return None
+    values = [_num(a) for a in call.args[1:]]
+    return None if None in values else values
+
+
+def merge_cuts(call: Call) -> Optional[Call]:
+    """``@cortar[@cortar[v, a, b], c, d]`` → ``@cortar[v, a+c, min(b, a+d)]``."""
+    inner = _inner(call, "cortar")
+    if call.func != "cortar" or inner is None:
+        return None
+    outer, first = _consts(call, 2), _consts(inner, 2)
+    if outer is None or first is None:
+        return None
+    (a, b), (c, d) = first, outer
+    start = a + max(c, 0.0)
+    return Call("cortar", (inner.args[0], Const(start), Const(max(start, min(b, a + d)))))
+
+
+def merge_speeds(call: Call) -> Optional[Call]:
+    """``@velocidad[@velocidad[v, k1], k2]`` → ``@velocidad[v, k1*k2]``."""
+    inner = _inner(call, "velocidad")
+    if call.func != "velocidad" or inner is None:
+        return None
+    outer, first = _consts(call, 1), _consts(inner, 1)
+    if outer is None or first is None:
+        return None
+    return Call("velocidad", (inner.args[0], Const(first[0] * outer[0])))
+
+
+def drop_identity(call: Call) -> Optional[Arg]:
+    """``@velocidad[v, 1]`` → ``v``."""
+    if call.func == "velocidad" and call.args and _consts(call, 1) == [1.0]:
+        return call.args[0]
+    return None
+
+
+def push_cut(call: Call) -> Optional[Call]:
+    """Baja ``@cortar`` por debajo de la operación que envuelve."""
+    inner = _inner(call)
+    times = _consts(call, 2) if call.func == "cortar" else None
+    if inner is None or times is None:
+        return None
+    if inner.func in _CUT_THROUGH:
+        cut = Call("cortar", (inner.args[0],) + call.args[1:])
+        return Call(inner.func, (cut,) + inner.args[1:])
+    if inner.func == "velocidad":
+        k = _consts(inner, 1)
+        if k is None or k[0] <= 0:
+            return None
+        cut = Call("cortar", (inner.args[0], Const(times[0] * k[0]), Const(times[1] * k[0])))
+        return Call("velocidad", (cut,) + inner.args[1:])
+    return None
+
+
+def push_resize(call: Call) -> Optional[Call]:
+    """Baja ``@resize`` por debajo de la operación que envuelve."""
+    inner = _inner(call)
+    if call.func != "resize" or inner is None or inner.func not in _RESIZE_THROUGH \
+            or _consts(call, 2) is None:
+        return None
+    resized = Call("resize", (inner.args[0],) + call.args[1:])
+    return Call(inner.func, (resized,) + inner.args[1:])
+
+
+RULES: Tuple[Rule, ...] = (merge_cuts, merge_speeds, drop_identity, push_cut, push_resize)
+
+# Tope de reescrituras por llamada, por si dos reglas se deshacen entre sí.
+MAX_REWRITES = 1000
+
+
+@dataclass
+class PlanResult:
+    """Plan original y optimizado de una llamada, con sus costos."""
+    original: Arg
+    optimized: Arg
+    cost_before: float
+    cost_after: float
+    rewrites: List[str] = field(default_factory=list)
+    target: Optional[str] = None   # variable que recibe el resultado
+    skipped: bool = False          # demasiado anidado para reescribir: queda como está
+
+    @property
+    def saving(self) -> float:
+        """Fracción del costo original que se ahorra."""
+        return 1 - self.cost_after / self.cost_before if self.cost_before else 0.0
+
+
+class Planner:
+    """Aplica ``RULES`` mientras bajen el costo (y, a igual costo, el tamaño)."""
+
+    def __init__(self, sources: Optional[Dict[str, ClipInfo]] = None) -> None:
+        self.sources: Dict[str, ClipInfo] = dict(sources or {})
+        self.rewrites: List[str] = []
+
+    def _key(self, arg: Arg) -> Tuple[float, int]:
+        return estimate(arg, self.sources)[1], plan_size(arg)
+
+    def rewrite(self, arg: Arg) -> Arg:
+        """Versión optimizada de ``arg``, de abajo hacia arriba."""
+        if not isinstance(arg, Call):
+            return arg
+        call: Arg = Call(arg.func, tuple(self.rewrite(a) for a in arg.args))
+        changed = True
+        while changed and isinstance(call, Call) and len(self.rewrites) < MAX_REWRITES:
+            changed = False
+            key = self._key(call)
+            for rule in RULES:
+                candidate = rule(call)
+                if candidate is None:
+                    continue
+                # Lo que bajó hacia la fuente puede habilitar más reglas abajo.
+                if isinstance(candidate, Call):
+                    candidate = Call(candidate.func,
+                                     tuple(self.rewrite(a) for a in candidate.args))
+                if self._key(candidate) < key:
+                    self.rewrites.append(rule.__name__)
+                    call = candidate
+                    changed = True
+                    break
+        return call
+
+    def optimize(self, arg: Arg, target: Optional[str] = None) -> PlanResult:
+        """Optimiza ``arg``; si tiene ``target`` registra la forma resultante."""
+        self.rewrites = []
+        info, before = estimate(arg, self.sources)
+        skipped = False
+        try:
+            best = self.rewrite(arg)
+        except RecursionError:
+            # ``rewrite`` es recursiva; el plan se deja sin optimizar y se informa.
+            best, skipped = arg, True
+            self.rewrites = []
+        _, after = estimate(best, self.sources)
+        if target is not None:
+            self.sources[target] = info
+        return PlanResult(arg, best, before, after, self.rewrites, target, skipped)
+
+
+def optimize_program(root: ParseTreeNode,
+                     sources: Optional[Dict[str, ClipInfo]] = None) -> List[PlanResult]:
+    """Optimiza cada llamada ``@`` de primer nivel del programa, en orden.
+
+    Las asignaciones ``x = @f[...]`` registran la forma de ``x`` para las
+    llamadas posteriores que la usen como fuente.
+    """
+    planner = Planner(sources)
+    targets: Dict[int, str] = {}
+    results: List[PlanResult] = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.label in ("Assignment", "VarDecl"):
+            ident = next((c for c in node.children if c.label == "IDENTIFIER"), None)
+            init = node.children[-1]
+            expr = init.children[1] if init.label == "VarInitOpt" and len(init.children) == 2 \
+                else init
+            factor = single_factor(expr) if expr.label == "Expr" else None
+            if ident is not None and _leaf(ident) is not None and factor is not None \
+                    and factor.children and factor.children[0].label == "FunctionCall":
+                targets[id(factor.children[0])] = _leaf(ident).value
+        if node.label == "FunctionCall":
+            plan = _plan_call(node)
+            if isinstance(plan, Call):
+                results.append(planner.optimize(plan, targets.get(id(node))))
+            continue
+        stack.extend(reversed(node.children))
+    return results
+
+
+# ─── CLI ───────────────────────────────────────────────────────────────────
+def source_arg(value: str) -> Tuple[str, ClipInfo]:
+    """Tipo de argparse para ``--source nombre=ANCHOxALTO@FPS:SEGUNDOS``."""
+    try:
+        name, spec = value.split("=", 1)
+        size, rest = spec.split("@", 1)
+        width, height = size.lower().split("x", 1)
+        fps, seconds = rest.split(":", 1)
+        fps_f = float(fps)
+        return name, ClipInfo(float(seconds) * fps_f, int(width), int(height), fps_f)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"se esperaba nombre=ANCHOxALTO@FPS:SEGUNDOS, no '{value}'")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        usage="python planner.py <archivo.txt> [--source nombre=ANCHOxALTO@FPS:SEGUNDOS ...]")
+    ap.add_argument("archivo")
+    ap.add_argument("--source", type=source_arg, action="append", default=[],
+                    help="forma de un clip fuente (por defecto 1920x1080@30:60)")
+    args = ap.parse_args()
+
+    ruta = args.archivo
+    try:
+        src = open(ruta, encoding='utf-8').read()
+    except FileNotFoundError:
+        print(f"Error: no existe '{ruta}'")
+        sys.exit(1)
+
+    lexer = Lexer(src)
+    tokens = lexer.tokenize()
+    visualizer = ParseTreeVisualizer()
+    root = visualizer.build_tree(tokens)
+    errors = lexer.errors + visualizer.errors
+    if errors:
+        print("✗ Errores:")
+        for e in errors:
+            print("  " + e)
+        sys.exit(1)
+
+    total_before = total_after = 0.0
+    for res in optimize_program(root, dict(args.source)):
+        total_before += res.cost_before
+        total_after += res.cost_after
+        dest = f"{res.target} = " if res.target else ""
+        print(f"{dest}{to_source(res.original)}")
+        if res.rewrites:
+            print(f"  → {to_source(res.optimized)}")
+            print(f"  {', '.join(res.rewrites)}")
+        if res.skipped:
+            print("  (sin reescribir: anidamiento demasiado profundo)")
+        print(f"  costo {res.cost_before:.3g} → {res.cost_after:.3g} px·fotogramas "
+              f"({res.saving:.0%} menos)")
+    if total_before:
+        print(f"Total: {total_before:.3g} → {total_after:.3g} "
+              f"({1 - total_after / total_before:.0%} menos)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""Perfil de la gramática y del lexer sobre programas reales.
+
+Cuenta qué entradas de ``PARSING_TABLE`` se usan, es decir, cada expansión
+``(no terminal, lookahead)``. También cuenta las expansiones a ε, los tokens
+que la recuperación de errores descarta y los terminales que faltaban.
+Además mide el tiempo que pasa el lexer en cada rama:
+
+* identificadores y palabras clave;
+* números y cadenas;
+* operadores compuestos y símbolos de un carácter (por separado);
+* funciones ``@``;
+* comentarios y espacios.
+
+Todo es opcional: ``parse`` y ``Lexer`` no pagan nada si no se pide el
+perfil.
+
+La salida es un resumen JSON y pilas colapsadas (``marco;marco;... valor``)
+que aceptan ``flamegraph.pl``, speedscope o inferno. En las pilas del
+parser cada marco es un no terminal y el valor cuenta las expansiones. Una
+recursión directa (``StmtList`` dentro de ``StmtList``) se dibuja como un
+solo marco, para que la pila no crezca con el largo del programa. En las
+del lexer el valor está en microsegundos.
+
+Uso::
+
+    python profiler.py programa.txt [--json perfil.json]
+        [--stacks parser.folded] [--lex-stacks lexer.folded]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from enums import TokenType
+from grammar_def import EPSILON
+from lexer import Lexer
+from parse_tree import ParseTreeNode, parse
+
+# Filas del resumen que se muestran por consola.
+TOP_ENTRIES = 10
+
+
+# ─── Parser ────────────────────────────────────────────────────────────────
+@dataclass
+class GrammarProfile:
+    """Contadores que ``parse(tokens, profile=...)`` va llenando."""
+    expansions: Counter = field(default_factory=Counter)   # (nt, lookahead) → usos
+    epsilon: Counter = field(default_factory=Counter)      # nt → expansiones a ε
+    skipped: Counter = field(default_factory=Counter)      # (nt, token descartado) → veces
+    absent: Counter = field(default_factory=Counter)       # (terminal esperado, encontrado) → veces
+    stacks: Counter = field(default_factory=Counter)       # pila colapsada → expansiones
+    _paths: Dict[int, str] = field(default_factory=dict, repr=False)
+
+    def expand(self, node: ParseTreeNode, lookahead: TokenType,
+               prod: Tuple, children: List[ParseTreeNode]) -> None:
+        sym = node.label
+        self.expansions[(sym, lookahead)] += 1
+        if prod == (EPSILON,):
+            self.epsilon[sym] += 1
+        path = self._paths.pop(node.id, sym)
+        self.stacks[path] += 1
+        for s, child in zip(prod, children):
+            if isinstance(s, str) and s != EPSILON:
+                self._paths[child.id] = path if s == sym else f"{path};{s}"
+
+    def skip(self, sym: str, found: TokenType) -> None:
+        self.skipped[(sym, found)] += 1
+
+    def missing(self, expected: TokenType, found: TokenType) -> None:
+        self.absent[(expected, found)] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.expansions.values())
+
+
+# ─── Lexer ─────────────────────────────────────────────────────────────────
+# Método del ``Lexer`` → rama que se reporta.
+BRANCHES = {
+    "_identifier": "identifier",
+    "_number": "number",
+    "_string": "string",
+    "_compound_op": "compound_op",
+    "_symbol": "symbol",
+    "_video_function": "video_function",
+    "_comment": "comment",
+    "_skip_whitespace": "whitespace",
+}
+
+
+@dataclass
+class BranchTime:
+    calls: int = 0
+    ns: int = 0
+
+    @property
+    def seconds(self) -> float:
+        return self.ns / 1e9
+
+
+def _timed(branch: str, method):
+    def timed(self):
+        start = time.perf_counter_ns()
+        try:
+            return method(self)
+        finally:
+            entry = self.branches[branch]
+            entry.calls += 1
+            entry.ns += time.perf_counter_ns() - start
+    timed.__doc__ = method.__doc__
+    return timed
+
+
+class ProfilingLexer(Lexer):
+    """``Lexer`` que acumula llamadas y tiempo por rama en ``branches``."""
+
+    def __init__(self, text: str, line: int = 1) -> None:
+        super().__init__(text, line)
+        self.branches: Dict[str, BranchTime] = {b: BranchTime() for b in BRANCHES.values()}
+
+
+for _method, _branch in BRANCHES.items():
+    setattr(ProfilingLexer, _method, _timed(_branch, getattr(Lexer, _method)))
+
+
+# ─── Perfil completo ───────────────────────────────────────────────────────
+@dataclass
+class Profile:
+    grammar: GrammarProfile
+    branches: Dict[str, BranchTime]
+    lex_ns: int                       # tiempo total del lexer
+    tokens: int
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def other_ns(self) -> int:
+        """Tiempo del lexer fuera de las ramas medidas (el bucle que las despacha)."""
+        return max(0, self.lex_ns - sum(b.ns for b in self.branches.values()))
+
+    def summary(self) -> dict:
+        """Resumen serializable a JSON, con las entradas más usadas primero."""
+        g = self.grammar
+        return {
+            "tokens": self.tokens,
+            "expansions": g.total,
+            "productions": [
+                {"nonterminal": nt, "lookahead": la.name, "count": n}
+                for (nt, la), n in g.expansions.most_common()],
+            "epsilon": dict(g.epsilon.most_common()),
+            "recovery": {
+                "skipped": [{"nonterminal": nt, "token": tt.name, "count": n}
+                            for (nt, tt), n in g.skipped.most_common()],
+                "missing": [{"expected": exp.name, "found": tt.name, "count": n}
+                            for (exp, tt), n in g.absent.most_common()],
+            },
+            "lexer": {
+                "seconds": self.lex_ns / 1e9,
+                "branches": {name: {"calls": b.calls, "seconds": b.seconds}
+                             for name, b in self.branches.items()},
+                "other_seconds": self.other_ns / 1e9,
+            },
+            "errors": self.errors,
+        }
+
+    def parse_stacks(self) -> List[str]:
+        """Pilas colapsadas del parser; el valor es el número de expansiones."""
+        return [f"{path} {n}" for path, n in sorted(self.grammar.stacks.items())]
+
+    def lex_stacks(self) -> List[str]:
+        """Pilas colapsadas del lexer; el valor está en microsegundos."""
+        lines = [f"lexer;{name} {b.ns // 1000}"
+                 for name, b in self.branches.items() if b.ns >= 1000]
+        if self.other_ns >= 1000:
+            lines.append(f"lexer;other {self.other_ns // 1000}")
+        return lines
+
+    def format(self) -> str:
+        g = self.grammar
+        lines = [f"--- PERFIL ({self.tokens} tokens, {g.total} expansiones, "
+                 f"{sum(g.epsilon.values())} a ε, {sum(g.skipped.values())} tokens descartados) ---"]
+        for (nt, la), n in g.expansions.most_common(TOP_ENTRIES):
+            lines.append(f"  {n:>8}  {nt} / {la.name}")
+        lines.append(f"lexer {self.lex_ns / 1e6:.2f} ms")
+        ranked = sorted(self.branches.items(), key=lambda kv: -kv[1].ns)
+        for name, b in ranked + [("other", BranchTime(0, self.other_ns))]:
+            share = b.ns / self.lex_ns if self.lex_ns else 0.0
+            lines.append(f"  {name:<15} {b.calls:>8} llamadas {b.ns / 1e6:>9.2f} ms  {share:6.1%}")
+        return "\n".join(lines)
+
+
+def profile_source(src: str) -> Profile:
+    """Tokeniza y parsea ``src`` midiendo el lexer y la tabla LL(1)."""
+    lexer = ProfilingLexer(src)
+    start = time.perf_counter_ns()
+    tokens = lexer.tokenize()
+    lex_ns = time.perf_counter_ns() - start
+    grammar = GrammarProfile()
+    _, errors = parse(tokens, profile=grammar)
+    return Profile(grammar, lexer.branches, lex_ns, len(tokens), lexer.errors + errors)
+
+
+def _write(path: str, lines: List[str]) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+
+
+# ─── CLI ───────────────────────────────────────────────────────────────────
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        usage="python profiler.py <archivo.txt> [--json ARCHIVO] "
+              "[--stacks ARCHIVO] [--lex-stacks ARCHIVO]")
+    ap.add_argument("archivo")
+    ap.add_argument("--json", metavar="ARCHIVO", help="resumen en JSON ('-' = salida estándar)")
+    ap.add_argument("--stacks", metavar="ARCHIVO",
+                    help="pilas colapsadas del parser (expansiones)")
+    ap.add_argument("--lex-stacks", metavar="ARCHIVO",
+                    help="pilas colapsadas del lexer (microsegundos)")
+    args = ap.parse_args()
+
+    ruta = args.archivo
+    try:
+        src = open(ruta, encoding='utf-8').read()
+    except FileNotFoundError:
+        print(f"Error: no existe '{ruta}'")
+        sys.exit(1)
+
+    profile = profile_source(src)
+    if args.json == "-":
+        print(json.dumps(profile.summary(), indent=2, ensure_ascii=False))
+    else:
+        print(profile.format())
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as fh:
+                json.dump(profile.summary(), fh, indent=2, ensure_ascii=False)
+    if args.stacks:
+        _write(args.stacks, profile.parse_stacks())
+    if args.lex_stacks:
+        _write(args.lex_stacks, profile.lex_stacks())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,427 @@
+"""Generador aleatorio de programas guiado por ``PARSING_TABLE``.
+
+Recorre la gramática desde ``START_SYMBOL`` eligiendo producciones al azar
+bajo unos límites (sentencias, anidamiento de ``if``/``while`` y paréntesis,
+ancho de las expresiones, densidad de llamadas ``@``), de modo que todo lo
+que genera es un programa válido. Además:
+
+* ``mutate`` inyecta errores léxicos y sintácticos en un programa válido.
+* ``scaling`` mide ``Lexer.tokenize`` y ``build_tree`` contra el tamaño de
+  la entrada y marca crecimientos superlineales.
+* ``depth_probe`` busca la profundidad de anidamiento a la que alguna fase
+  falla con ``RecursionError``; la única recursiva es el parser generado.
+
+Uso::
+
+    python program_gen.py gen --statements 500 --depth 4 -o big.txt
+    python program_gen.py gen --statements 50 --mutate 5
+    python program_gen.py bench --sizes 500,1000,2000,4000
+    python program_gen.py depth --max 2000
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from enums import LEXEME_TO_TOKEN, TokenType
+from grammar_def import PARSING_TABLE, START_SYMBOL, EPSILON
+from lexer import Lexer
+
+
+@dataclass
+class GenConfig:
+    """Límites del programa generado."""
+    statements: int = 100        # sentencias de primer nivel en main
+    block_depth: int = 3         # anidamiento máximo de IfStmt/WhileStmt
+    block_statements: int = 3    # sentencias máximas dentro de cada bloque
+    paren_depth: int = 2         # paréntesis anidados máximos
+    expr_width: int = 3          # operadores encadenados por nivel de expresión
+    video_density: float = 0.3   # probabilidad de que un factor sea una llamada @
+    call_depth: int = 3          # llamadas @ anidadas máximas
+    seed: Optional[int] = None
+
+
+# Lexema de cada terminal con forma fija.
+_LEXEME = {tt: lex for lex, tt in LEXEME_TO_TOKEN.items()}
+_IDENTIFIERS = ["clip", "intro", "musica", "v", "a", "x", "y", "n", "fondo", "salida"]
+_STRINGS = ['"clip.y4m"', '"intro.y4m"', '"musica.wav"', '"salida"', '"hola"']
+
+
+def _productions(nt: str) -> List[tuple]:
+    """Producciones distintas de ``nt``, en orden de aparición."""
+    seen: Dict[tuple, None] = {}
+    for prod in PARSING_TABLE[nt].values():
+        seen.setdefault(tuple(prod), None)
+    return list(seen)
+
+
+def _min_lengths() -> Dict[str, int]:
+    """Longitud mínima en tokens que deriva cada no terminal."""
+    best = {nt: math.inf for nt in PARSING_TABLE}
+    changed = True
+    while changed:
+        changed = False
+        for nt in PARSING_TABLE:
+            for prod in _productions(nt):
+                size = sum(0 if s == EPSILON else 1 if isinstance(s, TokenType) else best[s]
+                           for s in prod)
+                if size < best[nt]:
+                    best[nt] = size
+                    changed = True
+    return best
+
+
+_PRODUCTIONS = {nt: _productions(nt) for nt in PARSING_TABLE}
+_MIN_LEN = _min_lengths()
+
+
+def _prod_len(prod: tuple) -> float:
+    return sum(0 if s == EPSILON else 1 if isinstance(s, TokenType) else _MIN_LEN[s]
+               for s in prod)
+
+
+class _Budget:
+    """Operadores binarios que le quedan a una ``Expr``.
+
+    Lo comparten todos los símbolos de esa expresión, que se expanden en
+    momentos distintos de la derivación; cada ``Expr`` anidada (entre
+    paréntesis o como argumento) recibe uno propio.
+    """
+    __slots__ = ("ops",)
+
+    def __init__(self, ops: int) -> None:
+        self.ops = ops
+
+    def take(self) -> bool:
+        """Gasta un operador si queda alguno."""
+        if self.ops <= 0:
+            return False
+        self.ops -= 1
+        return True
+
+
+@dataclass(frozen=True)
+class _Ctx:
+    """Contexto heredado por cada símbolo pendiente de expandir."""
+    blocks: int = 0   # bloques if/while/else que lo rodean
+    parens: int = 0   # paréntesis abiertos
+    calls: int = 0    # llamadas @ que lo rodean
+    run: int = 0      # repeticiones de la regla recursiva actual (StmtList, ArgList')
+    budget: Optional[_Budget] = field(default=None, compare=False)  # de la Expr actual
+
+
+class ProgramGenerator:
+    """Deriva programas válidos eligiendo producciones de ``PARSING_TABLE``."""
+
+    def __init__(self, config: GenConfig) -> None:
+        self.cfg = config
+        self.rng = random.Random(config.seed)
+
+    # ── elección de producción ──────────────────────────────────────────
+    def _choose(self, nt: str, ctx: _Ctx) -> tuple:
+        prods = _PRODUCTIONS[nt]
+        if len(prods) == 1:
+            return prods[0]
+        cfg, rng = self.cfg, self.rng
+        shortest = min(prods, key=_prod_len)
+
+        if nt == "StmtList":
+            limit = cfg.statements if ctx.blocks == 0 else rng.randint(1, cfg.block_statements)
+            more = [p for p in prods if p[0] != EPSILON]
+            return more[0] if ctx.run < limit else shortest
+        if nt == "Stmt":
+            allowed = [p for p in prods
+                       if p[0] not in ("IfStmt", "WhileStmt") or ctx.blocks < cfg.block_depth]
+            weights = [1 if p[0] in ("IfStmt", "WhileStmt", "ExportStmt") else 3 for p in allowed]
+            return rng.choices(allowed, weights)[0]
+        if nt == "ArgList'":
+            return shortest if ctx.run >= 2 or rng.random() < 0.4 else \
+                [p for p in prods if p is not shortest][0]
+        if nt.endswith("'"):
+            # Reglas primadas: seguir encadenando operadores mientras la
+            # expresión tenga presupuesto, o cerrar con ε
+            if ctx.budget is None or rng.random() < 0.7 or not ctx.budget.take():
+                return shortest
+            return rng.choice([p for p in prods if p is not shortest])
+        if nt == "Factor":
+            options = []
+            for p in prods:
+                head = p[0]
+                if head == TokenType.LPAREN and ctx.parens >= cfg.paren_depth:
+                    continue
+                if head == "FunctionCall" and ctx.calls >= cfg.call_depth:
+                    continue
+                options.append(p)
+            calls = [p for p in options if p[0] == "FunctionCall"]
+            # Cada nivel de llamadas anidadas reduce la densidad a la mitad
+            if calls and rng.random() < cfg.video_density * 0.5 ** ctx.calls:
+                return calls[0]
+            plain = [p for p in options if p[0] != "FunctionCall"]
+            weights = [6 if isinstance(p[0], TokenType) and len(p) == 1 else 1 for p in plain]
+            return rng.choices(plain, weights)[0]
+        if nt == "ArgListOpt":
+            return shortest if rng.random() < 0.05 else [p for p in prods if p is not shortest][0]
+        return rng.choice(prods)
+
+    def _terminal(self, tt: TokenType) -> str:
+        if tt == TokenType.IDENTIFIER:
+            return self.rng.choice(_IDENTIFIERS)
+        if tt == TokenType.INT_LITERAL:
+            return str(self.rng.randint(0, 2000))
+        if tt == TokenType.FLOAT_LITERAL:
+            return f"{self.rng.randint(0, 99)}.{self.rng.randint(0, 9)}"
+        if tt == TokenType.STRING_LITERAL:
+            return self.rng.choice(_STRINGS)
+        if tt == TokenType.EOF:
+            return ""
+        return _LEXEME[tt]
+
+    # ── derivación ──────────────────────────────────────────────────────
+    def tokens(self) -> List[str]:
+        """Deriva un programa y devuelve sus lexemas en orden."""
+        out: List[str] = []
+        stack: List[Tuple[object, _Ctx]] = [(START_SYMBOL, _Ctx())]
+        while stack:
+            sym, ctx = stack.pop()
+            if sym == EPSILON:
+                continue
+            if isinstance(sym, TokenType):
+                lex = self._terminal(sym)
+                if lex:
+                    out.append(lex)
+                continue
+            if sym == "Expr":
+                ctx = replace(ctx, run=0, budget=_Budget(self.rng.randint(0, self.cfg.expr_width)))
+            prod = self._choose(sym, ctx)
+            children = []
+            for s in prod:
+                child = ctx
+                if s == sym:
+                    child = replace(ctx, run=ctx.run + 1)
+                elif s == "Block" and sym in ("IfStmt", "WhileStmt", "ElseOpt"):
+                    child = replace(ctx, blocks=ctx.blocks + 1, run=0)
+                elif sym == "Factor" and prod[0] == TokenType.LPAREN:
+                    child = replace(ctx, parens=ctx.parens + 1, run=0)
+                elif sym == "FunctionCall":
+                    child = replace(ctx, calls=ctx.calls + 1, run=0)
+                elif not isinstance(s, TokenType):
+                    child = replace(ctx, run=0)
+                children.append((s, child))
+            stack.extend(reversed(children))
+        return out
+
+    def program(self) -> str:
+        return format_program(self.tokens())
+
+
+def format_program(lexemes: List[str]) -> str:
+    """Une lexemas con espacios y corta línea tras ``;``, ``{`` y ``}``."""
+    parts = []
+    for lex in lexemes:
+        parts.append(lex)
+        parts.append("\n" if lex in (";", "{", "}") else " ")
+    return "".join(parts).rstrip() + "\n"
+
+
+def generate_program(config: Optional[GenConfig] = None) -> str:
+    """Atajo: un programa válido con la configuración dada."""
+    return ProgramGenerator(config or GenConfig()).program()
+
+
+# ─── Mutaciones ────────────────────────────────────────────────────────────
+_LEXICAL_NOISE = ['$', '#', '"sin cerrar', '1.2.3', '3abc', '@desconocida', '/* abierto', '!', '@']
+
+
+def mutate(lexemes: List[str], count: int, seed: Optional[int] = None) -> str:
+    """Inyecta ``count`` errores léxicos o sintácticos en un programa válido."""
+    rng = random.Random(seed)
+    out = list(lexemes)
+    for _ in range(count):
+        if not out:
+            break
+        i = rng.randrange(len(out))
+        kind = rng.randrange(4)
+        if kind == 0:
+            # error léxico: lexema que el lexer rechaza
+            out.insert(i, rng.choice(_LEXICAL_NOISE))
+        elif kind == 1:
+            # error sintáctico: se pierde un token
+            del out[i]
+        elif kind == 2:
+            # error sintáctico: token duplicado
+            out.insert(i, out[i])
+        elif i + 1 < len(out):
+            # error sintáctico: dos tokens vecinos intercambiados
+            out[i], out[i + 1] = out[i + 1], out[i]
+    return format_program(out)
+
+
+# ─── Escalado ──────────────────────────────────────────────────────────────
+@dataclass
+class ScalingRow:
+    statements: int
+    chars: int
+    tokens: int
+    lex_seconds: float
+    parse_seconds: float
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def scaling(sizes: List[int], config: Optional[GenConfig] = None,
+            repeat: int = 3) -> List[ScalingRow]:
+    """Mide lexer y parser para programas de ``sizes`` sentencias."""
+    from parse_tree import ParseTreeVisualizer
+
+    base = config or GenConfig(seed=0)
+    rows = []
+    for n in sizes:
+        cfg = GenConfig(**{**base.__dict__, "statements": n})
+        src = generate_program(cfg)
+        lex_t, tokens = _timed(lambda: Lexer(src).tokenize(), repeat)
+        parse_t, _ = _timed(lambda: ParseTreeVisualizer().build_tree(list(tokens)), repeat)
+        rows.append(ScalingRow(n, len(src), len(tokens), lex_t, parse_t))
+    return rows
+
+
+def growth_exponent(xs: List[float], ys: List[float]) -> float:
+    """Pendiente de log(y) contra log(x) por mínimos cuadrados."""
+    lx = [math.log(x) for x in xs]
+    ly = [math.log(max(y, 1e-9)) for y in ys]
+    mx, my = sum(lx) / len(lx), sum(ly) / len(ly)
+    den = sum((a - mx) ** 2 for a in lx)
+    return sum((a - mx) * (b - my) for a, b in zip(lx, ly)) / den if den else 0.0
+
+
+def depth_probe(max_depth: int, step: int = 100) -> Dict[str, Optional[int]]:
+    """Primera profundidad de paréntesis anidados en que falla cada fase.
+
+    Fases: lexer, ``build_tree``, el parser generado, ``print_tree`` y
+    ``build_graph``. Todas usan pilas explícitas salvo el parser generado,
+    un descenso recursivo que gasta varios marcos de Python por nivel: es la
+    única fase que la prueba realmente presiona. Su ``parse`` debe recurrir
+    a ``build_tree`` al agotar la pila en vez de dejar escapar el
+    ``RecursionError``. ``None`` indica que no falló hasta ``max_depth``.
+    """
+    import contextlib
+    import io
+    from gen_parser import load_parser
+    from parse_tree import ParseTreeVisualizer
+
+    generated = load_parser()
+    stages: Dict[str, Callable] = {
+        "tokenize": lambda src, toks, root: Lexer(src).tokenize(),
+        "build_tree": lambda src, toks, root: ParseTreeVisualizer().build_tree(list(toks)),
+        "generated_parser": lambda src, toks, root: generated.parse(toks),
+        "print_tree": lambda src, toks, root: ParseTreeVisualizer().print_tree(root),
+        "build_graph": lambda src, toks, root: ParseTreeVisualizer().build_graph(root),
+    }
+    failures: Dict[str, Optional[int]] = {name: None for name in stages}
+    for depth in range(step, max_depth + 1, step):
+        src = "main {\nx = " + "(" * depth + "1" + ")" * depth + ";\n}\n"
+        toks = Lexer(src).tokenize()
+        root = ParseTreeVisualizer().build_tree(list(toks))
+        for name, stage in stages.items():
+            if failures[name] is not None:
+                continue
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stage(src, toks, root)
+            except RecursionError:
+                failures[name] = depth
+        if all(v is not None for v in failures.values()):
+            break
+    return failures
+
+
+# ─── CLI ───────────────────────────────────────────────────────────────────
+def _config_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--statements", type=int, default=100)
+    ap.add_argument("--depth", type=int, default=3, help="anidamiento de if/while")
+    ap.add_argument("--parens", type=int, default=2, help="paréntesis anidados")
+    ap.add_argument("--width", type=int, default=3, help="operadores encadenados")
+    ap.add_argument("--video", type=float, default=0.3, help="densidad de llamadas @")
+    ap.add_argument("--seed", type=int)
+
+
+def _config(args) -> GenConfig:
+    return GenConfig(statements=args.statements, block_depth=args.depth,
+                     paren_depth=args.parens, expr_width=args.width,
+                     video_density=args.video, seed=args.seed)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Programas aleatorios y pruebas de escalado")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    g = sub.add_parser("gen", help="genera un programa")
+    _config_args(g)
+    g.add_argument("--mutate", type=int, default=0, help="errores a inyectar")
+    g.add_argument("-o", "--output")
+
+    b = sub.add_parser("bench", help="mide tokenize/build_tree contra el tamaño")
+    _config_args(b)
+    b.add_argument("--sizes", default="250,500,1000,2000,4000")
+    b.add_argument("--threshold", type=float, default=1.2,
+                   help="exponente de crecimiento a partir del cual se marca")
+
+    d = sub.add_parser("depth", help="busca fallos por profundidad de recursión")
+    d.add_argument("--max", type=int, default=3000)
+    d.add_argument("--step", type=int, default=100)
+
+    args = ap.parse_args()
+
+    if args.cmd == "gen":
+        gen = ProgramGenerator(_config(args))
+        lexemes = gen.tokens()
+        src = mutate(lexemes, args.mutate, args.seed) if args.mutate else format_program(lexemes)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as fh:
+                fh.write(src)
+            print(f"{len(lexemes)} tokens escritos en {args.output}")
+        else:
+            sys.stdout.write(src)
+        return
+
+    if args.cmd == "bench":
+        cfg = _config(args)
+        if cfg.seed is None:
+            cfg.seed = 0
+        sizes = [int(s) for s in args.sizes.split(",")]
+        rows = scaling(sizes, cfg)
+        print(f"{'stmts':>8} {'chars':>10} {'tokens':>9} {'lex ms':>9} {'parse ms':>9}")
+        for r in rows:
+            print(f"{r.statements:>8} {r.chars:>10} {r.tokens:>9} "
+                  f"{r.lex_seconds * 1e3:>9.1f} {r.parse_seconds * 1e3:>9.1f}")
+        chars = [r.chars for r in rows]
+        flagged = False
+        for name, ys in (("tokenize", [r.lex_seconds for r in rows]),
+                         ("build_tree", [r.parse_seconds for r in rows])):
+            k = growth_exponent(chars, ys)
+            mark = "  ✗ superlineal" if k > args.threshold else ""
+            flagged = flagged or bool(mark)
+            print(f"{name:10} crece como n^{k:.2f}{mark}")
+        sys.exit(1 if flagged else 0)
+
+    if args.cmd == "depth":
+        failures = depth_probe(args.max, args.step)
+        for name, depth in failures.items():
+            status = f"✗ RecursionError con {depth} paréntesis" if depth else f"✓ hasta {args.max}"
+            print(f"{name:18} {status}")
+        sys.exit(1 if any(failures.values()) else 0)
+
+
+if __name__ == '__main__':
+    main()
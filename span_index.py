@@ -0,0 +1,120 @@
+"""Índice de posiciones del código fuente sobre el árbol de parseo.
+
+Para responder "qué nodo está bajo el cursor" sin recorrer todo el árbol en
+cada consulta, ``SpanIndex`` recorre el árbol una sola vez. En ese recorrido
+asigna a cada nodo su ``span``: la posición ``(línea, columna)`` de su
+primer token y la posición justo después del último. Los nodos sin tokens
+(ε, terminales que faltaban) quedan con ``span = None``.
+
+El recorrido en preorden deja los nodos ordenados por inicio, con cada nodo
+antes que sus descendientes, y las hojas no se solapan. Así cada consulta
+empieza con una búsqueda binaria:
+
+* ``node_at(línea, columna)``: el nodo más interno que contiene la posición;
+  se ubica el token anterior y se sube por los padres (en la práctica unos
+  pocos niveles: ver la nota sobre ``StmtList`` abajo);
+* ``node_at_offset(offset)``: lo mismo con un desplazamiento en caracteres
+  (hace falta el texto fuente);
+* ``nodes_in_range(inicio, fin)``: los nodos contenidos en el rango, en orden
+  de aparición.
+
+``StmtList`` es recursiva a la derecha: la de la sentencia k abarca desde
+ella hasta el final del bloque, así que subir desde un token siempre se
+detiene en la sentencia que lo contiene, sin recorrer la cadena entera.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from parse_tree import ParseTreeNode
+
+Position = Tuple[int, int]   # (línea, columna), desde 1 como en ``Token``
+
+
+class SpanIndex:
+    """Spans de un árbol e índice ordenado por posición."""
+
+    def __init__(self, root: ParseTreeNode, text: Optional[str] = None) -> None:
+        self.root = root
+        self._parent: Dict[int, ParseTreeNode] = {}
+        order: List[ParseTreeNode] = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in node.children:
+                self._parent[id(child)] = node
+            stack.extend(reversed(node.children))
+
+        # En preorden invertido cada nodo aparece después de sus hijos.
+        self._leaves: List[ParseTreeNode] = []
+        for node in reversed(order):
+            tok = node.token
+            if tok is not None:
+                node.span = ((tok.line, tok.column), (tok.line, tok.column + len(tok.value))) \
+                    if tok.value else None
+                if node.span is not None:
+                    self._leaves.append(node)
+                continue
+            spans = [c.span for c in node.children if c.span is not None]
+            node.span = (spans[0][0], spans[-1][1]) if spans else None
+        self._leaves.reverse()
+        self._leaf_starts = [n.span[0] for n in self._leaves]
+        self._nodes = [n for n in order if n.span is not None]
+        self._starts = [n.span[0] for n in self._nodes]
+
+        self._line_starts: Optional[List[int]] = None
+        if text is not None:
+            self._line_starts = [0]
+            pos = text.find('\n')
+            while pos != -1:
+                self._line_starts.append(pos + 1)
+                pos = text.find('\n', pos + 1)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def parent(self, node: ParseTreeNode) -> Optional[ParseTreeNode]:
+        return self._parent.get(id(node))
+
+    def position(self, offset: int) -> Position:
+        """``(línea, columna)`` del carácter ``offset`` del texto fuente."""
+        if self._line_starts is None:
+            raise ValueError("offset queries need the source text")
+        if offset < 0:
+            raise ValueError(f"offset must not be negative, not {offset}")
+        line = bisect_right(self._line_starts, offset)
+        return line, offset - self._line_starts[line - 1] + 1
+
+    def node_at(self, line: int, column: int,
+                label: Optional[str] = None) -> Optional[ParseTreeNode]:
+        """Nodo más interno cuyo span contiene la posición.
+
+        Con ``label`` se devuelve el ancestro más cercano con esa etiqueta
+        (por ejemplo ``"Stmt"`` para la sentencia bajo el cursor).
+        """
+        pos = (line, column)
+        i = bisect_right(self._leaf_starts, pos) - 1
+        if i < 0:
+            return None
+        node: Optional[ParseTreeNode] = self._leaves[i]
+        while node is not None and not (node.span[0] <= pos < node.span[1]):
+            node = self.parent(node)
+        while node is not None and label is not None and node.label != label:
+            node = self.parent(node)
+        return node
+
+    def node_at_offset(self, offset: int,
+                       label: Optional[str] = None) -> Optional[ParseTreeNode]:
+        return self.node_at(*self.position(offset), label=label)
+
+    def nodes_in_range(self, start: Position, end: Position) -> List[ParseTreeNode]:
+        """Nodos cuyo span cae entero dentro de ``[start, end)``, en preorden."""
+        out = []
+        j = bisect_left(self._starts, start)
+        while j < len(self._nodes) and self._starts[j] < end:
+            node = self._nodes[j]
+            if node.span[1] <= end:
+                out.append(node)
+            j += 1
+        return out
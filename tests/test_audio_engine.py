@@ -0,0 +1,92 @@
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import audio_engine as ae
+
+
+def _tone(seconds, rate, freq=440.0, amp=0.5, channels=2):
+    t = np.arange(int(seconds * rate)) / rate
+    mono = (amp * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+    return np.repeat(mono[:, None], channels, axis=1)
+
+
+@pytest.mark.parametrize("width", [2, 4])
+def test_wav_round_trip(tmp_path, width):
+    data = _tone(0.5, 8000)
+    path = str(tmp_path / "t.wav")
+    ae.save(ae.from_array(data, 8000, chunk=777), path, width)
+    stream = ae.read_wav(path, chunk=1000)
+    assert (stream.rate, stream.channels, stream.frames) == (8000, 2, len(data))
+    assert np.abs(stream.read() - data).max() < 1e-4
+
+
+@pytest.mark.parametrize("width", [2, 4])
+def test_wav_full_scale_round_trip(tmp_path, width):
+    data = np.array([[1.0], [0.5], [-1.0], [2.0], [-2.0]], dtype=np.float32)
+    path = str(tmp_path / "full.wav")
+    ae.write_wav([data], path, 8000, 1, width)
+    out = ae.read_wav(path).read()[:, 0]
+    assert np.allclose(out, [1.0, 0.5, -1.0, 1.0, -1.0], atol=1e-4)
+
+
+def test_read_24_bit(tmp_path):
+    path = str(tmp_path / "t24.wav")
+    values = [0, 1 << 22, -(1 << 22), (1 << 23) - 1]
+    raw = b"".join(v.to_bytes(3, "little", signed=True) for v in values)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(3)
+        wf.setframerate(8000)
+        wf.writeframes(raw)
+    got = ae.read_wav(path).read()[:, 0]
+    assert got == pytest.approx([0.0, 0.5, -0.5, 1.0], abs=1e-6)
+
+
+def test_resample_is_continuous_across_blocks():
+    src = ae.from_array(_tone(1.0, 44100), 44100, chunk=1000)
+    out = ae.conform(src, 48000, 2).read()
+    assert abs(len(out) - 48000) <= 1
+    ref = 0.5 * np.sin(2 * np.pi * 440 * np.arange(len(out)) / 48000)
+    assert np.abs(out[:, 0] - ref).max() < 1e-3
+
+
+def test_channel_conversion():
+    stereo = np.array([[1.0, 0.0], [0.5, 0.5]], np.float32)
+    assert ae.to_channels(stereo, 1)[:, 0].tolist() == [0.5, 0.5]
+    assert ae.to_channels(stereo[:, :1], 2).tolist() == [[1.0, 1.0], [0.5, 0.5]]
+
+
+def test_silencio_keeps_length():
+    out = ae.silencio(ae.from_array(_tone(0.3, 8000), 8000, chunk=100))
+    data = out.read()
+    assert data.shape == (2400, 2) and not data.any()
+
+
+def test_agregar_musica_mixes_and_clips():
+    base = ae.from_array(np.full((1000, 2), 0.8, np.float32), 1000, chunk=64)
+    music = ae.from_array(np.full((300, 1), 0.5, np.float32), 1000, chunk=50)
+    once = ae.agregar_musica(base, music).read()
+    assert once.shape == (1000, 2)
+    assert once[:300].max() == 1.0            # 0.8 + 0.5 se recorta
+    assert np.allclose(once[300:], 0.8)
+    looped = ae.agregar_musica(base, music, music_gain=0.2, loop=True).read()
+    assert np.allclose(looped, 0.9)
+
+
+def test_trim_and_rechunk():
+    data = np.arange(1000, dtype=np.float32)[:, None] / 1000
+    part = ae.trim(ae.from_array(data, 100, chunk=64), 2.5, 7.5)
+    assert part.frames == 500
+    assert part.read()[:, 0].tolist() == pytest.approx(data[250:750, 0].tolist())
+    sizes = [len(b) for b in ae.rechunk(ae.from_array(data, 100, chunk=64), 300)]
+    assert sizes == [300, 300, 300, 100]
+
+
+def test_extraer_audio_requires_track():
+    stream = ae.silence(1.0, 8000)
+    assert ae.extraer_audio(stream) is stream
+    with pytest.raises(ValueError):
+        ae.extraer_audio(object())
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import os
+import tempfile
+
+import daemon
+from daemon import ParseServer
+
+
+def _ask(server, **request):
+    return json.loads(asyncio.run(server.respond(json.dumps(request))))
+
+
+def test_validate_and_reuse_document():
+    server = ParseServer()
+    reply = _ask(server, id=1, op="validate", doc="a", text="main { x = 1; }")
+    assert reply["ok"] and reply["result"]["valid"]
+    reply = _ask(server, id=2, op="validate", doc="a")
+    assert reply["result"]["valid"]
+    reply = _ask(server, id=3, op="parse", doc="b", text="main { x = ; }")
+    assert reply["result"]["syntax_errors"]
+
+
+def test_close_forgets_document():
+    server = ParseServer()
+    _ask(server, id=1, op="tokenize", doc="a", text="main { }")
+    assert _ask(server, id=2, op="close", doc="a")["ok"]
+    assert not _ask(server, id=3, op="validate", doc="a")["ok"]
+
+
+def test_invalid_requests_get_error_replies():
+    server = ParseServer()
+    assert not _ask(server, id=1, op="bogus")["ok"]
+    reply = json.loads(asyncio.run(server.respond("no es json")))
+    assert reply == {"id": None, "ok": False, "error": reply["error"]}
+
+
+def test_unix_socket_survives_oversized_line(monkeypatch):
+    monkeypatch.setattr(daemon, "STREAM_LIMIT", 1024)
+    path = os.path.join(tempfile.mkdtemp(), "d.sock")
+
+    async def scenario():
+        server_task = asyncio.create_task(daemon.serve_unix(ParseServer(), path))
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_unix_connection(path)
+        big = json.dumps({"id": 1, "op": "validate", "text": "main { " + "x = 1; " * 500 + "}"})
+        small = json.dumps({"id": 2, "op": "validate", "text": "main { }"})
+        writer.write((big + "\n" + small + "\n").encode())
+        await writer.drain()
+        first = json.loads(await reader.readline())
+        second = json.loads(await reader.readline())
+        writer.close()
+        server_task.cancel()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert not first["ok"]
+    assert second["id"] == 2 and second["ok"]
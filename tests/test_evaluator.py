@@ -0,0 +1,117 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import media
+from evaluator import EvalError, Preview, evaluate
+
+
+def _frames(n=60, h=8, w=12):
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 255, (n, 3, h, w), dtype=np.uint8)
+
+
+@pytest.fixture
+def clip_dir(tmp_path):
+    media.write_y4m(media.from_frames(_frames(), 30), str(tmp_path / "clip.y4m"))
+    return tmp_path
+
+
+def _run(body, base_dir=".", optimize=True):
+    return evaluate("main {\n" + body + "\n}\n", str(base_dir), optimize)
+
+
+def test_arithmetic_and_control_flow():
+    ev = _run("""
+        int : n = 0;
+        float : f = 7 / 2;
+        string : s = "a" + "b";
+        while (n < 5) { n = n + 1; }
+        if (n == 5 and not (f < 3)) { s = s + "!"; } else { s = "no"; }
+    """)
+    assert ev.env == {"n": 5, "f": 3.0, "s": "ab!"}
+
+
+def test_runtime_errors_have_positions():
+    with pytest.raises(EvalError, match="undefined variable 'y' at line 2"):
+        _run("x = y;")
+    with pytest.raises(EvalError, match="division by zero"):
+        _run("x = 1 / 0;")
+    with pytest.raises(EvalError, match="Unexpected"):
+        _run("x = ;")
+
+
+def test_video_calls_are_lazy_and_exported(clip_dir):
+    ev = _run("""
+        video : v = "clip.y4m";
+        exportar @cortar[@flip[v], 0.5, 1.5] como "out";
+    """, clip_dir)
+    (exp,) = ev.exports
+    assert exp.path == str(clip_dir / "out")
+    clip = exp.value
+    assert (clip.length, clip.width, clip.height) == (30, 12, 8)
+    assert ev.rewrites == ["push_cut"]
+    assert np.array_equal(clip.frame(0), _frames()[15][:, :, ::-1])
+
+
+def _both(clip_dir, expr):
+    body = f'video : v = "clip.y4m";\nexportar {expr} como "o";'
+    plain = _run(body, clip_dir, optimize=False).exports[0].value
+    optimized = _run(body, clip_dir).exports[0].value
+    assert (plain.length, plain.width, plain.height) == \
+        (optimized.length, optimized.width, optimized.height)
+    return plain, optimized
+
+
+@pytest.mark.parametrize("expr", [
+    "@cortar[@resize[@velocidad[v, 2], 6, 4], 0, 1]",
+    "@resize[@flip[@fadein[v, 0.5]], 6, 4]",
+    "@resize[@flip[v], 4, 2]",
+    "@cortar[@cortar[v, 0.5, 1.8], 0.2, 1]",
+])
+def test_planner_rewrites_keep_frames(clip_dir, expr):
+    plain, optimized = _both(clip_dir, expr)
+    for i in range(plain.length):
+        assert np.array_equal(plain.frame(i), optimized.frame(i))
+
+
+def test_merged_speeds_keep_timing(clip_dir):
+    # La fusión evita descartar fotogramas intermedios: mismo tiempo, más detalle.
+    plain, optimized = _both(clip_dir, "@velocidad[@velocidad[v, 2], 0.5]")
+    assert np.array_equal(np.stack(list(optimized.frames())), _frames())
+    assert np.array_equal(plain.frame(1), _frames()[0])
+
+
+def test_call_signature_errors(clip_dir):
+    with pytest.raises(EvalError, match="@resize expects 3 arguments"):
+        _run('video : v = "clip.y4m";\nv = @resize[v, 4];', clip_dir)
+    with pytest.raises(EvalError, match="argument 1 must be video"):
+        _run("x = @flip[3];")
+
+
+def test_preview_runs_on_proxies(clip_dir):
+    body = 'video : v = "clip.y4m";\nexportar @flip[@cortar[v, 0.4, 1.6]] como "o";'
+    full = _run(body, clip_dir).exports[0].value
+    ev = evaluate("main {\n" + body + "\n}\n", str(clip_dir), preview=Preview(0.5, 2))
+    small = ev.exports[0].value
+    assert (small.width, small.height, small.fps, small.length) == (6, 4, 15, 18)
+    assert small.duration == pytest.approx(full.duration)
+    ys, xs = media._nearest(4, 8), media._nearest(6, 12)
+    for i in range(small.length):
+        assert np.array_equal(small.frame(i), full.frame(2 * i)[:, ys][:, :, xs])
+    assert ev.cache.stats.misses == 18
+
+
+def test_preview_rescales_resize(clip_dir):
+    ev = evaluate('main {\nvideo : v = @resize["clip.y4m", 24, 16];\n'
+                  'exportar @fadein[v, 1] como "o";\n}\n',
+                  str(clip_dir), preview=Preview(0.25, 3))
+    clip = ev.exports[0].value
+    assert (clip.width, clip.height, clip.length) == (6, 4, 20)
+
+
+def test_preview_validates_settings():
+    with pytest.raises(ValueError, match="scale"):
+        Preview(0, 2)
+    with pytest.raises(ValueError, match="step"):
+        Preview(0.5, 0)
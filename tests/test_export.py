@@ -0,0 +1,91 @@
+import json
+import os
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import export
+import media
+from evaluator import Preview
+
+PROGRAM = '''main {
+    video : v = "clip.y4m";
+    exportar @cortar[v, 0, 1.5] como "out";
+}
+'''
+
+
+@pytest.fixture
+def clip_dir(tmp_path):
+    rng = np.random.default_rng(2)
+    frames = rng.integers(0, 255, (60, 3, 8, 12), dtype=np.uint8)
+    media.write_y4m(media.from_frames(frames, 30), str(tmp_path / "clip.y4m"))
+    return tmp_path
+
+
+def _export(clip_dir, src=PROGRAM, **kw):
+    kw.setdefault("seconds", 0.5)
+    kw.setdefault("log", lambda msg: None)
+    return export.export_program(src, str(clip_dir), **kw)
+
+
+def test_plan_segments_cover_clip():
+    clip = media.from_frames(np.zeros((45, 3, 2, 2), dtype=np.uint8), 30)
+    segs = export.plan_segments(clip, 48000, 0.5)
+    assert [(s.start, s.stop) for s in segs] == [(0, 15), (15, 30), (30, 45)]
+    assert segs[0].first == 0 and segs[-1].last == 72000
+    assert all(a.last == b.first for a, b in zip(segs, segs[1:]))
+
+
+def test_export_writes_video_and_audio(clip_dir):
+    written = _export(clip_dir)
+    assert written == [str(clip_dir / "out.y4m"), str(clip_dir / "out.wav")]
+    out = media.load(str(clip_dir / "out.y4m"))
+    src = media.load(str(clip_dir / "clip.y4m"))
+    assert out.length == 45
+    assert np.array_equal(out.frame(44), src.frame(44))
+    with wave.open(str(clip_dir / "out.wav"), "rb") as wf:
+        assert wf.getnframes() == 72000
+    assert not (clip_dir / "out.parts").exists()
+
+
+def test_resume_reencodes_only_missing_segments(clip_dir):
+    _export(clip_dir, keep_parts=True)
+    parts = clip_dir / "out.parts"
+    first = (parts / "seg_00001.y4m").stat().st_mtime_ns
+    os.remove(parts / "seg_00002.y4m")
+    messages = []
+    _export(clip_dir, keep_parts=True, log=messages.append)
+    assert "2 de 3 segmentos reutilizados" in messages[0]
+    assert "(1 codificados)" in messages[1]
+    assert (parts / "seg_00001.y4m").stat().st_mtime_ns == first
+    assert media.load(str(clip_dir / "out.y4m")).length == 45
+
+
+def test_changed_program_invalidates_segments(clip_dir):
+    _export(clip_dir, keep_parts=True)
+    messages = []
+    _export(clip_dir, PROGRAM.replace("1.5", "1.4"), keep_parts=True, log=messages.append)
+    assert "(3 codificados)" in messages[0]
+    manifest = json.loads((clip_dir / "out.parts" / export.MANIFEST).read_text())
+    assert sorted(manifest["segments"]) == ["0", "1", "2"]
+
+
+def test_parallel_export_matches_serial(clip_dir):
+    _export(clip_dir)
+    serial = (clip_dir / "out.y4m").read_bytes()
+    _export(clip_dir, workers=2, resume=False)
+    assert (clip_dir / "out.y4m").read_bytes() == serial
+
+
+def test_preview_export_is_small_and_not_reused(clip_dir):
+    _export(clip_dir, keep_parts=True)
+    messages = []
+    _export(clip_dir, keep_parts=True, preview=Preview(0.5, 3), log=messages.append)
+    out = media.load(str(clip_dir / "out.y4m"))
+    assert (out.width, out.height, out.length, out.fps) == (6, 4, 15, 10)
+    assert not any("reutilizados" in m for m in messages)
+    with wave.open(str(clip_dir / "out.wav"), "rb") as wf:
+        assert wf.getnframes() == 72000
@@ -0,0 +1,77 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import media
+from evaluator import evaluate
+from frame_cache import FrameCache
+
+FRAME = 3 * 8 * 12  # bytes de un fotograma 12x8 4:4:4
+
+
+def _frames(n=60):
+    rng = np.random.default_rng(3)
+    return rng.integers(0, 255, (n, 3, 8, 12), dtype=np.uint8)
+
+
+class _Decoder:
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def __call__(self, i):
+        self.calls.append(i)
+        return self.frames[i].copy()
+
+
+def test_lru_eviction_respects_budget():
+    decode = _Decoder(_frames(10))
+    cache = FrameCache(budget=3 * FRAME)
+    for i in (0, 1, 2, 0, 3):       # 0 se vuelve a usar: se expulsa 1
+        cache.get("a", i, decode)
+    assert decode.calls == [0, 1, 2, 3]
+    assert ("a", 1, 2) not in cache and ("a", 0, 1) in cache
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 4, 1)
+    assert stats.bytes == stats.peak_bytes == 3 * FRAME
+    assert stats.hit_rate == pytest.approx(0.2)
+
+
+def test_frames_are_read_only():
+    cache = FrameCache()
+    frame = cache.get("a", 0, _Decoder(_frames(1)))
+    with pytest.raises(ValueError):
+        frame[0, 0, 0] = 1
+
+
+@pytest.mark.parametrize("spill, decodes", [(0, 12), (4 * FRAME, 6)])
+def test_spill_avoids_decoding_again(tmp_path, spill, decodes):
+    frames = _frames(10)
+    decode = _Decoder(frames)
+    cache = FrameCache(budget=2 * FRAME, spill=spill, spill_dir=str(tmp_path))
+    # Dos pasadas sobre 6 fotogramas: sólo caben 2 en memoria, 4 más en el desborde.
+    for _ in range(2):
+        for i in range(6):
+            assert np.array_equal(cache.get("a", i, decode), frames[i])
+    assert len(decode.calls) == decodes
+    assert cache.stats.spill_hits == 12 - decodes
+    cache.close()
+
+
+def test_overlapping_windows_decode_each_frame_once(tmp_path, monkeypatch):
+    media.write_y4m(media.from_frames(_frames(), 30), str(tmp_path / "clip.y4m"))
+    decoded = []
+    read = media.Y4MSource.read
+    monkeypatch.setattr(media.Y4MSource, "read",
+                        lambda self, i: decoded.append(i) or read(self, i))
+    ev = evaluate('''main {
+        video : v = "clip.y4m";
+        exportar @cortar[v, 0, 1.5] como "a";
+        exportar @flip[@cortar[v, 0.5, 2]] como "b";
+        exportar @cortar["clip.y4m", 1, 2] como "c";
+    }''', str(tmp_path))
+    for exp in ev.exports:
+        for _ in exp.value.frames():
+            pass
+    assert sorted(decoded) == list(range(60))
+    assert ev.cache.stats.misses == 60 and ev.cache.stats.hits == 45 + 15
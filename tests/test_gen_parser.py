@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+import generated_parser
+from gen_parser import deep_nesting_samples, grammar_hash, trees_equal, verify
+from lexer import Lexer
+from parse_tree import ParseTreeVisualizer
+
+PROGRAMS = [
+    "main { }",
+    "main { x = 1 + 2 * (3 - y); }",
+    "main { if (a) { x = 1; } else { y = 2; } while (b) { c = 1; } }",
+    "main { v = @flip[@cortar[clip, 1, 2]]; }",
+    'main { exportar @flip[v] como "salida"; if (a) { exportar v como "b"; } }',
+    'main { exportar v "salida"; }',
+    "main { x = ; y = 2; }",
+    "main { x = 1;",
+]
+
+
+@pytest.mark.parametrize("src", PROGRAMS)
+def test_generated_matches_table(src):
+    assert verify(Lexer(src).tokenize())
+
+
+@pytest.mark.parametrize("name", list(deep_nesting_samples(1000)))
+def test_deep_nesting_falls_back(name):
+    src = deep_nesting_samples(1000)[name]
+    tokens = Lexer(src).tokenize()
+    root, errors = generated_parser.parse(tokens)
+    visualizer = ParseTreeVisualizer()
+    assert trees_equal(visualizer.build_tree(list(tokens)), root)
+    assert errors == visualizer.errors == []
+
+
+def test_fuzzed_tokens_match_table():
+    rng = random.Random(0)
+    tokens = Lexer(PROGRAMS[2] + PROGRAMS[3]).tokenize()[:-1]
+    for _ in range(50):
+        mutated = list(tokens)
+        for _ in range(3):
+            i = rng.randrange(len(mutated))
+            if rng.random() < 0.5:
+                del mutated[i]
+            else:
+                mutated.insert(i, rng.choice(tokens))
+        assert verify(mutated)
+
+
+def test_generated_parser_is_up_to_date():
+    # Si falla, la gramática o gen_parser.py cambiaron: ``python gen_parser.py``.
+    assert generated_parser.GRAMMAR_HASH == grammar_hash()
+
+
+def test_driver_can_use_generated_parser(tmp_path, monkeypatch, capsys):
+    import sys
+
+    import gen_parser
+    import parse_tree
+
+    loads = []
+    load = gen_parser.load_parser
+    monkeypatch.setattr(gen_parser, "load_parser", lambda: loads.append(1) or load())
+    prog = tmp_path / "prog.txt"
+    prog.write_text(PROGRAMS[3], encoding="utf-8")
+    monkeypatch.setattr(ParseTreeVisualizer, "visualize", lambda self, root, filename: None)
+    outputs = []
+    for extra in ([], ["--generated"]):
+        monkeypatch.setattr(sys, "argv", ["parse_tree.py", str(prog)] + extra)
+        parse_tree.main()
+        outputs.append(capsys.readouterr().out)
+    assert outputs[0] == outputs[1] and "Árbol de parseo" in outputs[0]
+    assert loads == [1]
@@ -0,0 +1,44 @@
+import argparse
+
+import pytest
+
+import lexer
+from lexer import Lexer, jobs_arg, tokenize_parallel
+
+VALID = """main {
+    int : x = 10;
+    video : v = @cortar[@resize[clip, 1920, 1080], 0, 10];
+    if (x >= 3) { x = x - 1; } else { y = "hola"; } // comentario
+    while (x < 20) { x = x + 2 * (3 + 1); }
+}
+"""
+
+WITH_ERRORS = VALID + """x = "sin cerrar
+/* comentario
+y = 1.2.3;
+z = 3abc;
+@foo $ ! ++
+"""
+
+
+@pytest.mark.parametrize("src", [VALID, WITH_ERRORS, WITH_ERRORS.rstrip("\n"), "", "\n\n", "a"])
+def test_parallel_matches_sequential(monkeypatch, src):
+    monkeypatch.setattr(lexer, "MIN_SHARD_CHARS", 8)
+    seq = Lexer(src)
+    expected = seq.tokenize()
+    tokens, errors = tokenize_parallel(src, 3)
+    assert tokens == expected
+    assert errors == seq.errors
+
+
+def test_shards_keep_real_line_numbers(monkeypatch):
+    monkeypatch.setattr(lexer, "MIN_SHARD_CHARS", 8)
+    src = WITH_ERRORS * 4
+    seq = Lexer(src)
+    assert tokenize_parallel(src, 2) == (seq.tokenize(), seq.errors)
+
+
+def test_jobs_must_not_be_negative():
+    assert jobs_arg("0") == 0
+    with pytest.raises(argparse.ArgumentTypeError):
+        jobs_arg("-1")
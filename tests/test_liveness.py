@@ -0,0 +1,89 @@
+import pytest
+
+from evaluator import evaluate
+from lexer import tokenize
+from liveness import eliminate_dead_code
+from parse_tree import parse
+from planner import source_text
+
+
+def _eliminate(src):
+    tokens, lex_errors = tokenize(src)
+    root, errors = parse(tokens)
+    assert not lex_errors and not errors
+    report = eliminate_dead_code(root)
+    return report, source_text(root)
+
+
+def test_dead_declaration_and_store_are_removed():
+    report, text = _eliminate('''main {
+        video : v = "a.y4m";
+        video : tmp = @resize[v, 640, 360];
+        video : w = @flip[v];
+        w = @fadein[v, 1];
+        exportar w como "out";
+    }''')
+    assert [(r.kind, r.line) for r in report.removed] == [("VarDecl", 4), ("VarDecl", 3)]
+    assert "tmp" not in text and "@flip" not in text and "@fadein" in text
+    assert report.calls == 2 and report.cost > 0
+
+
+def test_loop_carried_variable_stays_live():
+    report, text = _eliminate('''main {
+        int : n = 0;
+        int : acc = 1;
+        int : spare = 0;
+        while (n < 3) { acc = acc * 2; spare = acc; n = n + 1; }
+        exportar acc como "out";
+    }''')
+    assert sorted(r.text for r in report.removed) == ["int : spare = 0", "spare = acc"]
+    assert "acc = acc * 2" in text and "n = n + 1" in text
+
+
+def test_dead_branches_and_whole_statements():
+    report, text = _eliminate('''main {
+        int : x = 1;
+        int : y = 2;
+        if (x > 0) { y = 3; } else { x = 2; }
+        while (x < 0) { y = y - 1; }
+        if (x > 5) { y = 1; }
+        exportar x como "out";
+    }''')
+    kinds = sorted(r.kind for r in report.removed)
+    assert kinds == ["Assignment"] * 3 + ["IfStmt", "VarDecl", "WhileStmt"]
+    # La rama else sigue viva: el if se conserva con su then vacío.
+    assert "if ( x > 0 ) { } else { x = 2 ; }" in text
+    assert "while" not in text and "x > 5" not in text
+
+
+def test_exports_are_always_kept():
+    report, _ = _eliminate('main { exportar "a.y4m" como "out"; }')
+    assert not report.removed and report.format() == "Sin código muerto"
+
+
+def test_elimination_preserves_exports(tmp_path):
+    np = pytest.importorskip("numpy")
+    import media
+    frames = np.random.default_rng(4).integers(0, 255, (6, 3, 8, 12), dtype=np.uint8)
+    media.write_y4m(media.from_frames(frames, 30), str(tmp_path / "clip.y4m"))
+    src = '''main {
+        video : v = "clip.y4m";
+        video : unused = "clip.y4m";
+        int : n = 0;
+        while (n < 3) { v = @flip[v]; unused = @resize[v, 4, 2]; n = n + 1; }
+        exportar v como "out";
+    }'''
+    plain = evaluate(src, str(tmp_path))
+    pruned = evaluate(src, str(tmp_path), eliminate=True)
+    assert len(pruned.removed.removed) == 2 and not plain.removed.removed
+    assert len(pruned.inputs) == 1 and len(plain.inputs) == 2
+    a, b = plain.exports[0].value, pruned.exports[0].value
+    assert np.array_equal(np.stack(list(a.frames())), np.stack(list(b.frames())))
+
+
+def test_deep_dead_call_is_fully_costed():
+    depth = 3000
+    report, _ = _eliminate('main { video : v = "a.y4m"; video : w = '
+                           + "@flip[" * depth + "v" + "]" * depth + '; exportar v como "o"; }')
+    (removed,) = report.removed
+    assert removed.calls == depth and removed.cost == pytest.approx(depth * 1800 * 1920 * 1080)
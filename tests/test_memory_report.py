@@ -0,0 +1,22 @@
+from memory_report import measure_lexer, measure_pipeline
+
+
+def _program(n):
+    return "main {\n" + "".join(f"x{i} = {i} + y;\n" for i in range(n)) + "}\n"
+
+
+def test_pipeline_handles_long_programs():
+    # Cada sentencia anida un StmtList más: 500 superan el límite de recursión.
+    report = measure_pipeline(_program(500))
+    assert [ph.name for ph in report.phases] == ["lex", "parse", "graph"]
+    assert report.tokens == 500 * 6 + 4
+    assert report.nodes > report.tokens
+    assert report.bytes_per_token > 0 and report.bytes_per_node > 0
+    assert "bytes/nodo" in report.format()
+
+
+def test_measure_lexer_reports_errors():
+    tokens, errors, report = measure_lexer("main { x = 1 $ 2; }")
+    assert errors
+    assert report.phase("lex").peak >= report.phase("lex").retained >= 0
+    assert report.tokens == len(tokens)
@@ -0,0 +1,37 @@
+import pytest
+
+import parse_tree
+from gen_parser import trees_equal
+from lexer import Lexer
+from parse_tree import ParseTreeVisualizer, build_tree_parallel, split_top_level
+
+PROGRAMS = [
+    "main { }",
+    "main { x = 1; y = 2; z = 3; }",
+    "main { if (a) { x = 1; } else { y = 2; } w = 1; while (b) { c = 1; } }",
+    "main { if (a) { x = 1; } if (b) { y = 2; } }",
+    # ';' suelto tras un bloque if: la sentencia no parsea desde Stmt
+    "main { if (a) { x = 1; }; y = 2; z = 3; }",
+    # main sin cerrar
+    "main { x = 1; y = 2; z = 3;",
+    "main { x = 1; } y = 2;",
+    "main { x = ; y = 2; z = (1 + 2) * 3; }",
+]
+
+
+@pytest.mark.parametrize("src", PROGRAMS)
+def test_parallel_tree_matches_sequential(monkeypatch, src):
+    monkeypatch.setattr(parse_tree, "MIN_PARALLEL_STMTS", 2)
+    tokens = Lexer(src).tokenize()
+    visualizer = ParseTreeVisualizer()
+    expected = visualizer.build_tree(list(tokens))
+    root, errors = build_tree_parallel(tokens, 2)
+    assert trees_equal(expected, root)
+    assert errors == visualizer.errors
+
+
+def test_split_top_level_boundaries():
+    tokens = Lexer("main { x = 1; if (a) { y = 2; } else { z = 3; } w = 4; }").tokenize()
+    spans = split_top_level(tokens)
+    assert [tokens[a].value for a, _ in spans] == ["x", "if", "w"]
+    assert split_top_level(Lexer("main { x = 1;").tokenize()) is None
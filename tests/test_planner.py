@@ -0,0 +1,76 @@
+import pytest
+
+from lexer import Lexer
+from parse_tree import ParseTreeVisualizer
+from planner import (Call, ClipInfo, Const, Opaque, Planner, Ref, estimate,
+                     optimize_program, to_source)
+
+SOURCES = {"v": ClipInfo(frames=3600, width=3840, height=2160, fps=30.0)}
+
+
+def _results(body, sources=SOURCES):
+    tokens = Lexer("main {\n" + body + "\n}\n").tokenize()
+    visualizer = ParseTreeVisualizer()
+    root = visualizer.build_tree(tokens)
+    assert visualizer.errors == []
+    return optimize_program(root, sources)
+
+
+def _optimized(expr, sources=SOURCES):
+    (res,) = _results(f"x = {expr};", sources)
+    assert res.cost_after <= res.cost_before
+    return to_source(res.optimized)
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("@cortar[@resize[@velocidad[v, 2], 1920, 1080], 0, 10]",
+     "@resize[@velocidad[@cortar[v, 0, 20], 2], 1920, 1080]"),
+    ("@cortar[@flip[v], 5, 6]", "@flip[@cortar[v, 5, 6]]"),
+    ("@cortar[@cortar[v, 10, 50], 2, 5]", "@cortar[v, 12, 15]"),
+    ("@cortar[@cortar[v, 10, 12], 0, 30]", "@cortar[v, 10, 12]"),
+    ("@velocidad[@velocidad[v, 2], 1.5]", "@velocidad[v, 3]"),
+    ("@velocidad[@velocidad[v, 2], 0.5]", "v"),
+    ("@resize[@flip[@fadein[v, 2]], 640, 360]", "@flip[@fadein[@resize[v, 640, 360], 2]]"),
+])
+def test_rewrites(expr, expected):
+    assert _optimized(expr) == expected
+
+
+def test_upscale_is_not_pushed_down():
+    assert _optimized("@resize[@flip[v], 7680, 4320]") == "@resize[@flip[v], 7680, 4320]"
+
+
+def test_fades_and_music_block_cuts():
+    assert _optimized("@cortar[@fadeout[v, 2], 0, 5]") == "@cortar[@fadeout[v, 2], 0, 5]"
+    assert _optimized("@cortar[@agregar_musica[v, m], 0, 5]") == "@cortar[@agregar_musica[v, m], 0, 5]"
+
+
+def test_non_constant_arguments_are_kept():
+    assert _optimized("@cortar[@velocidad[v, k], 0, 5]") == "@cortar[@velocidad[v, k], 0, 5]"
+    assert _optimized("@cortar[@flip[v], 1 + 1, 5]") == "@cortar[@flip[v], 1 + 1, 5]"
+
+
+def test_assignments_feed_later_sources():
+    first, second = _results("a = @cortar[@flip[v], 0, 10];\nb = @resize[a, 640, 360];")
+    assert first.target == "a"
+    assert second.cost_before == pytest.approx(300 * 3840 * 2160)
+
+
+def test_cost_model():
+    plan = Call("cortar", (Call("flip", (Ref("v"),)), Const(0), Const(10)))
+    info, cost = estimate(plan, SOURCES)
+    assert info.frames == 300
+    assert cost == 3600 * 3840 * 2160 + 300 * 3840 * 2160
+    res = Planner(SOURCES).optimize(plan)
+    assert res.rewrites == ["push_cut"]
+    assert res.saving == pytest.approx(1 - 600 / 3900)
+    assert estimate(Opaque("x + 1"), SOURCES)[1] == 0
+
+
+def test_deep_nesting_is_costed_and_reported():
+    depth = 3000
+    (res,) = _results("x = " + "@flip[" * depth + "(((-2)))" + "]" * depth + ";")
+    assert res.skipped and res.optimized is res.original and not res.rewrites
+    assert res.cost_before == res.cost_after == pytest.approx(depth * 1800 * 1920 * 1080)
+    assert to_source(res.original).count("@flip[") == depth
+    assert to_source(res.original).startswith("@flip[@flip[") and "-2]" in to_source(res.original)
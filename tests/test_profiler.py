@@ -0,0 +1,96 @@
+import json
+import sys
+
+import pytest
+
+import profiler
+from enums import TokenType
+from gen_parser import trees_equal
+from grammar_def import EPSILON
+from lexer import Lexer
+from parse_tree import parse
+from program_gen import GenConfig, ProgramGenerator
+
+SRC = '''main {
+    // comentario
+    video : v = "clip.y4m";
+    int : n = 0;
+    while (n <= 2) { v = @flip[v]; n = n + 1; }
+    if (n == 3) { exportar v como "out"; }
+}
+'''
+
+
+def _nodes(root):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_profile_matches_tree(seed):
+    src = " ".join(ProgramGenerator(GenConfig(statements=20, seed=seed)).tokens())
+    grammar = profiler.GrammarProfile()
+    tokens = Lexer(src).tokenize()
+    root, errors = parse(tokens, profile=grammar)
+    assert not errors
+    assert trees_equal(root, parse(tokens)[0])
+    nonterminals = [n for n in _nodes(root)
+                    if n.children and n.token is None and n.children[0].token is None]
+    assert grammar.total == len(nonterminals) == sum(grammar.stacks.values())
+    assert sum(grammar.epsilon.values()) == sum(n.label == EPSILON for n in _nodes(root))
+    assert all(path.startswith("Program") for path in grammar.stacks)
+    assert not any("StmtList;StmtList" in path for path in grammar.stacks)
+
+
+def test_recovery_is_counted():
+    grammar = profiler.GrammarProfile()
+    _, errors = parse(Lexer("main { x = 1 $ 2; } y").tokenize(), profile=grammar)
+    skipped = sum(grammar.skipped.values())
+    missing = sum(grammar.absent.values())
+    assert skipped + missing == len(errors) > 0
+    assert (("Program", TokenType.IDENTIFIER) in grammar.skipped
+            or (TokenType.EOF, TokenType.IDENTIFIER) in grammar.absent)
+
+
+def test_lexer_branches():
+    lexer = profiler.ProfilingLexer(SRC)
+    assert lexer.tokenize() == Lexer(SRC).tokenize()
+    calls = {name: b.calls for name, b in lexer.branches.items()}
+    assert calls["comment"] == 1 and calls["video_function"] == 1
+    assert calls["identifier"] == 16 and calls["string"] == 2
+    # Sólo ``<=`` y ``==`` son compuestos; los demás símbolos van aparte.
+    assert calls["compound_op"] == 2
+    assert calls["symbol"] == sum(tok.value in "{}();:=<[],+" for tok in Lexer(SRC).tokenize()
+                                  if len(tok.value) == 1)
+
+
+def test_summary_and_stacks():
+    profile = profiler.profile_source(SRC)
+    summary = json.loads(json.dumps(profile.summary()))
+    assert summary["tokens"] == len(Lexer(SRC).tokenize()) and not summary["errors"]
+    counts = [p["count"] for p in summary["productions"]]
+    assert counts == sorted(counts, reverse=True) and sum(counts) == summary["expansions"]
+    assert {"nonterminal": "Program", "lookahead": "MAIN", "count": 1} in summary["productions"]
+    branches = summary["lexer"]["branches"]
+    assert sum(b["seconds"] for b in branches.values()) <= summary["lexer"]["seconds"]
+    for line in profile.parse_stacks() + profile.lex_stacks():
+        frames, value = line.rsplit(" ", 1)
+        assert frames and int(value) >= 0
+    assert sum(int(l.rsplit(" ", 1)[1]) for l in profile.parse_stacks()) == summary["expansions"]
+
+
+def test_cli_writes_outputs(tmp_path, monkeypatch, capsys):
+    prog = tmp_path / "prog.txt"
+    prog.write_text(SRC, encoding="utf-8")
+    out = {name: tmp_path / name for name in ("p.json", "p.folded", "l.folded")}
+    monkeypatch.setattr(sys, "argv", ["profiler.py", str(prog), "--json", str(out["p.json"]),
+                                      "--stacks", str(out["p.folded"]),
+                                      "--lex-stacks", str(out["l.folded"])])
+    profiler.main()
+    assert "PERFIL" in capsys.readouterr().out
+    assert json.loads(out["p.json"].read_text())["expansions"] > 0
+    assert out["p.folded"].read_text().startswith("Program")
+    assert all(l.startswith("lexer;") for l in out["l.folded"].read_text().splitlines())
@@ -0,0 +1,40 @@
+import pytest
+
+from lexer import Lexer
+from parse_tree import ParseTreeVisualizer
+from program_gen import GenConfig, ProgramGenerator, depth_probe, growth_exponent, mutate
+
+
+def _check(src):
+    lexer = Lexer(src)
+    tokens = lexer.tokenize()
+    visualizer = ParseTreeVisualizer()
+    visualizer.build_tree(tokens)
+    return lexer.errors, visualizer.errors
+
+
+@pytest.mark.parametrize("statements", [1, 10, 100, 400])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_generated_programs_are_valid(statements, seed):
+    src = ProgramGenerator(GenConfig(statements=statements, seed=seed)).program()
+    assert _check(src) == ([], [])
+
+
+def test_size_grows_with_statements():
+    sizes = [len(ProgramGenerator(GenConfig(statements=n, seed=3)).tokens()) for n in (50, 200)]
+    assert sizes[1] > 2 * sizes[0]
+
+
+def test_mutate_injects_errors():
+    lexemes = ProgramGenerator(GenConfig(statements=30, seed=4)).tokens()
+    lex_errors, syntax_errors = _check(mutate(lexemes, 5, seed=4))
+    assert lex_errors or syntax_errors
+
+
+def test_growth_exponent():
+    assert growth_exponent([1, 2, 4, 8], [3, 6, 12, 24]) == pytest.approx(1.0)
+    assert growth_exponent([1, 2, 4, 8], [1, 4, 16, 64]) == pytest.approx(2.0)
+
+
+def test_depth_probe_finds_no_recursion_failures():
+    assert all(v is None for v in depth_probe(1000, step=500).values())
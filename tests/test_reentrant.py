@@ -0,0 +1,85 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from enums import KEYWORDS, Token, TokenType
+from gen_parser import trees_equal
+from grammar_def import PARSING_TABLE
+from lexer import tokenize
+from parse_tree import ParseTreeVisualizer, parse
+from program_gen import GenConfig, ProgramGenerator, mutate
+
+THREADS = 16
+
+
+def _programs(count=48):
+    out = []
+    for seed in range(count):
+        lexemes = ProgramGenerator(GenConfig(statements=20, seed=seed)).tokens()
+        out.append(mutate(lexemes, 3, seed) if seed % 3 == 0 else " ".join(lexemes))
+    return out
+
+
+def _pipeline(src):
+    tokens, lex_errors = tokenize(src)
+    root, errors = parse(tokens)
+    return root, lex_errors, errors
+
+
+@pytest.fixture
+def fast_switching():
+    # Cambios de hilo frecuentes para que, con GIL, los parseos se intercalen.
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(old)
+
+
+def test_concurrent_parses_match_sequential(fast_switching):
+    programs = _programs()
+    expected = [_pipeline(src) for src in programs]
+    work = programs * 4
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(_pipeline, work))
+    for k, (root, lex_errors, errors) in enumerate(results):
+        want_root, want_lex, want_errors = expected[k % len(programs)]
+        assert trees_equal(root, want_root)
+        assert (lex_errors, errors) == (want_lex, want_errors)
+
+
+def test_parse_does_not_mutate_tokens():
+    tokens = [Token(TokenType.MAIN, "main", 1, 1), Token(TokenType.LBRACE, "{", 1, 6)]
+    snapshot = list(tokens)
+    root, errors = parse(tokens)
+    assert tokens == snapshot
+    assert errors[-1] == "Expected RBRACE but found EOF at line 1, column 6"
+    ParseTreeVisualizer().build_tree(tokens)
+    assert tokens == snapshot
+
+
+def test_build_tree_matches_parse():
+    tokens, _ = tokenize("main { if (a) { x = 1; } else { y = @flip[v]; } }")
+    visualizer = ParseTreeVisualizer()
+    root = visualizer.build_tree(tokens)
+    assert trees_equal(root, parse(tokens)[0])
+    assert visualizer.node_counter == max(n.id for n in _walk(root))
+
+
+def _walk(node):
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        yield cur
+        stack.extend(cur.children)
+
+
+def test_shared_tables_are_read_only():
+    with pytest.raises(TypeError):
+        PARSING_TABLE["Program"] = {}
+    with pytest.raises(TypeError):
+        PARSING_TABLE["Program"][TokenType.MAIN] = []
+    with pytest.raises(AttributeError):
+        PARSING_TABLE["Program"][TokenType.MAIN].append(TokenType.EOF)
+    with pytest.raises(TypeError):
+        KEYWORDS["nuevo"] = TokenType.IDENTIFIER
@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import pytest
+
+from daemon import ParseServer
+from lexer import Lexer
+from parse_tree import parse
+from planner import source_text
+from program_gen import GenConfig, ProgramGenerator
+from span_index import SpanIndex
+
+SRC = '''main {
+    video : v = "clip.y4m";
+    if (1 < 2) {
+        v = @flip[v];
+    }
+    exportar v como "out";
+}
+'''
+
+
+def _index(src=SRC):
+    root, errors = parse(Lexer(src).tokenize())
+    assert not errors
+    return root, SpanIndex(root, src)
+
+
+def _walk(root):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+def test_spans_cover_their_tokens():
+    root, index = _index()
+    assert root.span == ((1, 1), (7, 2))
+    for node in _walk(root):
+        spans = [c.span for c in node.children if c.span]
+        if spans:
+            assert node.span == (spans[0][0], spans[-1][1])
+    assert all(a.span[0] <= b.span[0] for a, b in zip(index._nodes, index._nodes[1:]))
+
+
+def test_node_at_position_and_offset():
+    _, index = _index()
+    node = index.node_at(4, 14)                   # la "f" de "@flip"
+    assert node.token.value == "@flip"
+    stmt = index.node_at(4, 14, label="Stmt")
+    assert source_text(stmt) == "v = @flip [ v ] ;"
+    assert index.node_at_offset(SRC.index("@flip") + 2) is node
+    # Entre tokens: el nodo más interno que abarca la posición.
+    assert index.node_at(3, 15).label == "IfStmt"
+    assert index.node_at(1, 1).token.value == "main"
+    assert index.node_at(0, 5) is None and index.node_at(9, 1) is None
+
+
+def test_nodes_in_range():
+    _, index = _index()
+    labels = [n.label for n in index.nodes_in_range((4, 1), (5, 1))]
+    assert labels[:2] == ["StmtList", "Stmt"] and "FunctionCall" in labels
+    assert all((4, 1) <= n.span[0] and n.span[1] <= (5, 1)
+               for n in index.nodes_in_range((4, 1), (5, 1)))
+    assert index.nodes_in_range((8, 1), (9, 1)) == []
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_index_matches_linear_scan(seed):
+    src = "\n".join(ProgramGenerator(GenConfig(statements=40, seed=seed)).tokens())
+    root, index = _index(src)
+    leaves = [n for n in _walk(root) if n.span and n.token is not None]
+    for leaf in leaves[::7]:
+        line, col = leaf.span[0]
+        assert index.node_at(line, col) is leaf
+        expected = [n for n in _walk(root) if n.span and (line, 1) <= n.span[0]
+                    and n.span[1] <= (line + 3, 1)]
+        got = index.nodes_in_range((line, 1), (line + 3, 1))
+        assert sorted(map(id, got)) == sorted(map(id, expected))
+
+
+def test_offset_needs_text():
+    root, _ = parse(Lexer("main { }").tokenize())
+    with pytest.raises(ValueError):
+        SpanIndex(root).node_at_offset(0)
+
+
+def test_daemon_at():
+    server = ParseServer()
+
+    def ask(**request):
+        return json.loads(asyncio.run(server.respond(json.dumps(request))))["result"]
+
+    reply = ask(id=1, op="at", doc="a", text=SRC, line=4, column=14)
+    assert reply["node"]["token"][:2] == ["VIDEO_FLIP", "@flip"]
+    assert reply["statement"]["span"] == [[4, 9], [4, 22]]
+    assert ask(id=2, op="at", doc="a", offset=SRC.index("exportar"))["statement"]["label"] == "Stmt"
@@ -0,0 +1,77 @@
+import pytest
+
+from enums import Token, TokenType
+from gen_parser import trees_equal
+from lexer import Lexer
+from memory_report import measure_pipeline, measure_streaming
+from parse_tree import parse
+from program_gen import GenConfig, ProgramGenerator, mutate
+
+
+def _sources():
+    out = ["", "main { }", "main { x = 1 $ 2; } y", "main { if (a) { x = 1; }"]
+    for seed in range(6):
+        lexemes = ProgramGenerator(GenConfig(statements=15, seed=seed)).tokens()
+        out.append(" ".join(lexemes))
+        out.append(mutate(lexemes, 4, seed))
+    return out
+
+
+SOURCES = _sources()
+
+
+@pytest.mark.parametrize("src", SOURCES, ids=range(len(SOURCES)))
+def test_iter_tokens_matches_tokenize(src):
+    lexer = Lexer(src)
+    streamed = list(lexer.iter_tokens())
+    batch = Lexer(src)
+    assert streamed == batch.tokenize()
+    assert lexer.errors == batch.errors
+
+
+@pytest.mark.parametrize("src", SOURCES, ids=range(len(SOURCES)))
+def test_parse_from_iterator_matches_list(src):
+    tokens = Lexer(src).tokenize()
+    expected, errors = parse(tokens)
+    root, stream_errors = parse(Lexer(src).iter_tokens())
+    assert trees_equal(root, expected) and stream_errors == errors
+
+
+def test_missing_eof_is_synthesized():
+    tokens = [Token(TokenType.MAIN, "main", 3, 1), Token(TokenType.LBRACE, "{", 3, 6)]
+    root, errors = parse(iter(tokens))
+    assert (root, errors) == parse(tokens)
+    assert errors[-1] == "Expected RBRACE but found EOF at line 3, column 6"
+    _, errors = parse(iter(()))
+    assert errors == ["Unexpected EOF '' in Program at line 0, column 0"]
+
+
+def test_parser_pulls_one_token_ahead():
+    # Cuando el parser pide un token, todos los anteriores ya están en el árbol.
+    src = "main { int : x = 1; x = x + 2; }"
+    pulled = []
+
+    def tokens():
+        for tok in Lexer(src).iter_tokens():
+            pulled.append(tok)
+            yield tok
+
+    root, errors = parse(tokens())
+    assert not errors
+    leaves = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.token is not None:
+            leaves.append(node.token)
+        stack.extend(reversed(node.children))
+    assert leaves == pulled
+
+
+def test_streaming_retains_only_the_tree():
+    src = "main {\n" + "".join(f"x{i} = {i} + y;\n" for i in range(300)) + "}\n"
+    stream = measure_streaming(src)
+    batch = measure_pipeline(src, graph=False)
+    assert (stream.tokens, stream.nodes) == (batch.tokens, batch.nodes)
+    assert stream.phase("stream").retained < (batch.phase("lex").retained
+                                              + batch.phase("parse").retained)
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from lexer import Lexer
+from parse_tree import ParseTreeVisualizer
+from gen_parser import trees_equal
+from token_stream import TokenStream, cached_tokenize, dump_tokens, load_tokens
+
+SRC = 'main {\n    video : v = @cortar[clip, 0, 10];\n    x = "ñandú" $ 1.2.3;\n}\n'
+
+
+@pytest.fixture
+def tok_file(tmp_path):
+    lexer = Lexer(SRC)
+    tokens = lexer.tokenize()
+    path = str(tmp_path / "prog.tok")
+    dump_tokens(path, tokens, lexer.errors, SRC)
+    return path, tokens, lexer.errors
+
+
+def test_round_trip(tok_file):
+    path, tokens, errors = tok_file
+    with load_tokens(path, SRC) as stream:
+        assert list(stream) == tokens
+        assert stream.errors == errors
+        assert stream[-1] == tokens[-1]
+        assert stream[1:3] == tokens[1:3]
+        visualizer = ParseTreeVisualizer()
+        assert trees_equal(visualizer.build_tree(list(tokens)), visualizer.build_tree(stream))
+
+
+def test_stale_source_is_rejected(tok_file):
+    path, _, _ = tok_file
+    assert load_tokens(path, SRC + " ") is None
+
+
+@pytest.mark.parametrize("cut", [1, 3, 7, 40, 200])
+def test_truncated_file_is_rejected(tok_file, cut):
+    path, tokens, errors = tok_file
+    data = open(path, 'rb').read()
+    with open(path, 'wb') as fh:
+        fh.write(data[:-cut])
+    with pytest.raises(ValueError):
+        TokenStream(path)
+    assert load_tokens(path) is None
+    # cached_tokenize vuelve a tokenizar y reescribe el archivo
+    again, again_errors = cached_tokenize(SRC, path)
+    assert list(again) == tokens and again_errors == errors
+    with load_tokens(path, SRC) as stream:
+        assert list(stream) == tokens
+
+
+def test_garbage_file_is_rejected(tmp_path):
+    path = str(tmp_path / "x.tok")
+    for data in (b"", b"xx", b"VTOK" + b"\0" * 100):
+        with open(path, 'wb') as fh:
+            fh.write(data)
+        assert load_tokens(path) is None
+
+
+def test_dump_leaves_no_temporary_files(tok_file):
+    path, _, _ = tok_file
+    assert os.listdir(os.path.dirname(path)) == ["prog.tok"]
+
+
+def test_parse_tree_driver_reuses_tokens(tmp_path, monkeypatch, capsys):
+    import sys
+
+    import parse_tree
+
+    prog = tmp_path / "prog.txt"
+    prog.write_text("main { int : x = 1; while (x < 3) { x = x + 1; } }", encoding="utf-8")
+    monkeypatch.setattr(ParseTreeVisualizer, "visualize", lambda self, root, filename: None)
+
+    def run(*extra):
+        monkeypatch.setattr(sys, "argv", ["parse_tree.py", str(prog)] + list(extra))
+        parse_tree.main()
+        return capsys.readouterr().out
+
+    plain = run()
+    assert run("--tokens") == plain
+    assert (tmp_path / "prog.tok").exists()
+    # La segunda vez los tokens salen del .tok, sin pasar por el lexer.
+    monkeypatch.setattr(Lexer, "iter_tokens", lambda self: pytest.fail("lexer called"))
+    assert run("--tokens") == plain
+    assert run("--tokens", str(tmp_path / "prog.tok"), "--jobs", "2") == plain
@@ -0,0 +1,80 @@
+import pytest
+
+from enums import TokenType
+from lexer import Lexer
+from parse_tree import ParseTreeVisualizer, parse
+from planner import source_text
+from program_gen import GenConfig, ProgramGenerator
+from tree_index import TreeIndex
+
+SRC = '''main {
+    video : a = "a.y4m";
+    video : b = @concatenar[a, @flip[a]];
+    int : n = 0;
+    while (n < 2) { b = @concatenar[b, a]; n = n + 1; }
+    while (n > 0) { n = n - 1; }
+    exportar b como "out";
+}
+'''
+
+
+def _walk(node):
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        yield cur
+        stack.extend(reversed(cur.children))
+
+
+def _build(src=SRC):
+    visualizer = ParseTreeVisualizer()
+    root = visualizer.build_tree(Lexer(src).tokenize(), index=True)
+    assert not visualizer.errors
+    return root, visualizer.index
+
+
+def test_build_tree_index_is_opt_in():
+    visualizer = ParseTreeVisualizer()
+    visualizer.build_tree(Lexer(SRC).tokenize())
+    assert visualizer.index is None
+    root, index = _build()
+    assert index.root is root and len(index) == sum(1 for _ in _walk(root))
+
+
+def test_queries():
+    root, index = _build()
+    calls = [index.ancestor(t, "FunctionCall") for t in index.nodes(TokenType.VIDEO_CONCATENAR)]
+    assert [source_text(c) for c in calls] == ["@concatenar [ a , @flip [ a ] ]",
+                                               "@concatenar [ b , a ]"]
+    loops = [w for w in index.nodes("WhileStmt") if index.contains(w, "FunctionCall")]
+    assert [source_text(w.children[2]) for w in loops] == ["n < 2"]
+    outer = calls[0]
+    assert [source_text(c) for c in index.descendants_of_type(outer, "FunctionCall")] \
+        == ["@flip [ a ]"]
+    assert len(index.descendants_of_type(root, TokenType.IDENTIFIER, "a")) == 4
+    assert index.nodes(TokenType.IDENTIFIER, "zzz") == []
+    stmt = index.ancestor(index.nodes(TokenType.VIDEO_FLIP)[0], "Stmt")
+    assert index.is_ancestor(stmt, outer) and not index.is_ancestor(outer, stmt)
+    assert list(index.ancestors(root)) == [] and index.parent(root) is None
+
+
+def test_errors():
+    root, index = _build()
+    with pytest.raises(ValueError):
+        index.nodes("FunctionCall", "x")
+    other, _ = parse(Lexer("main { }").tokenize())
+    with pytest.raises(ValueError):
+        index.ancestors(other).__next__()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_index_matches_traversal(seed):
+    src = " ".join(ProgramGenerator(GenConfig(statements=30, seed=seed)).tokens())
+    root, index = _build(src)
+    for node in list(_walk(root))[::11]:
+        for key in ("FunctionCall", "Expr", TokenType.IDENTIFIER):
+            expected = [d for d in list(_walk(node))[1:]
+                        if d.label == key or (d.token is not None and d.token.type == key)]
+            assert index.descendants_of_type(node, key) == expected
+        for child in node.children:
+            assert index.parent(child) is node
@@ -0,0 +1,256 @@
+"""Formato binario ``.tok`` para persistir la salida del lexer.
+
+Permite guardar los tokens de un archivo fuente y recargarlos sin volver a
+tokenizar. El archivo se abre con ``mmap`` y los arreglos se exponen como
+vistas de memoria, así que cargarlo no recorre los tokens: cada ``Token``
+se construye sólo cuando se pide.
+
+Estructura (little-endian, arreglos alineados a 4 bytes)::
+
+    cabecera   magic, versión de formato, LEXER_VERSION, sha256 del fuente,
+               nº de tokens, nº de errores, tamaño de la tabla de cadenas
+    tipos      uint8  x N        índice del TokenType
+    offsets    uint32 x (N+1)    inicio de cada lexema en la tabla
+    líneas     uint32 x N
+    columnas   uint32 x N
+    errores    uint32 x (E+1)    inicio de cada mensaje de error
+    cadenas    UTF-8             lexemas seguidos de los mensajes de error
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from enums import Token, TokenType
+from lexer import Lexer, LEXER_VERSION
+
+MAGIC = b"VTOK"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHH32sIII")
+
+# Códigos de tipo: posición del miembro dentro de TokenType.
+_TYPES: Tuple[TokenType, ...] = tuple(TokenType)
+_CODES = {tt: code for code, tt in enumerate(_TYPES)}
+
+
+def source_digest(source: str) -> bytes:
+    """Hash del texto fuente que identifica a qué archivo pertenecen los tokens."""
+    return hashlib.sha256(source.encode('utf-8')).digest()
+
+
+def _pad(n: int) -> int:
+    return (-n) % 4
+
+
+def _le_bytes(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def dump_tokens(path: str, tokens: Sequence[Token], errors: List[str], source: str) -> None:
+    """Escribe ``tokens`` y ``errors`` (salida de ``Lexer``) en ``path``."""
+    strtab = bytearray()
+    offsets = array('I', [0])
+    for tok in tokens:
+        strtab += tok.value.encode('utf-8')
+        offsets.append(len(strtab))
+    err_offsets = array('I', [len(strtab)])
+    for err in errors:
+        strtab += err.encode('utf-8')
+        err_offsets.append(len(strtab))
+
+    types = bytes(_CODES[tok.type] for tok in tokens)
+    lines = array('I', [tok.line for tok in tokens])
+    columns = array('I', [tok.column for tok in tokens])
+
+    # Se escribe en un temporal y se reemplaza de una vez: truncar en sitio
+    # un archivo que otro proceso tiene mapeado puede matarlo con SIGBUS.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tok.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(_HEADER.pack(MAGIC, FORMAT_VERSION, LEXER_VERSION,
+                                  source_digest(source), len(tokens), len(errors),
+                                  len(strtab)))
+            fh.write(types + b"\0" * _pad(len(types)))
+            fh.write(_le_bytes(offsets))
+            fh.write(_le_bytes(lines))
+            fh.write(_le_bytes(columns))
+            fh.write(_le_bytes(err_offsets))
+            fh.write(strtab)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class TokenStream(Sequence):
+    """Secuencia de tokens respaldada por un archivo ``.tok`` mapeado.
+
+    Se comporta como la lista que devuelve ``Lexer.tokenize`` (índices
+    negativos y ``len`` incluidos), por lo que puede pasarse directamente a
+    ``ParseTreeVisualizer.build_tree``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío
+            self._file.close()
+            raise ValueError(f"'{path}' is not a token file")
+        self._view = view = memoryview(self._map)
+        if len(view) < _HEADER.size:
+            self.close()
+            raise ValueError(f"'{path}' is not a token file")
+        (magic, fmt, self.lexer_version, self.digest,
+         n, n_errors, str_size) = _HEADER.unpack_from(view)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a token file (format {FORMAT_VERSION})")
+        expected = (_HEADER.size + n + _pad(n) + 4 * (n + 1) + 8 * n
+                    + 4 * (n_errors + 1) + str_size)
+        if expected != len(view):
+            self.close()
+            raise ValueError(f"'{path}' is truncated or corrupt "
+                             f"({len(view)} bytes, expected {expected})")
+
+        pos = _HEADER.size
+        self._types = view[pos:pos + n]
+        pos += n + _pad(n)
+        self._offsets = self._words(view, pos, n + 1)
+        pos += 4 * (n + 1)
+        self._lines = self._words(view, pos, n)
+        pos += 4 * n
+        self._columns = self._words(view, pos, n)
+        pos += 4 * n
+        self._err_offsets = self._words(view, pos, n_errors + 1)
+        pos += 4 * (n_errors + 1)
+        self._strings = view[pos:pos + str_size]
+        self._len = n
+        self._n_errors = n_errors
+        if self._offsets[n] != self._err_offsets[0] or self._err_offsets[n_errors] != str_size:
+            self.close()
+            raise ValueError(f"'{path}' has inconsistent string offsets")
+
+    @staticmethod
+    def _words(view: memoryview, pos: int, count: int) -> Union[memoryview, array]:
+        raw = view[pos:pos + 4 * count]
+        if sys.byteorder == 'little':
+            return raw.cast('I')
+        words = array('I', raw.tobytes())
+        words.byteswap()
+        return words
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _token(self, i: int) -> Token:
+        value = bytes(self._strings[self._offsets[i]:self._offsets[i + 1]]).decode('utf-8')
+        return Token(_TYPES[self._types[i]], value, self._lines[i], self._columns[i])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._token(i) for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("token index out of range")
+        return self._token(index)
+
+    def __iter__(self) -> Iterator[Token]:
+        for i in range(self._len):
+            yield self._token(i)
+
+    @property
+    def errors(self) -> List[str]:
+        """Errores léxicos registrados junto con los tokens."""
+        offs = self._err_offsets
+        return [bytes(self._strings[offs[k]:offs[k + 1]]).decode('utf-8')
+                for k in range(self._n_errors)]
+
+    def matches(self, source: str) -> bool:
+        """Indica si los tokens corresponden a ``source`` y al lexer actual."""
+        return self.lexer_version == LEXER_VERSION and self.digest == source_digest(source)
+
+    def close(self) -> None:
+        for name in ('_types', '_offsets', '_lines', '_columns',
+                     '_err_offsets', '_strings', '_view'):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> 'TokenStream':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_tokens(path: str, source: Optional[str] = None) -> Optional[TokenStream]:
+    """Abre ``path``; con ``source`` devuelve ``None`` si está desactualizado."""
+    try:
+        stream = TokenStream(path)
+    except (FileNotFoundError, ValueError):
+        return None
+    if source is not None and not stream.matches(source):
+        stream.close()
+        return None
+    return stream
+
+
+def cached_tokenize(source: str, path: str) -> Tuple[Sequence[Token], List[str]]:
+    """Devuelve ``(tokens, errores)`` desde ``path`` o tokeniza y lo guarda."""
+    stream = load_tokens(path, source)
+    if stream is not None:
+        return stream, stream.errors
+    lexer = Lexer(source)
+    tokens = lexer.tokenize()
+    dump_tokens(path, tokens, lexer.errors, source)
+    return tokens, lexer.errors
+
+
+def main() -> None:
+    """``python token_stream.py <archivo.txt>`` genera ``<archivo>.tok``."""
+    ap = argparse.ArgumentParser(usage="python token_stream.py <archivo.txt> [-o salida.tok] [--show]")
+    ap.add_argument("archivo")
+    ap.add_argument("-o", "--output", help="ruta del .tok (por defecto junto al fuente)")
+    ap.add_argument("--show", action="store_true", help="imprime los tokens guardados")
+    args = ap.parse_args()
+
+    ruta = args.archivo
+    try:
+        src = open(ruta, encoding='utf-8').read()
+    except FileNotFoundError:
+        print(f"Error: no existe '{ruta}'")
+        return
+    out = args.output or ruta.rsplit('.', 1)[0] + '.tok'
+    tokens = load_tokens(out, src)
+    if tokens is not None:
+        errors = tokens.errors
+        print(f"{len(tokens)} tokens reutilizados de {out}")
+    else:
+        tokens, errors = cached_tokenize(src, out)
+        print(f"{len(tokens)} tokens guardados en {out}")
+    if args.show:
+        for t in tokens:
+            print(f"{t.type.name:15} [ {t.value} ] -> {t.line}:{t.column}")
+        for err in errors:
+            print(err)
+    if isinstance(tokens, TokenStream):
+        tokens.close()
+
+
+if __name__ == '__main__':
+    main()
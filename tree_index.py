@@ -0,0 +1,123 @@
+"""Índice secundario de un árbol de parseo por etiqueta y tipo de token.
+
+Preguntas como "todas las llamadas ``@concatenar``" o "cada ``while`` que
+contiene una llamada de video" obligan a recorrer el árbol entero cada vez.
+``TreeIndex`` lo recorre una sola vez, en preorden, y guarda:
+
+* la posición en preorden de cada nodo y la del final de su subárbol, de
+  modo que los descendientes de un nodo ocupan un rango contiguo;
+* el padre de cada nodo;
+* por cada etiqueta de la gramática (``"FunctionCall"``, ``"WhileStmt"``,
+  ``"VIDEO_FLIP"``...), por cada ``TokenType`` y por cada par
+  ``(TokenType, valor)``, la lista ordenada de posiciones.
+
+Así ``descendants_of_type`` es una búsqueda binaria en esa lista más la
+salida, y ``ancestors`` sigue los punteros al padre::
+
+    index = TreeIndex(root)        # o ParseTreeVisualizer().build_tree(..., index=True)
+    calls = [index.ancestor(t, "FunctionCall")
+             for t in index.nodes(TokenType.VIDEO_CONCATENAR)]
+    loops = [w for w in index.nodes("WhileStmt") if index.contains(w, "FunctionCall")]
+
+Las claves de texto son las etiquetas de los nodos; un ``TokenType``
+selecciona las hojas que llevan un token de ese tipo. El índice describe
+el árbol tal como estaba al construirlo.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from enums import TokenType
+
+Key = Union[str, TokenType]
+
+
+class TreeIndex:
+    """Posiciones en preorden, padres y listas por etiqueta y tipo de token."""
+
+    def __init__(self, root) -> None:
+        self.root = root
+        self.nodes_in_order: List = []
+        self._pos: Dict[int, int] = {}          # id(nodo) → posición en preorden
+        self._parent: List[int] = []            # posición del padre (-1 en la raíz)
+        self._end: List[int] = []               # fin (exclusivo) del subárbol
+        self._keys: Dict[Key, List[int]] = {}
+        self._values: Dict[Tuple[TokenType, str], List[int]] = {}
+
+        stack = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            pos = len(self.nodes_in_order)
+            self.nodes_in_order.append(node)
+            self._pos[id(node)] = pos
+            self._parent.append(parent)
+            self._end.append(pos + 1)
+            self._keys.setdefault(node.label, []).append(pos)
+            tok = node.token
+            if tok is not None:
+                self._keys.setdefault(tok.type, []).append(pos)
+                self._values.setdefault((tok.type, tok.value), []).append(pos)
+            stack.extend((child, pos) for child in reversed(node.children))
+        # Cada subárbol termina donde termina el de su último descendiente.
+        for pos in range(len(self._parent) - 1, 0, -1):
+            parent = self._parent[pos]
+            if self._end[pos] > self._end[parent]:
+                self._end[parent] = self._end[pos]
+
+    def __len__(self) -> int:
+        return len(self.nodes_in_order)
+
+    def _position(self, node) -> int:
+        pos = self._pos.get(id(node))
+        if pos is None:
+            raise ValueError(f"node {node.id} ({node.label}) is not in this index")
+        return pos
+
+    def _positions(self, key: Key, value: Optional[str]) -> List[int]:
+        if value is None:
+            return self._keys.get(key, [])
+        if not isinstance(key, TokenType):
+            raise ValueError("filtering by value needs a TokenType key")
+        return self._values.get((key, value), [])
+
+    # ── consultas ───────────────────────────────────────────────────────
+    def nodes(self, key: Key, value: Optional[str] = None) -> List:
+        """Nodos con esa etiqueta o tipo de token (y valor), en preorden."""
+        return [self.nodes_in_order[p] for p in self._positions(key, value)]
+
+    def parent(self, node):
+        parent = self._parent[self._position(node)]
+        return self.nodes_in_order[parent] if parent >= 0 else None
+
+    def ancestors(self, node) -> Iterator:
+        """Ancestros de ``node``, del padre hacia la raíz."""
+        pos = self._parent[self._position(node)]
+        while pos >= 0:
+            yield self.nodes_in_order[pos]
+            pos = self._parent[pos]
+
+    def ancestor(self, node, label: str):
+        """Ancestro más cercano con la etiqueta ``label``, o ``None``."""
+        return next((a for a in self.ancestors(node) if a.label == label), None)
+
+    def _range(self, node, key: Key, value: Optional[str]) -> Tuple[List[int], int, int]:
+        pos = self._position(node)
+        positions = self._positions(key, value)
+        lo = bisect_right(positions, pos)
+        hi = bisect_left(positions, self._end[pos], lo)
+        return positions, lo, hi
+
+    def descendants_of_type(self, node, key: Key, value: Optional[str] = None) -> List:
+        """Descendientes de ``node`` (sin incluirlo) con esa clave, en preorden."""
+        positions, lo, hi = self._range(node, key, value)
+        return [self.nodes_in_order[p] for p in positions[lo:hi]]
+
+    def contains(self, node, key: Key, value: Optional[str] = None) -> bool:
+        """Si algún descendiente de ``node`` tiene esa clave."""
+        _, lo, hi = self._range(node, key, value)
+        return hi > lo
+
+    def is_ancestor(self, node, other) -> bool:
+        """Si ``node`` es ancestro estricto de ``other``."""
+        pos, target = self._position(node), self._position(other)
+        return pos < target < self._end[pos]